@@ -0,0 +1,58 @@
+"""
+Benchmark du coût par coup de BattleshipAI (choose_target) selon le niveau et la taille de grille
+
+Chaque mesure joue des parties complètes de l'IA contre une flotte placée au hasard.
+
+Usage : python -m benchmarks.ai_benchmark [--sizes 10 20 30] [--levels difficile expert] [--games 5]
+"""
+import argparse
+import random
+import time
+
+from src.game.BattleshipAI import BattleshipAI
+from src.game.player import Player
+from src.game.rules import GameRules
+from src.game.shot_ledger import MISS, HIT, SUNK
+
+
+def bench(rules, level, games, seed=0):
+    """
+    Jouer `games` parties et chronométrer chaque appel à choose_target
+
+    Returns:
+        (µs moyens par coup, nombre moyen de coups par partie)
+    """
+    rng = random.Random(seed)
+    elapsed = 0.0
+    moves = 0
+    for _ in range(games):
+        target_player = Player(0, rules, rng=random.Random(rng.getrandbits(64)))
+        target_player.auto_place_ships()
+        ai = BattleshipAI(level, rules, random.Random(rng.getrandbits(64)))
+        board = target_player.board
+        while not board.all_ships_sunk():
+            start = time.perf_counter()
+            x, y = ai.choose_target(board)
+            elapsed += time.perf_counter() - start
+            moves += 1
+            hit, ship_id, sunk = board.receive_shot(x, y)
+            ai.observe(x, y, SUNK if sunk else HIT if hit else MISS)
+    return elapsed / moves * 1e6, moves / games
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20, 30])
+    parser.add_argument("--levels", nargs="+", default=["difficile", "expert"])
+    parser.add_argument("--games", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'niveau':<10} {'grille':>7} {'µs/coup':>10} {'coups/partie':>13}")
+    for level in args.levels:
+        for size in args.sizes:
+            micros, moves = bench(GameRules.scaled(size), level, args.games)
+            print(f"{level:<10} {size:>7} {micros:>10,.0f} {moves:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
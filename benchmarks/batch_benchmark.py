@@ -0,0 +1,83 @@
+"""
+Benchmark des parties simulées en lot (BoardBatch, NumPy) contre une boucle de Board
+
+Chaque partie tire au hasard sur les cases encore inconnues jusqu'à couler toute la flotte.
+
+Usage : python -m benchmarks.batch_benchmark [--games 10000] [--grid-size 10] [--loop-games 500]
+"""
+import argparse
+import random
+import time
+
+from src.game.board import Board
+from src.game.rules import GameRules
+
+try:
+    import numpy as np
+    from src.game.board_batch import BoardBatch
+except ImportError:
+    np = None
+
+
+def bench_batch(rules, games, seed=0):
+    """
+    Jouer `games` parties en lot, placement des flottes compris
+
+    Returns:
+        (parties par seconde, nombre moyen de tirs par partie)
+    """
+    start = time.perf_counter()
+    batch = BoardBatch.random(rules, games, seed)
+    rng = np.random.default_rng(seed)
+    while not batch.all_sunk().all():
+        batch.fire(*batch.random_targets(rng))
+    elapsed = time.perf_counter() - start
+    return games / elapsed, float(batch.shots_fired.mean())
+
+
+def bench_loop(rules, games, seed=0):
+    """
+    Jouer `games` parties une par une avec des objets Board
+
+    Returns:
+        (parties par seconde, nombre moyen de tirs par partie)
+    """
+    rng = random.Random(seed)
+    cells = [(x, y) for y in range(rules.grid_size) for x in range(rules.grid_size)]
+    shots = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        board = Board(rules)
+        layout = board.sample_layout(rules.ship_sizes, rng)
+        for spec, (x, y, horizontal) in zip(rules.ships, layout):
+            board.place_ship(board.new_ship(spec["name"], spec["size"]), x, y, horizontal)
+        rng.shuffle(cells)
+        for x, y in cells:
+            board.receive_shot(x, y)
+            shots += 1
+            if board.all_ships_sunk():
+                break
+    elapsed = time.perf_counter() - start
+    return games / elapsed, shots / games
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--grid-size", type=int, default=10)
+    parser.add_argument("--loop-games", type=int, default=500, help="parties jouées avec la boucle de Board")
+    args = parser.parse_args()
+
+    rules = GameRules.scaled(args.grid_size)
+    print(f"{'moteur':<12} {'parties':>8} {'parties/s':>12} {'tirs/partie':>12}")
+    rate, shots = bench_loop(rules, args.loop_games)
+    print(f"{'Board':<12} {args.loop_games:>8} {rate:>12,.0f} {shots:>12.1f}")
+    if np is None:
+        print("NumPy n'est pas installé : BoardBatch non mesuré")
+        return
+    rate, shots = bench_batch(rules, args.games)
+    print(f"{'BoardBatch':<12} {args.games:>8} {rate:>12,.0f} {shots:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark des backends de plateau : Board (listes) contre BitBoard (bitmasks)
+
+Chaque mesure garde le meilleur de plusieurs passes, pour que la charge de
+la machine ne décide pas du classement.
+
+Usage : python -m benchmarks.board_benchmark [--rounds N] [--repeat N]
+"""
+import argparse
+import random
+import time
+
+from src.game.board import Board
+from src.game.bitboard import BitBoard
+from src.utils.constants import GRID_SIZE, SHIPS
+
+
+def _random_fleet(board_class, rng):
+    """Placer une flotte complète sur un plateau neuf (par tirage aléatoire)"""
+    board = board_class()
+    for spec in SHIPS:
+        ship = board.new_ship(spec["name"], spec["size"])
+        while not board.place_ship(ship, rng.randrange(GRID_SIZE), rng.randrange(GRID_SIZE),
+                                   rng.random() < 0.5):
+            pass
+    return board
+
+
+def bench_placements(board_class, rounds, repeat=5, seed=0):
+    """
+    Mesurer les vérifications de placement par seconde sur des plateaux remplis
+
+    Returns:
+        Nombre de vérifications is_valid_placement par seconde (meilleure passe)
+    """
+    rng = random.Random(seed)
+    board = _random_fleet(board_class, rng)
+    probe = board.new_ship("Sonde", 3)
+    candidates = [
+        (rng.randrange(GRID_SIZE), rng.randrange(GRID_SIZE), rng.random() < 0.5)
+        for _ in range(1000)
+    ]
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for x, y, horizontal in candidates:
+                board.is_valid_placement(probe, x, y, horizontal)
+        best = min(best, time.perf_counter() - start)
+    return rounds * len(candidates) / best
+
+
+def bench_shots(board_class, rounds, repeat=5, seed=0):
+    """
+    Mesurer les tirs traités par seconde (grille entière tirée dans un ordre aléatoire)
+
+    Returns:
+        Nombre d'appels receive_shot par seconde (meilleure passe)
+    """
+    cells = [(x, y) for y in range(GRID_SIZE) for x in range(GRID_SIZE)]
+    best = float("inf")
+    for _ in range(repeat):
+        # Les mêmes plateaux neufs à chaque passe, préparés hors du chronomètre
+        rng = random.Random(seed)
+        boards = []
+        for _ in range(rounds):
+            rng.shuffle(cells)
+            boards.append((_random_fleet(board_class, rng), list(cells)))
+        start = time.perf_counter()
+        for board, order in boards:
+            for x, y in order:
+                board.receive_shot(x, y)
+            board.all_ships_sunk()
+        best = min(best, time.perf_counter() - start)
+    return rounds * len(cells) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5, help="passes par mesure, la meilleure est gardée")
+    args = parser.parse_args()
+
+    print(f"{'backend':<10} {'placements/s':>14} {'tirs/s':>14}")
+    for board_class in (Board, BitBoard):
+        placements = bench_placements(board_class, args.rounds, args.repeat)
+        shots = bench_shots(board_class, args.rounds, args.repeat)
+        print(f"{board_class.__name__:<10} {placements:>14,.0f} {shots:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark des grilles de probabilité de l'IA : comptes incrémentaux (Python) contre fenêtres glissantes (NumPy)
+
+Chaque tour enregistre un tir puis calcule les deux grilles (difficile et expert).
+
+Usage : python -m benchmarks.density_benchmark [--sizes 10 30 100] [--turns 200]
+"""
+import argparse
+import random
+import time
+from collections import Counter
+
+from src.game.density import HAS_NUMPY, PlacementDensity, WindowDensity
+from src.game.rules import GameRules
+
+
+def bench(density_class, rules, turns, seed=0):
+    """
+    Jouer `turns` tours de tirs aléatoires (30 % de touches) sur une grille vide
+
+    Returns:
+        µs par tour
+    """
+    rng = random.Random(seed)
+    size = rules.grid_size
+    cells = [(x, y) for y in range(size) for x in range(size)]
+    rng.shuffle(cells)
+    shots = [(x, y, rng.random() < 0.3) for x, y in cells[:turns]]
+    fleet = Counter(rules.ship_sizes)
+
+    density = density_class(rules.placement_table, rules.ship_sizes)
+    start = time.perf_counter()
+    for x, y, hit in shots:
+        density.record(x, y, hit)
+        density.open_grid(fleet)
+        density.weighted_grid(fleet)
+    return (time.perf_counter() - start) / len(shots) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 30, 100])
+    parser.add_argument("--turns", type=int, default=200)
+    args = parser.parse_args()
+
+    if not HAS_NUMPY:
+        print("NumPy n'est pas installé : seul PlacementDensity est mesuré")
+    print(f"{'grille':>7} {'Python µs/tour':>15} {'NumPy µs/tour':>14} {'accélération':>13}")
+    for size in args.sizes:
+        rules = GameRules.scaled(size)
+        rules.placement_table  # Construire la table hors mesure
+        for ship_size in set(rules.ship_sizes):
+            rules.placement_table.coverage(ship_size)
+        turns = min(args.turns, size * size)
+        python = bench(PlacementDensity, rules, turns)
+        if not HAS_NUMPY:
+            print(f"{size:>7} {python:>15,.0f} {'-':>14} {'-':>13}")
+            continue
+        vector = bench(WindowDensity, rules, turns)
+        print(f"{size:>7} {python:>15,.0f} {vector:>14,.0f} {python / vector:>12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
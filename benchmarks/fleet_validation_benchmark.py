@@ -0,0 +1,86 @@
+"""
+Benchmark de la validation des flottes envoyées au serveur (validate_fleet)
+
+Usage : python -m benchmarks.fleet_validation_benchmark [--sizes 10 30 100] [--layouts 200] [--rounds 5]
+"""
+import argparse
+import copy
+import random
+import time
+
+from src.game.player import Player
+from src.game.rules import GameRules
+from src.network.fleet_validator import SHIP, WATER, validate_fleet
+
+
+def server_grid(player, grid_size):
+    """Grille au format du serveur ('matrix' et 'ships') de la flotte d'un joueur"""
+    matrix = [[WATER] * grid_size for _ in range(grid_size)]
+    ships = []
+    for ship in player.ships:
+        positions = [[y, x] for x, y in ship.get_coordinates()]
+        for row, column in positions:
+            matrix[row][column] = SHIP
+        ships.append({'name': ship.name, 'size': ship.size, 'positions': positions})
+    return {'matrix': matrix, 'ships': ships}
+
+
+def invalid_grid(grid, rng):
+    """Copie de la grille où un bateau en touche un autre (erreur détectée au dernier parcours)"""
+    grid = copy.deepcopy(grid)
+    matrix = grid['matrix']
+    ship = grid['ships'][-1]
+    for row, column in ship['positions']:
+        matrix[row][column] = WATER
+    anchor = rng.choice(grid['ships'][0]['positions'])
+    size = len(matrix)
+    row = min(anchor[0] + 1, size - 1)
+    column = min(anchor[1] + 1, size - ship['size'])
+    ship['positions'] = [[row, column + offset] for offset in range(ship['size'])]
+    for row, column in ship['positions']:
+        matrix[row][column] = SHIP
+    return grid
+
+
+def bench(rules, layouts, rounds, seed=0):
+    """
+    Valider des flottes valides puis des flottes invalides
+
+    Returns:
+        (validations/s sur les flottes valides, validations/s sur les invalides)
+    """
+    rng = random.Random(seed)
+    valid = []
+    for _ in range(layouts):
+        player = Player(0, rules, rng=random.Random(rng.getrandbits(64)))
+        player.auto_place_ships()
+        valid.append(server_grid(player, rules.grid_size))
+    invalid = [invalid_grid(grid, rng) for grid in valid]
+
+    rates = []
+    for grids, expected in ((valid, True), (invalid, False)):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for grid in grids:
+                if (not validate_fleet(grid, rules)) != expected:
+                    raise AssertionError("validation inattendue")
+        rates.append(rounds * len(grids) / (time.perf_counter() - start))
+    return tuple(rates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 30, 100])
+    parser.add_argument("--layouts", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'grille':>7} {'bateaux':>8} {'valides/s':>12} {'invalides/s':>12}")
+    for size in args.sizes:
+        rules = GameRules.scaled(size)
+        valid, invalid = bench(rules, args.layouts, args.rounds)
+        print(f"{size:>7} {len(rules.ships):>8} {valid:>12,.0f} {invalid:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
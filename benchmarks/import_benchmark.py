@@ -0,0 +1,78 @@
+"""
+Benchmark du temps d'import à froid du moteur de jeu (sans pygame)
+
+Chaque mesure tourne dans un nouvel interpréteur. Le script échoue si un
+module du moteur charge pygame ou dépasse le budget.
+
+Usage : python -m benchmarks.import_benchmark [--runs 5] [--budget-ms 50]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Modules qui doivent rester utilisables sans interface (serveur, bots, simulations)
+ENGINE_MODULES = [
+    "src.game.rules",
+    "src.game.board",
+    "src.game.bitboard",
+    "src.game.sparse_board",
+    "src.game.player",
+    "src.game.game_state",
+    "src.game.layouts",
+    "src.game.BattleshipAI",
+    "src.game.savegame",
+    "src.network.server",
+]
+
+PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "print(time.perf_counter() - start, 'pygame' in sys.modules)\n"
+)
+
+
+def measure(module, runs):
+    """
+    Importer un module dans `runs` interpréteurs neufs
+
+    Returns:
+        (temps médian en ms, True si pygame a été chargé)
+    """
+    timings = []
+    loads_pygame = False
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module)],
+            capture_output=True, text=True, check=True,
+        ).stdout.split()
+        timings.append(float(output[0]) * 1000)
+        loads_pygame = loads_pygame or output[1] == "True"
+    return statistics.median(timings), loads_pygame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=50.0,
+                        help="temps d'import maximal autorisé par module")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<26} {'import ms':>10} {'pygame':>7}")
+    for module in ENGINE_MODULES:
+        import_ms, loads_pygame = measure(module, args.runs)
+        print(f"{module:<26} {import_ms:>10.1f} {'oui' if loads_pygame else 'non':>7}")
+        if loads_pygame:
+            failures.append(f"{module} charge pygame")
+        if import_ms > args.budget_ms:
+            failures.append(f"{module} dépasse le budget ({import_ms:.1f} ms > {args.budget_ms:.0f} ms)")
+
+    for failure in failures:
+        print(f"ÉCHEC : {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
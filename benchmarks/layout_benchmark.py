@@ -0,0 +1,34 @@
+"""
+Benchmark de la génération en masse de flottes aléatoires
+
+Usage : python -m benchmarks.layout_benchmark [--layouts N]
+"""
+import argparse
+import time
+
+from src.game.layouts import allocate_layout_buffer, fill_layouts, generate_layouts
+from src.game.rules import DEFAULT_RULES
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--layouts", type=int, default=20000)
+    args = parser.parse_args()
+
+
+    start = time.perf_counter()
+    for _ in generate_layouts(DEFAULT_RULES, args.layouts, seed=1):
+        pass
+    elapsed = time.perf_counter() - start
+    print(f"flux   : {args.layouts / elapsed:>10,.0f} flottes/s")
+
+    buffer = allocate_layout_buffer(DEFAULT_RULES, args.layouts)
+    start = time.perf_counter()
+    fill_layouts(DEFAULT_RULES, buffer, seed=1)
+    elapsed = time.perf_counter() - start
+    print(f"tampon : {args.layouts / elapsed:>10,.0f} flottes/s "
+          f"({len(buffer) * buffer.itemsize / 1024:.0f} Kio pour {args.layouts} flottes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark du placement automatique des flottes sur des configurations denses
+
+Compare l'ancien tirage par rejet (100 essais par navire, 3 reprises), la
+recherche avec retour arrière (search_fleet) et le tirage uniforme
+(sample_fleet) de src.game.fleet_placement. Les deux derniers réussissent
+toujours ou prouvent qu'aucune flotte ne tient : sur la configuration
+impossible, 0 réussite est une preuve et non un abandon.
+
+La seconde table mesure l'écart à l'uniformité sur une petite grille dont
+toutes les flottes sont énumérées : chi2 par degré de liberté, proche de 1
+pour un tirage uniforme.
+
+Usage : python -m benchmarks.placement_benchmark [--layouts N]
+"""
+import argparse
+import itertools
+import random
+import time
+from collections import Counter
+
+from src.game.fleet_placement import sample_fleet, search_fleet
+from src.game.placement_table import get_placement_table
+from src.game.rules import GameRules
+
+# (nom, taille de grille, tailles des navires)
+CONFIGURATIONS = [
+    ("standard 10x10", 10, (5, 4, 3, 3, 2)),
+    ("russe 10x10", 10, (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)),
+    ("dense 10x10", 10, (5, 5, 4, 4, 3, 3, 3, 2, 2, 2, 2)),
+    ("dense 8x8", 8, (4, 4, 3, 3, 2, 2, 2, 1, 1)),
+    ("standard 7x7", 7, (5, 4, 3, 3, 2)),
+    ("dense 6x6", 6, (4, 3, 3, 2, 2, 1)),
+    ("agrandi 20x20", 20, GameRules.scaled(20).ship_sizes),
+    ("agrandi 30x30", 30, GameRules.scaled(30).ship_sizes),
+    ("impossible 6x6", 6, (5, 5, 5, 5)),
+]
+
+METHODS = [("rejet", None), ("recherche", search_fleet), ("uniforme", sample_fleet)]
+
+# (nom, taille de grille, tailles des navires) assez petit pour tout énumérer
+UNIFORMITY_CONFIGURATION = ("4x4", 4, (3, 2, 1))
+
+
+def rejection_layout(table, ship_sizes, rng):
+    """Ancien algorithme de Player.auto_place_ships, sur les bitmasks de la table"""
+    size = table.grid_size
+    for _ in range(3):
+        blocked = 0
+        layout = []
+        for ship_size in ship_sizes:
+            for _ in range(100):
+                placement = table.get(ship_size, rng.randrange(size), rng.randrange(size), rng.random() < 0.5)
+                if placement is not None and not placement.mask & blocked:
+                    blocked |= placement.area_mask
+                    layout.append(placement)
+                    break
+            else:
+                break
+        if len(layout) == len(ship_sizes):
+            return layout
+    return None
+
+
+def run(generator, table, ship_sizes, count, seed=0):
+    """
+    Générer `count` placements
+
+    Returns:
+        (placements réussis, placements par seconde)
+    """
+    rng = random.Random(seed)
+    successes = 0
+    start = time.perf_counter()
+    for _ in range(count):
+        if generator(table, ship_sizes, rng) is not None:
+            successes += 1
+    elapsed = time.perf_counter() - start
+    return successes, count / elapsed
+
+
+def legal_layouts(table, ship_sizes):
+    """Toutes les flottes légales, navire par navire, chaque navire d'une case compté une fois"""
+    layouts = set()
+    for combination in itertools.product(*(table.placements_for(size) for size in ship_sizes)):
+        blocked = 0
+        for placement in combination:
+            if placement.mask & blocked:
+                break
+            blocked |= placement.area_mask
+        else:
+            layouts.add(tuple(placement.mask for placement in combination))
+    return layouts
+
+
+def uniformity(generator, table, ship_sizes, per_layout=50, seed=0):
+    """
+    Chi2 par degré de liberté des flottes tirées contre la loi uniforme
+
+    Les tirages abandonnés (ancien rejet) sont ignorés.
+
+    Returns:
+        (chi2 / ddl, nombre de flottes légales)
+    """
+    layouts = legal_layouts(table, ship_sizes)
+    rng = random.Random(seed)
+    drawn = Counter()
+    for _ in range(per_layout * len(layouts)):
+        layout = generator(table, ship_sizes, rng)
+        if layout is not None:
+            drawn[tuple(placement.mask for placement in layout)] += 1
+    expected = sum(drawn.values()) / len(layouts)
+    chi2 = sum((drawn[layout] - expected) ** 2 / expected for layout in layouts)
+    return chi2 / (len(layouts) - 1), len(layouts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--layouts", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'configuration':<16} {'méthode':<10} {'réussis':>9} {'flottes/s':>12}")
+    for name, grid_size, ship_sizes in CONFIGURATIONS:
+        table = get_placement_table(grid_size, ship_sizes)
+        for label, generator in METHODS:
+            successes, rate = run(generator or rejection_layout, table, ship_sizes, args.layouts)
+            print(f"{name:<16} {label:<10} {successes:>4}/{args.layouts:<4} {rate:>12,.0f}")
+
+    name, grid_size, ship_sizes = UNIFORMITY_CONFIGURATION
+    table = get_placement_table(grid_size, ship_sizes)
+    print(f"\n{'configuration':<16} {'méthode':<10} {'flottes':>9} {'chi2/ddl':>12}")
+    for label, generator in METHODS:
+        score, count = uniformity(generator or rejection_layout, table, ship_sizes)
+        print(f"{name:<16} {label:<10} {count:>9} {score:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
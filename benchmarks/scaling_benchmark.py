@@ -0,0 +1,92 @@
+"""
+Benchmark du coût par tir quand le plateau grandit (règles GameRules.scaled)
+
+Usage : python -m benchmarks.scaling_benchmark [--sizes 10 20 50 100] [--max-ai-size 20]
+"""
+import argparse
+import random
+import time
+
+from src.game.BattleshipAI import BattleshipAI
+from src.game.bitboard import BitBoard
+from src.game.board import Board
+from src.game.player import Player
+from src.game.rules import GameRules
+
+AI_LEVELS = ['facile', 'moyenne', 'difficile', 'expert']
+
+
+def bench_board(rules, board_class, seed=0):
+    """
+    Placer une flotte puis tirer sur toutes les cases
+
+    Returns:
+        (ms pour placer la flotte, µs par tir)
+    """
+    rng = random.Random(seed)
+    player = Player(0, rules, board_class, rng)
+    start = time.perf_counter()
+    player.auto_place_ships()
+    placement_ms = (time.perf_counter() - start) * 1000
+
+    cells = [(x, y) for y in range(rules.grid_size) for x in range(rules.grid_size)]
+    rng.shuffle(cells)
+    start = time.perf_counter()
+    for x, y in cells:
+        player.receive_shot(x, y)
+        player.has_lost()
+    shot_us = (time.perf_counter() - start) / len(cells) * 1e6
+    return placement_ms, shot_us
+
+
+def bench_ai(rules, difficulty, shots, seed=0):
+    """
+    Mesurer choose_target sur les premiers tirs d'une partie
+
+    Returns:
+        µs par appel à choose_target
+    """
+    rng = random.Random(seed)
+    player = Player(0, rules, rng=rng)
+    player.auto_place_ships()
+    ai = BattleshipAI(difficulty, rules, rng)
+    elapsed = 0.0
+    for _ in range(shots):
+        start = time.perf_counter()
+        x, y = ai.choose_target(player.board)
+        elapsed += time.perf_counter() - start
+        player.receive_shot(x, y)
+    return elapsed / shots * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20, 50, 100])
+    parser.add_argument("--max-ai-size", type=int, default=20,
+                        help="taille maximale de plateau pour les mesures de l'IA")
+    parser.add_argument("--ai-shots", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'grille':<8} {'navires':>7} {'backend':<9} {'placement ms':>13} {'µs/tir':>9}")
+    for size in args.sizes:
+        rules = GameRules.scaled(size)
+        # Construire la table des placements hors mesure (faite une seule fois par règles)
+        for ship_size in set(rules.ship_sizes):
+            rules.placement_table.placements_for(ship_size)
+        for board_class in (Board, BitBoard):
+            placement_ms, shot_us = bench_board(rules, board_class)
+            print(f"{size}x{size:<5} {len(rules.ships):>7} {board_class.__name__:<9} "
+                  f"{placement_ms:>13.2f} {shot_us:>9.2f}")
+
+    print()
+    print(f"{'grille':<8} " + " ".join(f"{level:>12}" for level in AI_LEVELS) + "   (µs par choose_target)")
+    for size in args.sizes:
+        if size > args.max_ai_size:
+            continue
+        rules = GameRules.scaled(size)
+        timings = [bench_ai(rules, level, args.ai_shots) for level in AI_LEVELS]
+        print(f"{size}x{size:<5} " + " ".join(f"{t:>12,.0f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
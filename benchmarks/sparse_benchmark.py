@@ -0,0 +1,81 @@
+"""
+Benchmark mémoire et coût par tir de SparseBoard sur de très grands plateaux
+
+Usage : python -m benchmarks.sparse_benchmark [--sizes 100 1000 10000] [--ships 300] [--shots 20000]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from src.game.board import Board
+from src.game.player import Player
+from src.game.rules import GameRules
+from src.game.sparse_board import SparseBoard
+from src.utils.constants import SHIPS
+
+
+def fleet(ship_count):
+    """Répéter la flotte standard jusqu'à ship_count navires"""
+    return [
+        {"name": f"{SHIPS[i % len(SHIPS)]['name']} {i + 1}", "size": SHIPS[i % len(SHIPS)]["size"]}
+        for i in range(ship_count)
+    ]
+
+
+def bench(rules, board_class, shots, seed=0):
+    """
+    Placer la flotte puis tirer au hasard
+
+    Returns:
+        (pic mémoire en Mo, ms pour placer la flotte, µs par tir)
+    """
+    rng = random.Random(seed)
+    layout = SparseBoard(rules).sample_layout(rules.ship_sizes, rng)
+    # Construire la table des placements hors mesure pour le Board dense
+    if board_class is not SparseBoard:
+        for ship_size in set(rules.ship_sizes):
+            rules.placement_table.placements_for(ship_size)
+
+    size = rules.grid_size
+    targets = [(rng.randrange(size), rng.randrange(size)) for _ in range(shots)]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    player = Player(0, rules, board_class)
+    for index, (x, y, horizontal) in enumerate(layout):
+        player.place_ship(index, x, y, horizontal)
+    placement_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for x, y in targets:
+        player.receive_shot(x, y)
+        player.has_lost()
+    shot_us = (time.perf_counter() - start) / shots * 1e6
+    peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return peak_mb, placement_ms, shot_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--ships", type=int, default=300)
+    parser.add_argument("--shots", type=int, default=20000)
+    parser.add_argument("--max-dense-size", type=int, default=100,
+                        help="taille maximale de plateau pour le Board dense")
+    args = parser.parse_args()
+
+    print(f"{'grille':<12} {'backend':<12} {'mémoire Mo':>11} {'placement ms':>13} {'µs/tir':>9}")
+    for size in args.sizes:
+        rules = GameRules(size, fleet(args.ships))
+        for board_class in (Board, SparseBoard):
+            if board_class is Board and size > args.max_dense_size:
+                continue
+            peak_mb, placement_ms, shot_us = bench(rules, board_class, args.shots)
+            print(f"{size}x{size:<{11 - len(str(size))}} {board_class.__name__:<12} "
+                  f"{peak_mb:>11.2f} {placement_ms:>13.2f} {shot_us:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ import pygame
 import sys
 import os
 from src.utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT, TITLE, FPS, BLACK, WHITE
+from src.config import SOLO_SAVE_PATH
+from src.game.savegame import Autosaver
 from src.ui.screens.main_screen import MainScreen
 from src.ui.screens.game_screen import GameScreen
 from src.ui.screens.ship_placement import ShipPlacement
@@ -36,6 +38,9 @@ class Game:
         self.client = None
         self.server = None
         
+        # Background saves of the solo game, resumed from the main menu
+        self.autosaver = Autosaver(SOLO_SAVE_PATH)
+        
         # Initialize screens
         self.screens = {
             "main_screen": MainScreen(self),
@@ -101,6 +106,7 @@ class Game:
         
     def _cleanup(self):
         """Clean up resources before quitting"""
+        self.autosaver.flush(timeout=2)
         if self.server:
             self.server.stop()
         if self.client:
@@ -31,4 +31,8 @@ def setup_directories():
     for folder in ["fonts", "images", "sounds"]:
         path = os.path.join(ASSETS_DIR, folder)
         if not os.path.exists(path):
-            os.makedirs(path)
\ No newline at end of file
+            os.makedirs(path)
+
+# Sauvegarde automatique des parties solo
+SAVE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "saves")
+SOLO_SAVE_PATH = os.path.join(SAVE_DIR, "solo.json")
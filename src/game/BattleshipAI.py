@@ -1,19 +1,42 @@
 import random
 import math
+import time
+from collections import Counter
+from .density import new_density
+from .posterior import PosteriorSampler, count_layouts
+from .rules import DEFAULT_RULES
+from .shot_ledger import MISS, HIT, SUNK
 
 class BattleshipAI:
     """
     Intelligence artificielle avancée pour le jeu de Bataille Navale avec plusieurs niveaux de difficulté.
     """
     
-    def __init__(self, difficulty='expert'):
+    # Budget par coup du niveau 'ultime' : tirages de flottes et secondes.
+    # Le premier épuisé arrête le tirage. Le budget en secondes ne sert qu'en
+    # jeu interactif : une IA déterministe (parties avec graine, tournois)
+    # n'a que le nombre de tirages, et rejoue à l'identique avec le même générateur.
+    SAMPLE_BUDGET = 400
+    TIME_BUDGET = 0.05
+    # États mémorisés au plus par le compte exact avant de passer aux tirages
+    EXACT_BUDGET = 2000
+    
+    def __init__(self, difficulty='expert', rules=None, rng=None, vectorized=None, deterministic=False):
         """
         Initialise l'IA de Bataille Navale avec un niveau de difficulté.
         
-        :param difficulty: Niveau de difficulté ('facile', 'moyenne', 'difficile', 'expert')
+        :param difficulty: Niveau de difficulté ('facile', 'moyenne', 'difficile', 'expert', 'ultime')
+        :param rules: Règles de la partie (GameRules), règles standard par défaut
+        :param rng: Générateur aléatoire de la partie (random.Random), un générateur indépendant par défaut
+        :param vectorized: Calculer les grilles de probabilité avec NumPy (True), en Python (False),
+                           ou selon la taille de la grille si None (voir density.new_density)
+        :param deterministic: Borner le niveau 'ultime' par le seul nombre de tirages (time_budget à None),
+                              pour que les coups ne dépendent que du générateur et pas de la machine
         """
         self.difficulty = difficulty.lower()
-        self.ship_sizes = [5, 4, 3, 3, 2]  # Tailles standard des navires
+        self.rules = rules or DEFAULT_RULES
+        self.rng = rng or random.Random()
+        self.ship_sizes = list(self.rules.ship_sizes)  # Tailles des navires de la flotte adverse
         self.remaining_ships = self.ship_sizes.copy()
         
         # Historique des tirs et des résultats
@@ -24,23 +47,43 @@ class BattleshipAI:
         
         # Mémoire des tirs réussis pour les stratégies avancées
         self.successful_hits = []
-        self.ship_hits = {}  # Groupes de hits par navire potentiel
+        self.ship_hits = {}  # Groupes de hits par navire potentiel, dans l'ordre de leur premier hit
+        self._hit_groups = {}  # Hit -> identifiant de son groupe dans ship_hits
+        self._sunk_groups = set()  # Groupes dont le navire est coulé
+        self._next_group = 0
         
         # État de la grille de probabilité
         self.probability_grid = None
         
+        # Cases de la salve en cours, choisies mais pas encore tirées (voir choose_target)
+        self._excluded = set()
+        
         # Constantes pour les stratégies de tir
-        self.BOARD_SIZE = 10
+        self.BOARD_SIZE = self.rules.grid_size
+        
+        # Table partagée de tous les placements possibles des navires
+        self.placement_table = self.rules.placement_table
+        
+        # Comptes de placements par case, mis à jour à chaque tir (grilles de probabilité)
+        self.density = new_density(self.placement_table, self.ship_sizes, vectorized)
+        
+        # Budget du niveau 'ultime', modifiable par instance (None : pas de limite de ce côté, mais pas des deux)
+        self.sample_budget = self.SAMPLE_BUDGET
+        self.time_budget = None if deterministic else self.TIME_BUDGET
+        self.exact_budget = self.EXACT_BUDGET
 
-    def choose_target(self, board):
+    def choose_target(self, board, excluded=()):
         """
         Choisit une cible en fonction du niveau de difficulté.
         
         :param board: Le plateau de jeu
+        :param excluded: Cases déjà choisies mais pas encore tirées (salve en cours) :
+                         elles ne sont pas proposées, et leur résultat reste inconnu
         :return: Coordonnées (x, y) de la cible
         """
         # Mettre à jour notre historique des tirs
         self._update_history(board)
+        self._excluded = set(excluded)
         
         if self.difficulty == 'facile':
             return self._easy_strategy(board)
@@ -50,74 +93,120 @@ class BattleshipAI:
             return self._hard_strategy(board)
         elif self.difficulty == 'expert':
             return self._expert_strategy(board)
+        elif self.difficulty == 'ultime':
+            return self._ultimate_strategy(board)
         else:
             # Fallback sur la stratégie moyenne si la difficulté n'est pas reconnue
             print(f"Difficulté non reconnue: {self.difficulty}, fallback sur 'moyenne'")
             return self._medium_strategy(board)
     
+    def _is_unavailable(self, x, y):
+        """
+        Indique si une case ne peut plus être choisie : déjà visée, ou réservée par la salve en cours.
+        
+        :param x: Colonne de la case
+        :param y: Ligne de la case
+        :return: True si la case n'est pas disponible
+        """
+        return self.density.is_shot(x, y) or (x, y) in self._excluded
+    
     def _update_history(self, board):
         """
         Met à jour l'historique des tirs basé sur l'état actuel du plateau.
         
         :param board: Le plateau de jeu
         """
-        # Récupérer tous les tirs effectués
-        all_shots = []
-        hit_shots = []
-        
-        # Convertir les shots du board en liste pour notre usage interne
-        if hasattr(board, 'shots'):
-            for x, y, hit in board.shots:
-                shot = (x, y)
-                all_shots.append(shot)
-                if hit:
-                    hit_shots.append(shot)
+        # Un plateau avec moins de tirs que notre historique est une nouvelle partie
+        if len(board.shots) < len(self.shots_history):
+            self._forget_shots()
         
-        # Mettre à jour notre liste interne de tirs réussis
-        self.successful_hits = hit_shots
-        self.shots_history = all_shots
+        # Ne lire que les tirs ajoutés depuis le dernier appel (déjà observés sinon)
+        for x, y, hit in board.shots_since(len(self.shots_history)):
+            self.observe(x, y, HIT if hit else MISS)
+    
+    def observe(self, x, y, result):
+        """
+        Enregistre le résultat d'un tir de l'IA.
+        
+        Le coût ne dépend pas de la longueur de la partie : le tir est ajouté aux
+        connaissances (cases visées, groupes de hits) sans rien reconstruire. Un tir
+        déjà connu (lu sur le plateau par choose_target) n'est pas compté deux fois ;
+        seule l'information « coulé » est ajoutée.
+        
+        :param x: Colonne du tir
+        :param y: Ligne du tir
+        :param result: MISS, HIT, ou SUNK si le tir a coulé un navire (voir shot_ledger)
+        """
+        shot = (x, y)
+        if not self.density.is_shot(x, y):
+            self.shots_history.append(shot)
+            self.density.record(x, y, result != MISS)
+            if result != MISS:
+                self.successful_hits.append(shot)
+                self._add_to_group(shot)
+        
+        # Les navires ne se touchent pas : le groupe de hits du tir est le navire coulé
+        if result == SUNK:
+            group_id = self._hit_groups.get(shot)
+            if group_id is not None and group_id not in self._sunk_groups:
+                self._sunk_groups.add(group_id)
+                self.update_ship_status([len(self.ship_hits[group_id])])
+    
+    def _add_to_group(self, hit):
+        """
+        Range un nouveau hit dans le groupe de ses voisins, en fusionnant les groupes qu'il relie.
+        
+        :param hit: Coordonnées (x, y) du hit
+        """
+        neighbours = set()
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            group_id = self._hit_groups.get((hit[0] + dx, hit[1] + dy))
+            if group_id is not None:
+                neighbours.add(group_id)
+        
+        if not neighbours:
+            group_id = self._next_group
+            self._next_group += 1
+            self.ship_hits[group_id] = [hit]
+            self._hit_groups[hit] = group_id
+            return
+        
+        # Garder le groupe le plus ancien (l'ordre des groupes est celui de leur premier hit)
+        group_id = min(neighbours)
+        cells = {hit}
+        for other in neighbours:
+            cells.update(self.ship_hits[other])
+            if other != group_id:
+                del self.ship_hits[other]
+        for cell in cells:
+            self._hit_groups[cell] = group_id
+        
+        # Parcours en profondeur depuis le premier hit du groupe : seul le groupe touché
+        # est reparcouru, soit quelques cases quelle que soit la longueur de la partie
+        start = self.ship_hits[group_id][0]
+        ordered = [start]
+        
+        def walk(cell):
+            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                adjacent = (cell[0] + dx, cell[1] + dy)
+                if adjacent in cells and adjacent not in ordered:
+                    ordered.append(adjacent)
+                    walk(adjacent)
         
-        # Grouper les hits par navires potentiels
-        self._group_hits_by_ships()
+        walk(start)
+        self.ship_hits[group_id] = ordered
     
-    def _group_hits_by_ships(self):
+    def _forget_shots(self):
         """
-        Groupe les hits en navires potentiels selon leur proximité.
+        Oublie tous les tirs et groupes de hits.
         """
-        # Réinitialiser les groupes
+        self.shots_history = []
+        self.successful_hits = []
         self.ship_hits = {}
-        
-        # Fonction pour trouver les hits adjacents
-        def find_adjacent_hits(start_hit, all_hits, ship_group):
-            adjacent_directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-            for dx, dy in adjacent_directions:
-                nx, ny = start_hit[0] + dx, start_hit[1] + dy
-                adjacent_hit = (nx, ny)
-                if adjacent_hit in all_hits and adjacent_hit not in ship_group:
-                    ship_group.append(adjacent_hit)
-                    find_adjacent_hits(adjacent_hit, all_hits, ship_group)
-        
-        # Copie des hits pour modification
-        hits_to_process = self.successful_hits.copy()
-        group_id = 0
-        
-        # Tant qu'il reste des hits à traiter
-        while hits_to_process:
-            start_hit = hits_to_process[0]
-            ship_group = [start_hit]
-            hits_to_process.remove(start_hit)
-            
-            # Trouver tous les hits adjacents
-            find_adjacent_hits(start_hit, self.successful_hits, ship_group)
-            
-            # Retirer tous les hits trouvés de la liste à traiter
-            for hit in ship_group:
-                if hit in hits_to_process:
-                    hits_to_process.remove(hit)
-            
-            # Enregistrer le groupe
-            self.ship_hits[group_id] = ship_group
-            group_id += 1
+        self._hit_groups = {}
+        self._sunk_groups = set()
+        self._next_group = 0
+        self.density.reset()
     
     def _easy_strategy(self, board):
         """
@@ -126,12 +215,13 @@ class BattleshipAI:
         :param board: Le plateau de jeu
         :return: Coordonnées (x, y) d'une case non touchée
         """
+        is_shot = self._is_unavailable
         available = [
             (x, y) for x in range(self.BOARD_SIZE) for y in range(self.BOARD_SIZE)
-            if (x, y) not in self.shots_history
+            if not is_shot(x, y)
         ]
         
-        return random.choice(available) if available else None
+        return self.rng.choice(available) if available else None
     
     def _medium_strategy(self, board):
         """
@@ -147,13 +237,14 @@ class BattleshipAI:
                 return target
         
         # Sinon, utiliser un pattern en damier
+        is_shot = self._is_unavailable
         checkerboard = [
             (x, y) for x in range(self.BOARD_SIZE) for y in range(self.BOARD_SIZE)
-            if (x + y) % 2 == 0 and (x, y) not in self.shots_history
+            if (x + y) % 2 == 0 and not is_shot(x, y)
         ]
         
         if checkerboard:
-            return random.choice(checkerboard)
+            return self.rng.choice(checkerboard)
         
         # Si le damier est épuisé, tirer aléatoirement
         return self._easy_strategy(board)
@@ -176,9 +267,10 @@ class BattleshipAI:
         
         # Combiner damier et probabilités
         checkerboard_with_prob = []
+        is_shot = self._is_unavailable
         for x in range(self.BOARD_SIZE):
             for y in range(self.BOARD_SIZE):
-                if (x + y) % 2 == 0 and (x, y) not in self.shots_history:
+                if (x + y) % 2 == 0 and not is_shot(x, y):
                     # Donner un score basé sur la position et la probabilité
                     score = self.probability_grid[y][x]
                     checkerboard_with_prob.append(((x, y), score))
@@ -188,7 +280,7 @@ class BattleshipAI:
             sorted_targets = sorted(checkerboard_with_prob, key=lambda t: t[1], reverse=True)
             # Prendre parmi les 30% meilleurs scores
             top_n = max(1, len(sorted_targets) // 3)
-            return sorted_targets[random.randint(0, top_n-1)][0]
+            return sorted_targets[self.rng.randint(0, top_n-1)][0]
         
         # Fallback sur stratégie moyenne
         return self._medium_strategy(board)
@@ -206,7 +298,7 @@ class BattleshipAI:
             for group_id, hits in self.ship_hits.items():
                 # Si le groupe contient plusieurs hits, chercher à le compléter
                 if len(hits) >= 2:
-                    target = self._predict_ship_position(hits, self.shots_history)
+                    target = self._predict_ship_position(hits)
                     if target:
                         return target
             
@@ -221,10 +313,11 @@ class BattleshipAI:
         # Trouver la case avec la plus haute probabilité
         max_prob = 0
         best_targets = []
+        is_shot = self._is_unavailable
         
         for y in range(self.BOARD_SIZE):
             for x in range(self.BOARD_SIZE):
-                if (x, y) not in self.shots_history:
+                if not is_shot(x, y):
                     prob = probability_grid[y][x]
                     if prob > max_prob:
                         max_prob = prob
@@ -233,11 +326,61 @@ class BattleshipAI:
                         best_targets.append((x, y))
         
         if best_targets:
-            return random.choice(best_targets)
+            return self.rng.choice(best_targets)
         
         # Fallback sur la stratégie difficile
         return self._hard_strategy(board)
     
+    def _ultimate_strategy(self, board):
+        """
+        Stratégie ultime : tirer sur la case occupée par le plus de flottes complètes
+        compatibles avec tous les tirs et navires coulés.
+        
+        Les flottes sont comptées exactement quand le compte tient dans exact_budget
+        états (en fin de partie surtout) ; sinon elles sont tirées au hasard jusqu'au
+        premier des deux budgets épuisé (sample_budget tirages, time_budget secondes)
+        et la meilleure estimation obtenue est utilisée. time_budget couvre tout le
+        coup : les tirages n'ont que le temps laissé par le compte exact.
+        
+        :param board: Le plateau de jeu
+        :return: Coordonnées (x, y) de la cible
+        """
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        states = [board.cell_state(x, y) for y in range(self.BOARD_SIZE) for x in range(self.BOARD_SIZE)]
+        counted = count_layouts(self.placement_table, self.ship_sizes, states,
+                                self.exact_budget, self.time_budget)
+        if counted is not None:
+            occupancy = counted[1]
+        else:
+            # Temps restant (au moins un tirage est toujours tenté)
+            time_left = None if deadline is None else max(deadline - time.perf_counter(), 0.0)
+            sampler = PosteriorSampler(self.placement_table, self.ship_sizes, states)
+            sampler.run(self.rng, self.sample_budget, time_left)
+            
+            # Aucune flotte compatible trouvée dans le budget : stratégie experte
+            if not sampler.samples:
+                return self._expert_strategy(board)
+            occupancy = sampler.grid()
+        
+        max_prob = -1
+        best_targets = []
+        is_shot = self._is_unavailable
+        
+        for y in range(self.BOARD_SIZE):
+            for x in range(self.BOARD_SIZE):
+                if not is_shot(x, y):
+                    prob = occupancy[y][x]
+                    if prob > max_prob:
+                        max_prob = prob
+                        best_targets = [(x, y)]
+                    elif prob == max_prob:
+                        best_targets.append((x, y))
+        
+        if best_targets:
+            return self.rng.choice(best_targets)
+        
+        return self._expert_strategy(board)
+    
     def _basic_hunt_mode(self, board):
         """
         Mode de chasse basique : tir autour des hits.
@@ -246,6 +389,7 @@ class BattleshipAI:
         :return: Coordonnées d'une cible ou None
         """
         # Cibler autour du dernier hit réussi
+        is_shot = self._is_unavailable
         for hit in self.successful_hits:
             adjacent_cells = [
                 (hit[0] + dx, hit[1] + dy) 
@@ -255,11 +399,11 @@ class BattleshipAI:
             valid_targets = [
                 cell for cell in adjacent_cells
                 if 0 <= cell[0] < self.BOARD_SIZE and 0 <= cell[1] < self.BOARD_SIZE
-                and cell not in self.shots_history
+                and not is_shot(*cell)
             ]
             
             if valid_targets:
-                return random.choice(valid_targets)
+                return self.rng.choice(valid_targets)
         
         return None
     
@@ -280,6 +424,7 @@ class BattleshipAI:
         
         # Déterminer la direction probable du navire
         direction = self._get_ship_direction(hits)
+        is_shot = self._is_unavailable
         
         # Trouver les extrémités des séquences de hits
         if direction == 'horizontal':
@@ -296,13 +441,13 @@ class BattleshipAI:
                 # Vérifier à gauche
                 left_target = (leftmost[0] - 1, leftmost[1])
                 if (0 <= left_target[0] < self.BOARD_SIZE and 
-                    left_target not in self.shots_history):
+                    not is_shot(*left_target)):
                     return left_target
                 
                 # Vérifier à droite
                 right_target = (rightmost[0] + 1, rightmost[1])
                 if (right_target[0] < self.BOARD_SIZE and 
-                    right_target not in self.shots_history):
+                    not is_shot(*right_target)):
                     return right_target
                     
         elif direction == 'vertical':
@@ -319,13 +464,13 @@ class BattleshipAI:
                 # Vérifier en haut
                 top_target = (topmost[0], topmost[1] - 1)
                 if (0 <= top_target[1] < self.BOARD_SIZE and 
-                    top_target not in self.shots_history):
+                    not is_shot(*top_target)):
                     return top_target
                 
                 # Vérifier en bas
                 bottom_target = (bottommost[0], bottommost[1] + 1)
                 if (bottom_target[1] < self.BOARD_SIZE and 
-                    bottom_target not in self.shots_history):
+                    not is_shot(*bottom_target)):
                     return bottom_target
         
         # Si aucune extrémité n'est valide ou si la direction est inconnue,
@@ -343,21 +488,21 @@ class BattleshipAI:
                 target = (hit[0] + dx, hit[1] + dy)
                 if (0 <= target[0] < self.BOARD_SIZE and 
                     0 <= target[1] < self.BOARD_SIZE and 
-                    target not in self.shots_history):
+                    not is_shot(*target)):
                     return target
         
         return None
     
-    def _predict_ship_position(self, hits, shots):
+    def _predict_ship_position(self, hits):
         """
         Prédit la position probable d'un navire à partir de hits alignés.
         
         :param hits: Liste des hits pour un navire potentiel
-        :param shots: Liste de tous les tirs effectués
         :return: Coordonnées cible ou None
         """
         if len(hits) < 2:
             return None
+        is_shot = self._is_unavailable
         
         # Déterminer si les hits sont alignés horizontalement ou verticalement
         xs = [h[0] for h in hits]
@@ -371,15 +516,15 @@ class BattleshipAI:
             
             # Vérifier s'il y a des "trous" dans la séquence
             for x in range(min_x, max_x + 1):
-                if (x, y) not in hits and (x, y) not in shots:
+                if not is_shot(x, y):
                     return (x, y)
             
             # Essayer d'étendre à gauche
-            if min_x > 0 and (min_x - 1, y) not in shots:
+            if min_x > 0 and not is_shot(min_x - 1, y):
                 return (min_x - 1, y)
                 
             # Essayer d'étendre à droite
-            if max_x < self.BOARD_SIZE - 1 and (max_x + 1, y) not in shots:
+            if max_x < self.BOARD_SIZE - 1 and not is_shot(max_x + 1, y):
                 return (max_x + 1, y)
                 
         # Vérifier l'alignement vertical
@@ -390,15 +535,15 @@ class BattleshipAI:
             
             # Vérifier s'il y a des "trous" dans la séquence
             for y in range(min_y, max_y + 1):
-                if (x, y) not in hits and (x, y) not in shots:
+                if not is_shot(x, y):
                     return (x, y)
             
             # Essayer d'étendre en haut
-            if min_y > 0 and (x, min_y - 1) not in shots:
+            if min_y > 0 and not is_shot(x, min_y - 1):
                 return (x, min_y - 1)
                 
             # Essayer d'étendre en bas
-            if max_y < self.BOARD_SIZE - 1 and (x, max_y + 1) not in shots:
+            if max_y < self.BOARD_SIZE - 1 and not is_shot(x, max_y + 1):
                 return (x, max_y + 1)
         
         return None
@@ -418,13 +563,15 @@ class BattleshipAI:
             print(f"ERREUR: hits contient un élément non valide: {hits}")
             return None
         
+        hit_cells = {tuple(h) for h in hits}
+        
         # Vérifier s'il y a une continuité horizontale
         horizontal_hits = []
         for h in hits:
             adjacent_horizontal = False
             for dx in [-1, 1]:
                 adjacent_pos = (h[0] + dx, h[1])
-                if adjacent_pos in hits:
+                if adjacent_pos in hit_cells:
                     adjacent_horizontal = True
                     break
             if adjacent_horizontal:
@@ -436,7 +583,7 @@ class BattleshipAI:
             adjacent_vertical = False
             for dy in [-1, 1]:
                 adjacent_pos = (h[0], h[1] + dy)
-                if adjacent_pos in hits:
+                if adjacent_pos in hit_cells:
                     adjacent_vertical = True
                     break
             if adjacent_vertical:
@@ -457,36 +604,9 @@ class BattleshipAI:
         :param board: Le plateau de jeu
         :return: Coordonnées (x, y) de la case à plus forte probabilité
         """
-        # Initialiser la grille de probabilité
-        prob_grid = [[0 for _ in range(self.BOARD_SIZE)] for _ in range(self.BOARD_SIZE)]
-        
-        # Pour chaque navire restant, calculer les placements possibles
-        for ship_size in self.remaining_ships:
-            # Essayer tous les placements horizontaux
-            for y in range(self.BOARD_SIZE):
-                for x in range(self.BOARD_SIZE - ship_size + 1):
-                    valid = True
-                    for i in range(ship_size):
-                        if (x + i, y) in self.shots_history:
-                            valid = False
-                            break
-                    
-                    if valid:
-                        for i in range(ship_size):
-                            prob_grid[y][x + i] += 1
-            
-            # Essayer tous les placements verticaux
-            for x in range(self.BOARD_SIZE):
-                for y in range(self.BOARD_SIZE - ship_size + 1):
-                    valid = True
-                    for i in range(ship_size):
-                        if (x, y + i) in self.shots_history:
-                            valid = False
-                            break
-                    
-                    if valid:
-                        for i in range(ship_size):
-                            prob_grid[y + i][x] += 1
+        # Nombre de placements de chaque navire restant qui ne touchent aucune case
+        # déjà visée (tenus à jour tir par tir, ou recalculés avec NumPy : voir density)
+        prob_grid = self.density.open_grid(Counter(self.remaining_ships))
         
         # Stocker la grille pour référence future
         self.probability_grid = prob_grid
@@ -494,17 +614,18 @@ class BattleshipAI:
         # Trouver les coordonnées avec la plus haute probabilité
         max_prob = 0
         best_targets = []
+        is_shot = self._is_unavailable
         
         for y in range(self.BOARD_SIZE):
             for x in range(self.BOARD_SIZE):
-                if (x, y) not in self.shots_history and prob_grid[y][x] > max_prob:
+                if not is_shot(x, y) and prob_grid[y][x] > max_prob:
                     max_prob = prob_grid[y][x]
                     best_targets = [(x, y)]
-                elif (x, y) not in self.shots_history and prob_grid[y][x] == max_prob:
+                elif not is_shot(x, y) and prob_grid[y][x] == max_prob:
                     best_targets.append((x, y))
         
         if best_targets:
-            return random.choice(best_targets)
+            return self.rng.choice(best_targets)
         
         # Si aucune cible n'est trouvée, revenir à une sélection aléatoire
         return self._easy_strategy(board)
@@ -516,71 +637,17 @@ class BattleshipAI:
         :param board: Le plateau de jeu
         :return: Grille de probabilité
         """
-        # Initialiser la grille de probabilité
-        prob_grid = [[0 for _ in range(self.BOARD_SIZE)] for _ in range(self.BOARD_SIZE)]
-        
-        # Pour chaque navire restant, calculer les placements possibles
-        for ship_size in self.remaining_ships:
-            # Essayer tous les placements horizontaux
-            for y in range(self.BOARD_SIZE):
-                for x in range(self.BOARD_SIZE - ship_size + 1):
-                    placement = [(x + i, y) for i in range(ship_size)]
-                    
-                    # Vérifier si le placement est valide
-                    valid = True
-                    contains_hit = False
-                    
-                    for pos in placement:
-                        # Si on a déjà tiré et manqué, ce n'est pas valide
-                        if pos in self.shots_history and pos not in self.successful_hits:
-                            valid = False
-                            break
-                        
-                        # Si le placement contient un hit, c'est un bonus
-                        if pos in self.successful_hits:
-                            contains_hit = True
-                    
-                    if valid:
-                        # Bonus si le placement contient un hit existant
-                        weight = 2 if contains_hit else 1
-                        
-                        for pos in placement:
-                            if pos not in self.shots_history:
-                                prob_grid[pos[1]][pos[0]] += weight
-            
-            # Essayer tous les placements verticaux
-            for x in range(self.BOARD_SIZE):
-                for y in range(self.BOARD_SIZE - ship_size + 1):
-                    placement = [(x, y + i) for i in range(ship_size)]
-                    
-                    # Vérifier si le placement est valide
-                    valid = True
-                    contains_hit = False
-                    
-                    for pos in placement:
-                        # Si on a déjà tiré et manqué, ce n'est pas valide
-                        if pos in self.shots_history and pos not in self.successful_hits:
-                            valid = False
-                            break
-                        
-                        # Si le placement contient un hit, c'est un bonus
-                        if pos in self.successful_hits:
-                            contains_hit = True
-                    
-                    if valid:
-                        # Bonus si le placement contient un hit existant
-                        weight = 2 if contains_hit else 1
-                        
-                        for pos in placement:
-                            if pos not in self.shots_history:
-                                prob_grid[pos[1]][pos[0]] += weight
+        # Placements de chaque navire restant sans case manquée, comptés double
+        # s'ils couvrent un hit (tenus à jour tir par tir, ou recalculés avec NumPy : voir density)
+        prob_grid = self.density.weighted_grid(Counter(self.remaining_ships))
+        is_shot = self._is_unavailable
         
         # Mettre en évidence les cellules adjacentes aux hits
         for hit in self.successful_hits:
             for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
                 nx, ny = hit[0] + dx, hit[1] + dy
                 if (0 <= nx < self.BOARD_SIZE and 0 <= ny < self.BOARD_SIZE and 
-                    (nx, ny) not in self.shots_history):
+                    not is_shot(nx, ny)):
                     prob_grid[ny][nx] += 3
         
         # Bonus pour les cellules dans l'alignement de hits consécutifs
@@ -594,11 +661,11 @@ class BattleshipAI:
                     y = group_hits[0][1]  # Tous les y sont identiques
                     
                     # Bonus à gauche
-                    if min_x > 0 and (min_x - 1, y) not in self.shots_history:
+                    if min_x > 0 and not is_shot(min_x - 1, y):
                         prob_grid[y][min_x - 1] += 5
                     
                     # Bonus à droite
-                    if max_x < self.BOARD_SIZE - 1 and (max_x + 1, y) not in self.shots_history:
+                    if max_x < self.BOARD_SIZE - 1 and not is_shot(max_x + 1, y):
                         prob_grid[y][max_x + 1] += 5
                 
                 elif direction == 'vertical':
@@ -607,11 +674,11 @@ class BattleshipAI:
                     x = group_hits[0][0]  # Tous les x sont identiques
                     
                     # Bonus en haut
-                    if min_y > 0 and (x, min_y - 1) not in self.shots_history:
+                    if min_y > 0 and not is_shot(x, min_y - 1):
                         prob_grid[min_y - 1][x] += 5
                     
                     # Bonus en bas
-                    if max_y < self.BOARD_SIZE - 1 and (x, max_y + 1) not in self.shots_history:
+                    if max_y < self.BOARD_SIZE - 1 and not is_shot(x, max_y + 1):
                         prob_grid[max_y + 1][x] += 5
         
         return prob_grid
@@ -631,7 +698,5 @@ class BattleshipAI:
         Réinitialise l'état de l'IA.
         """
         self.remaining_ships = self.ship_sizes.copy()
-        self.shots_history = []
-        self.successful_hits = []
-        self.ship_hits = {}
-        self.probability_grid = None
\ No newline at end of file
+        self.probability_grid = None
+        self._forget_shots()
\ No newline at end of file
@@ -0,0 +1,143 @@
+from .rules import DEFAULT_RULES
+from .board import Board
+from .shot_ledger import BitShotLedger
+
+class BitBoard(Board):
+    """
+    Board backend storing occupancy, halo, hits and misses as integer bitmasks.
+
+    Cell (x, y) is bit y * size + x. The public API mirrors Board so the two
+    can be swapped in Player, GameState and the UI grid. Hits and misses are
+    the masks of the shot ledger (BitShotLedger), not a second copy of it.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = rules or DEFAULT_RULES
+        self.size = size = self.rules.grid_size
+        self._full = (1 << (size * size)) - 1
+
+        # Masks used to drop the cells that wrap around a row edge when shifting
+        first_col = sum(1 << (y * size) for y in range(size))
+        self._not_first_col = self._full & ~first_col
+        self._not_last_col = self._full & ~(first_col << (size - 1))
+
+        super().__init__(self.rules)
+
+    def _reset_storage(self):
+        """Clear the masks and the per-ship indexes"""
+        self.occupied = 0  # Cells covered by a ship
+        self.halo = 0      # Occupied cells and their 8 neighbours
+        self._ship_masks = {}  # ship id -> footprint mask
+        self._cell_owner = {}  # bit index -> ship id
+
+    def _copy_storage(self):
+        """Replace the per-ship indexes with private copies (the masks are immutable ints)"""
+        self._ship_masks = self._ship_masks.copy()
+        self._cell_owner = self._cell_owner.copy()
+
+    def _new_ledger(self):
+        """Create the shot ledger used by this board"""
+        return BitShotLedger(self.size)
+
+    @property
+    def hits(self):
+        """Mask of the cells hit"""
+        return self.shots.hits
+
+    @property
+    def misses(self):
+        """Mask of the cells missed"""
+        return self.shots.misses
+
+    @property
+    def grid(self):
+        """
+        List-of-lists view of the board (ship id per cell, 0 for water),
+        rebuilt on every access for code written against Board.grid
+        """
+        grid = [[0] * self.size for _ in range(self.size)]
+        for ship in self.ships:
+            for x, y in ship.get_coordinates():
+                grid[y][x] = ship.id
+        return grid
+
+    def dilate(self, mask):
+        """Grow a mask by one cell in all 8 directions, clipped to the grid"""
+        row = mask | ((mask << 1) & self._not_first_col) | ((mask >> 1) & self._not_last_col)
+        return (row | (row << self.size) | (row >> self.size)) & self._full
+
+    def _mark_ship(self, ship):
+        """Add a freshly positioned ship to the masks"""
+        placement = self.placement_table.get(ship.size, ship.x, ship.y, ship.horizontal)
+        self.occupied |= placement.mask
+        self.halo |= placement.area_mask
+        self._ship_masks[ship.id] = placement.mask
+        step = 1 if ship.horizontal else self.size
+        start = ship.y * self.size + ship.x
+        for i in range(ship.size):
+            self._cell_owner[start + i * step] = ship.id
+
+    def _unmark_ship(self, ship):
+        """Drop a placed ship from the masks and rebuild the halo"""
+        mask = self._ship_masks.pop(ship.id, 0)
+        if mask:
+            self.occupied &= ~mask
+            self.halo = self.dilate(self.occupied)
+            for x, y in ship.get_coordinates():
+                self._cell_owner.pop(y * self.size + x, None)
+
+    def _ship_id_at(self, x, y):
+        """Get the id of the ship covering an in-bounds cell, 0 for water"""
+        return self._cell_owner.get(y * self.size + x, 0)
+
+    def is_valid_placement(self, ship, x, y, horizontal):
+        """
+        Check if a ship can be placed at the given position
+
+        Args:
+            ship: Ship object to place
+            x, y: Coordinates of the ship's start
+            horizontal: True for horizontal placement, False for vertical
+
+        Returns:
+            True if placement is valid, False otherwise
+        """
+        placement = self.placement_table.get(ship.size, x, y, horizontal)
+        return placement is not None and not placement.mask & self.halo
+
+    def _resolve_shot(self, x, y):
+        """Resolve one shot on an unshared board with the masks (see Board.receive_shot)"""
+        size = self.size
+        if not (0 <= x < size and 0 <= y < size):
+            return False, None, False
+
+        index = y * size + x
+        bit = 1 << index
+        shots = self.shots
+        if (shots.hits | shots.misses) & bit:
+            return False, None, False
+
+        if not self.occupied & bit:
+            shots.misses |= bit
+            shots.log.append((x, y, False))
+            self.shots_hash ^= self.zobrist.shot(index, False)
+            return False, 0, False
+
+        shots.hits |= bit
+        shots.log.append((x, y, True))
+        self.shots_hash ^= self.zobrist.shot(index, True)
+
+        # Board._hit_ship, with the sunk cells flagged as one mask
+        ship_id = self._cell_owner[index]
+        ship = self.ships_by_id[ship_id]
+        ship.hits += 1
+        self.remaining_cells -= 1
+        if ship.hits < ship.size:
+            return True, ship_id, False
+        self.ships_afloat -= 1
+        shots.sunk |= self._ship_masks[ship_id]
+        return True, ship_id, True
+
+    def all_ships_sunk(self):
+        """Check if all ships on the board have been sunk"""
+        return not self.occupied & ~self.shots.hits
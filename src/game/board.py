@@ -1,144 +1,375 @@
-from ..utils.constants import GRID_SIZE
+import copy
+import random
+
+from .rules import DEFAULT_RULES
+from .shot_ledger import ShotLedger
+from .fleet_placement import sample_fleet
+from .ship import Ship
+from .zobrist import get_zobrist_keys
 
 class Board:
-    def __init__(self):
-        # Create empty grid - 0 represents water/empty cell
-        self.grid = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+    """
+    List-of-lists board: grid[y][x] holds the id of the ship covering the
+    cell, 0 for water.
+
+    BitBoard and SparseBoard subclass it and only replace the storage hooks
+    (_reset_storage, _copy_storage, _mark_ship, _unmark_ship, _ship_id_at,
+    is_valid_placement); fleet bookkeeping and shot resolution are shared.
+
+    snapshot() and fork() copy a board without copying its cells: only the
+    Ship objects are duplicated, the ship storage and the shot ledger are
+    shared and copied by whichever board is written to next (copy-on-write).
+
+    Each board also keeps a 64-bit Zobrist hash of its position, updated with
+    one XOR per cell on every placement and shot (see zobrist): fleet_hash
+    covers the ships, shots_hash the shots and their outcomes - the part the
+    opponent knows too - and hash combines both.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = rules or DEFAULT_RULES
+        self.size = self.rules.grid_size
+        self.placement_table = self.rules.placement_table
+        self.zobrist = get_zobrist_keys(self.size)
+        self._frozen = False  # Read-only snapshot
+        self.reset()
+
+    def reset(self):
+        """Reset the board for a new game"""
+        if self._frozen:
+            raise TypeError("Board snapshots are read-only, fork() them to play on")
+        self._shared = False  # Containers shared with a snapshot or fork
+        self._reset_storage()
+        self.fleet = []  # Every ship created with new_ship, placed or not
         self.ships = []
-        self.shots = []  # List of shots (hit or miss) as (x, y, hit)
-        
+        self.shots = self._new_ledger()  # Shots (hit or miss) as (x, y, hit) + per-cell state
+
+        # Fleet bookkeeping, kept up to date on every placement and hit
+        self.ships_by_id = {}
+        self.remaining_cells = 0  # Ship cells not hit yet
+        self.ships_afloat = 0
+        self._next_ship_id = 1  # Ids are per board: 0 is water in the storage
+
+        # Zobrist hashes of the placed ships and of the shots received
+        self.fleet_hash = 0
+        self.shots_hash = 0
+
+    def _reset_storage(self):
+        """Create empty ship storage - 0 represents water/empty cell"""
+        self.grid = [[0 for _ in range(self.size)] for _ in range(self.size)]
+
+    def _copy_storage(self):
+        """Replace the ship storage with a private copy"""
+        self.grid = [row[:] for row in self.grid]
+
+    def _new_ledger(self):
+        """Create the shot ledger used by this board"""
+        return ShotLedger(self.size)
+
+    def new_ship(self, name, size):
+        """
+        Create a ship with an id that is unique on this board
+
+        Args:
+            name: Display name of the ship
+            size: Number of cells covered by the ship
+
+        Returns:
+            The new (unplaced) Ship
+        """
+        if self._shared:
+            self._unshare()
+        ship = Ship(name, size, self._next_ship_id)
+        self._next_ship_id += 1
+        self.fleet.append(ship)
+        return ship
+
+    def snapshot(self):
+        """
+        Get a read-only copy of the board
+
+        Costs O(number of ships): cells and shots are shared with this board
+        until one of them is written to. Writing to the snapshot raises TypeError.
+        """
+        return self._clone(frozen=True)
+
+    def fork(self):
+        """Get a writable copy of the board (copy-on-write, see snapshot)"""
+        return self._clone(frozen=False)
+
+    def _clone(self, frozen):
+        """Copy the board with its own Ship objects, sharing storage and ledger"""
+        self._shared = True
+        clone = copy.copy(self)
+        clone._frozen = frozen
+
+        clones = {id(ship): ship.copy() for ship in self.fleet}
+        for ship in self.ships:
+            if id(ship) not in clones:
+                clones[id(ship)] = ship.copy()
+        clone.fleet = [clones[id(ship)] for ship in self.fleet]
+        clone.ships = [clones[id(ship)] for ship in self.ships]
+        clone.ships_by_id = {ship.id: ship for ship in clone.ships}
+        return clone
+
+    def _unshare(self):
+        """Take private copies of the storage and ledger shared with snapshots and forks"""
+        if self._frozen:
+            raise TypeError("Board snapshots are read-only, fork() them to play on")
+        self.shots = self.shots.copy()
+        self._copy_storage()
+        self._shared = False
+
     def place_ship(self, ship, x, y, horizontal):
         """
         Place a ship on the board
-        
+
         Args:
             ship: Ship object to place
             x, y: Coordinates of the ship's start
             horizontal: True if ship is placed horizontally, False for vertical
-            
+
         Returns:
             True if ship was placed successfully, False otherwise
         """
         # Check if placement is valid
         if not self.is_valid_placement(ship, x, y, horizontal):
             return False
-            
+        if self._shared:
+            self._unshare()
+
         # Place the ship on the grid
         ship.x = x
         ship.y = y
         ship.horizontal = horizontal
-        
-        # Update the grid with the ship ID
-        for i in range(ship.size):
-            if horizontal:
-                self.grid[y][x + i] = ship.id
-            else:
-                self.grid[y + i][x] = ship.id
-                
+        self._mark_ship(ship)
+        self.fleet_hash ^= self._footprint_hash(ship)
+
         self.ships.append(ship)
+        self._track_ship(ship)
         return True
-        
+
+    def remove_ship(self, ship):
+        """
+        Remove a placed ship from the board
+        (useful for repositioning during placement phase)
+        """
+        if self._shared:
+            self._unshare()
+
+        # Remove from ships list if it's there
+        if ship in self.ships:
+            self.fleet_hash ^= self._footprint_hash(ship)
+            self._unmark_ship(ship)
+            self.ships.remove(ship)
+            self._untrack_ship(ship)
+
+        # Reset ship position
+        ship.x = -1
+        ship.y = -1
+
+    @property
+    def hash(self):
+        """64-bit Zobrist hash of the whole position (ships and shots)"""
+        return self.fleet_hash ^ self.shots_hash
+
+    def _footprint_hash(self, ship):
+        """XOR of the ship keys of the cells covered by a placed ship"""
+        keys = self.zobrist
+        value = 0
+        for x, y in ship.get_coordinates():
+            value ^= keys.ship(y * self.size + x)
+        return value
+
+    def _mark_ship(self, ship):
+        """Write a freshly positioned ship into the storage"""
+        for x, y in ship.get_coordinates():
+            self.grid[y][x] = ship.id
+
+    def _unmark_ship(self, ship):
+        """Clear a placed ship from the storage"""
+        for x, y in ship.get_coordinates():
+            self.grid[y][x] = 0
+
+    def _ship_id_at(self, x, y):
+        """Get the id of the ship covering an in-bounds cell, 0 for water"""
+        return self.grid[y][x]
+
+    def get_ship(self, ship_id):
+        """Get a placed ship by its ID (None if there is no such ship)"""
+        return self.ships_by_id.get(ship_id)
+
+    def _track_ship(self, ship):
+        """Add a newly placed ship to the fleet index and counters"""
+        self.ships_by_id[ship.id] = ship
+        self.remaining_cells += ship.size - ship.hits
+        if not ship.is_sunk():
+            self.ships_afloat += 1
+
+    def _untrack_ship(self, ship):
+        """Remove a ship from the fleet index and counters"""
+        del self.ships_by_id[ship.id]
+        self.remaining_cells -= ship.size - ship.hits
+        if not ship.is_sunk():
+            self.ships_afloat -= 1
+
+    def _hit_ship(self, ship):
+        """
+        Count a new hit on a ship
+
+        Returns:
+            True if the hit sank the ship
+        """
+        ship.hits += 1
+        self.remaining_cells -= 1
+        sunk = ship.hits >= ship.size
+        if sunk:
+            self.ships_afloat -= 1
+            self.shots.mark_sunk(ship.get_coordinates())
+        return sunk
+
+    def _unhit_ship(self, ship, x, y):
+        """Take back the hit of cell (x, y) on a ship (inverse of _hit_ship)"""
+        if ship.is_sunk():
+            self.ships_afloat += 1
+            self.shots.unmark_sunk(cell for cell in ship.get_coordinates() if cell != (x, y))
+        ship.hits -= 1
+        self.remaining_cells += 1
+
     def is_valid_placement(self, ship, x, y, horizontal):
         """
         Check if a ship can be placed at the given position
-        
+
         Args:
             ship: Ship object to place
             x, y: Coordinates of the ship's start
             horizontal: True for horizontal placement, False for vertical
-            
+
         Returns:
             True if placement is valid, False otherwise
         """
         # Check if the ship is inside the grid
-        if horizontal:
-            if x < 0 or x + ship.size > GRID_SIZE or y < 0 or y >= GRID_SIZE:
-                return False
-        else:
-            if x < 0 or x >= GRID_SIZE or y < 0 or y + ship.size > GRID_SIZE:
+        placement = self.placement_table.get(ship.size, x, y, horizontal)
+        if placement is None:
+            return False
+
+        # Check that the ship and its 1-cell border (no adjacent ships rule) are empty
+        grid = self.grid
+        for nx, ny in placement.area:
+            if grid[ny][nx] != 0:
                 return False
-                
-        # Check if the ship overlaps with any other ship
-        for i in range(ship.size):
-            if horizontal:
-                if self.grid[y][x + i] != 0:
-                    return False
-            else:
-                if self.grid[y + i][x] != 0:
-                    return False
-        
-        # Check if the ship is adjacent to any other ship (optional rule)
-        # We'll check a 1-cell border around the ship
-        for i in range(ship.size):
-            if horizontal:
-                for dy in [-1, 0, 1]:
-                    for dx in [-1, 0, 1]:
-                        # Skip checking the ship cells themselves
-                        if dy == 0 and 0 <= dx < ship.size:
-                            continue
-                            
-                        nx, ny = x + dx, y + dy
-                        if (0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and 
-                            self.grid[ny][nx] != 0):
-                            return False
-            else:
-                for dy in [-1, 0, 1]:
-                    for dx in [-1, 0, 1]:
-                        # Skip checking the ship cells themselves
-                        if dx == 0 and 0 <= dy < ship.size:
-                            continue
-                            
-                        nx, ny = x + dx, y + dy
-                        if (0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and 
-                            self.grid[ny][nx] != 0):
-                            return False
-                            
+
         return True
-        
+
+    def sample_layout(self, ship_sizes, rng=random):
+        """
+        Draw a random legal layout for a fleet on this (empty) board
+
+        Every legal layout is equally likely, except on the very dense or very
+        large fleets where fleet_placement.sample_fleet can only get close.
+
+        Args:
+            ship_sizes: Size of each ship to place
+            rng: Random source (module random or a random.Random instance)
+
+        Returns:
+            List of (x, y, horizontal), one per entry of ship_sizes,
+            or None if the fleet cannot fit on the board
+        """
+        layout = sample_fleet(self.placement_table, ship_sizes, rng)
+        if layout is None:
+            return None
+        return [(p.x, p.y, p.horizontal) for p in layout]
+
     def receive_shot(self, x, y):
         """
         Process a shot at the given coordinates
-        
+
         Args:
             x, y: Coordinates of the shot
-            
+
         Returns:
-            (hit, ship_id, sunk): Tuple indicating if shot hit a ship, 
-                                  which ship was hit (if any), 
+            (hit, ship_id, sunk): Tuple indicating if shot hit a ship,
+                                  which ship was hit (if any),
                                   and if the ship was sunk
         """
+        if self._shared:
+            self._unshare()
+        return self._resolve_shot(x, y)
+
+    def receive_shots(self, coords):
+        """
+        Process a salvo: several shots resolved in one go
+
+        Shots are resolved in order, so a cell listed twice counts as
+        already shot the second time.
+
+        Args:
+            coords: Iterable of (x, y) coordinates
+
+        Returns:
+            List of (hit, ship_id, sunk), one per shot (see receive_shot)
+        """
+        if self._shared:
+            self._unshare()
+        resolve = self._resolve_shot
+        return [resolve(x, y) for x, y in coords]
+
+    def _resolve_shot(self, x, y):
+        """Resolve one shot on an unshared board (see receive_shot)"""
         # Check if coordinates are valid
-        if not (0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE):
+        if not (0 <= x < self.size and 0 <= y < self.size):
             return False, None, False
-            
+
         # Check if the cell has already been shot
-        for shot_x, shot_y, _ in self.shots:
-            if shot_x == x and shot_y == y:
-                return False, None, False
-                
-        ship_id = self.grid[y][x]
+        if self.shots.is_shot(x, y):
+            return False, None, False
+
+        ship_id = self._ship_id_at(x, y)
         hit = ship_id != 0
-        
+
         # Record the shot
-        self.shots.append((x, y, hit))
-        
+        self.shots.record(x, y, hit)
+        self.shots_hash ^= self.zobrist.shot(y * self.size + x, hit)
+
         # If a ship was hit, check if it was sunk
         sunk = False
         if hit:
-            # Find the ship that was hit
-            ship = next((s for s in self.ships if s.id == ship_id), None)
+            ship = self.ships_by_id.get(ship_id)
             if ship:
-                ship.hits += 1
-                sunk = ship.hits >= ship.size
-                
+                sunk = self._hit_ship(ship)
+
         return hit, ship_id, sunk
-        
+
+    def undo_shot(self):
+        """
+        Take back the last shot received (inverse of receive_shot)
+
+        Returns:
+            (x, y, hit) of the shot taken back
+
+        Raises:
+            IndexError: If the board has not received any shot
+        """
+        if self._shared:
+            self._unshare()
+
+        x, y, hit = self.shots.pop()
+        self.shots_hash ^= self.zobrist.shot(y * self.size + x, hit)
+        if hit:
+            ship = self.ships_by_id.get(self._ship_id_at(x, y))
+            if ship:
+                self._unhit_ship(ship, x, y)
+        return x, y, hit
+
+    def cell_state(self, x, y):
+        """Get the shot state of a cell (UNKNOWN, MISS, HIT or SUNK from shot_ledger)"""
+        return self.shots.cell_state(x, y)
+
+    def shots_since(self, index):
+        """Get the shots fired after the first `index` ones, as (x, y, hit) tuples"""
+        return self.shots.shots_since(index)
+
     def all_ships_sunk(self):
         """Check if all ships on the board have been sunk"""
-        return all(ship.hits >= ship.size for ship in self.ships)
-        
-    def reset(self):
-        """Reset the board for a new game"""
-        self.grid = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-        self.ships = []
-        self.shots = []
\ No newline at end of file
+        return self.ships_afloat == 0
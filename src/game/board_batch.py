@@ -0,0 +1,196 @@
+"""
+Many boards stepped in lockstep, for simulations and AI evaluation.
+
+A BoardBatch holds K boards of the same rules in a few NumPy arrays instead
+of K Board/Ship object graphs:
+    ships   (K, H, W) int16: index of the ship covering each cell + 1, 0 for water
+    states  (K, H, W) int8: UNKNOWN, MISS, HIT or SUNK (see shot_ledger)
+    hits    (K, S) int16: hits taken by each ship
+    afloat  (K,) int16: ships not sunk yet
+Ship i of every board is ship i of the rules' fleet, so its id (as
+returned by fire) is i + 1, as on a Player's board.
+
+fire() resolves one shot on every board with a handful of array operations.
+
+NumPy is optional for the rest of the game; only this module needs it.
+"""
+from .board import Board
+from .layouts import fill_layouts
+from .shot_ledger import UNKNOWN, MISS, HIT, SUNK
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+class BoardBatch:
+    """K boards with the same rules, stored in NumPy arrays and shot in lockstep"""
+
+    def __init__(self, rules, layouts):
+        """
+        Args:
+            rules: GameRules shared by every board
+            layouts: (K, number of ships) array of position codes, one row
+                     per board, in the order of the rules' fleet (see
+                     layouts.fill_layouts and placement_table.encode_position)
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if np is None:
+            raise ImportError("BoardBatch requires NumPy")
+
+        self.rules = rules
+        self.size = size = rules.grid_size
+        self.ship_sizes = np.array(rules.ship_sizes, dtype=np.int16)
+
+        layouts = np.asarray(layouts, dtype=np.int64).reshape(-1, len(self.ship_sizes))
+        self.count = count = len(layouts)
+        self.layouts = layouts
+
+        self.ships = np.zeros((count, size, size), dtype=np.int16)
+        self.states = np.zeros((count, size, size), dtype=np.int8)
+        self.hits = np.zeros((count, len(self.ship_sizes)), dtype=np.int16)
+        self.afloat = np.full(count, len(self.ship_sizes), dtype=np.int16)
+        self.shots_fired = np.zeros(count, dtype=np.int32)
+
+        # Flat (K, H * W) views, cell (x, y) being y * size + x as everywhere else
+        self._ships = self.ships.reshape(count, -1)
+        self._states = self.states.reshape(count, -1)
+        self._rows = np.arange(count)
+        self._order = None  # Shuffled cells of each board, see random_targets
+        self._next = None
+
+        # Write every ship of every board at once, one ship index at a time
+        for index, ship_size in enumerate(rules.ship_sizes):
+            start, vertical = np.divmod(layouts[:, index], 2)
+            step = np.where(vertical == 1, size, 1)
+            cells = start[:, None] + step[:, None] * np.arange(ship_size)
+            self._ships[self._rows[:, None], cells] = index + 1
+
+    @classmethod
+    def random(cls, rules, count, seed=None):
+        """
+        Create a batch of boards with random fleets (see layouts.fill_layouts)
+
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If the fleet cannot fit on the board
+        """
+        if np is None:
+            raise ImportError("BoardBatch requires NumPy")
+        buffer = np.zeros(count * len(rules.ship_sizes), dtype=np.int64)
+        fill_layouts(rules, buffer, seed)
+        return cls(rules, buffer)
+
+    def fire(self, x, y, active=None):
+        """
+        Fire one shot on every board
+
+        Shots outside the grid, on a cell already shot or on an inactive
+        board are ignored, like Board.receive_shot ignores them.
+
+        Args:
+            x, y: Arrays (or scalars) of K coordinates, one shot per board
+            active: Optional (K,) bool array of the boards to shoot, by
+                    default those with ships afloat
+
+        Returns:
+            (hit, ship_id, sunk): (K,) arrays - bool, int16 (0 for a miss or
+            an ignored shot) and bool
+        """
+        size = self.size
+        x = np.broadcast_to(np.asarray(x), (self.count,))
+        y = np.broadcast_to(np.asarray(y), (self.count,))
+        if active is None:
+            active = self.afloat > 0
+
+        inside = (x >= 0) & (x < size) & (y >= 0) & (y < size)
+        cells = np.where(inside, y * size + x, 0)
+        fired = active & inside & (self._states[self._rows, cells] == UNKNOWN)
+
+        games = np.flatnonzero(fired)
+        cells = cells[games]
+        ship_ids = self._ships[games, cells]
+        hit_games = ship_ids != 0
+        self._states[games, cells] = np.where(hit_games, HIT, MISS)
+        self.shots_fired[games] += 1
+
+        hit = np.zeros(self.count, dtype=bool)
+        ship_id = np.zeros(self.count, dtype=np.int16)
+        sunk = np.zeros(self.count, dtype=bool)
+        hit[games] = hit_games
+        ship_id[games] = ship_ids
+
+        # A board receives one shot per call, so (game, ship) pairs are unique
+        games = games[hit_games]
+        ships = ship_ids[hit_games] - 1
+        self.hits[games, ships] += 1
+        done = self.hits[games, ships] == self.ship_sizes[ships]
+        if done.any():
+            games = games[done]
+            ship_ids = ships[done] + 1
+            sunk[games] = True
+            self.afloat[games] -= 1
+            # Sinking is rare (once per ship), so the full-board mask stays cheap
+            states = self._states[games]
+            states[self._ships[games] == ship_ids[:, None]] = SUNK
+            self._states[games] = states
+
+        return hit, ship_id, sunk
+
+    def all_sunk(self):
+        """(K,) bool array: boards whose whole fleet is sunk"""
+        return self.afloat == 0
+
+    def random_targets(self, rng):
+        """
+        Draw one cell never shot per board, uniformly
+
+        The first call shuffles the cells of each board once; every call then
+        returns the next cell of that order not shot yet. Whatever the shots
+        fired in between, the result is uniform over the unknown cells, for
+        O(K) work per call instead of O(K * cells).
+
+        Args:
+            rng: numpy.random.Generator
+
+        Returns:
+            (x, y) arrays of K coordinates (any cell on boards with nothing left to shoot)
+        """
+        cells = self._states.shape[1]
+        if self._order is None:
+            self._order = rng.permuted(np.broadcast_to(np.arange(cells), self._states.shape), axis=1)
+            self._next = np.zeros(self.count, dtype=np.intp)
+
+        rows = self._rows
+        while True:
+            next_cells = self._order[rows, np.minimum(self._next, cells - 1)]
+            stale = (self._states[rows, next_cells] != UNKNOWN) & (self._next < cells - 1)
+            if not stale.any():
+                break
+            self._next[stale] += 1
+        y, x = np.divmod(next_cells, self.size)
+        return x, y
+
+    def board(self, index, board_class=None):
+        """
+        Build board number `index` as a regular Board (fleet and shots, not their order)
+
+        Args:
+            index: Index of the board in the batch
+            board_class: Board backend (Board by default)
+
+        Returns:
+            Board of the given class
+        """
+        board = (board_class or Board)(self.rules)
+        for spec, code in zip(self.rules.ships, self.layouts[index]):
+            ship = board.new_ship(spec["name"], spec["size"])
+            cell, vertical = divmod(int(code), 2)
+            y, x = divmod(cell, self.size)
+            board.place_ship(ship, x, y, not vertical)
+        cells = np.flatnonzero(self._states[index] != UNKNOWN)
+        board.receive_shots([(int(cell) % self.size, int(cell) // self.size) for cell in cells])
+        return board
@@ -0,0 +1,283 @@
+"""
+Placement counts behind the AI's probability grids.
+
+For every ship size, PlacementDensity keeps how many hits and misses each
+placement of the placement table covers, and two per-cell sums over the
+placements covering the cell:
+    open      placements with no shot at all
+    weighted  placements with no miss, counting 2 if they cover a hit, 1 otherwise
+A shot only changes the placements covering its cell, so record() costs
+O(placements through one cell * ship size) instead of re-enumerating every
+placement of every ship each turn.
+
+WindowDensity computes the same grids from scratch with NumPy: a placement
+is a window of `size` cells along a row or column, so counting the misses
+(or shots, or hits) it covers is a sliding-window sum, and spreading the
+window weights back over their cells is one more prefix sum. new_density() picks the
+backend: the incremental one on small boards, NumPy (if installed) from
+VECTOR_MIN_GRID_SIZE up. NumPy is only imported when the first WindowDensity
+is created, so that importing the AI stays cheap.
+
+Cells are indexed y * grid_size + x, as in the placement table.
+"""
+import importlib.util
+
+from .shot_ledger import UNKNOWN, MISS, HIT
+
+# NumPy is optional: look for it without paying for the import (see _load_numpy)
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+np = None
+
+# Smallest grid on which new_density() picks WindowDensity (see benchmarks/density_benchmark.py)
+VECTOR_MIN_GRID_SIZE = 25
+
+
+def new_density(placement_table, ship_sizes, vectorized=None):
+    """
+    Create the density backend for a board
+
+    Args:
+        placement_table: PlacementTable of the board
+        ship_sizes: Sizes of the ships to count
+        vectorized: True for WindowDensity, False for PlacementDensity, None
+                    to choose from the grid size and whether NumPy is installed
+
+    Raises:
+        ImportError: If vectorized is True and NumPy is not installed
+    """
+    if vectorized is None:
+        vectorized = HAS_NUMPY and placement_table.grid_size >= VECTOR_MIN_GRID_SIZE
+    if vectorized:
+        return WindowDensity(placement_table, ship_sizes)
+    return PlacementDensity(placement_table, ship_sizes)
+
+
+def _load_numpy():
+    """Import NumPy on first use"""
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+
+def _to_rows(cells, grid_size):
+    return [cells[row * grid_size:(row + 1) * grid_size] for row in range(grid_size)]
+
+
+class PlacementDensity:
+    """Per-cell placement counts of each ship size, updated shot by shot"""
+
+    def __init__(self, placement_table, ship_sizes):
+        """
+        Args:
+            placement_table: PlacementTable of the board
+            ship_sizes: Sizes of the ships to count (duplicates are counted once)
+        """
+        self.table = placement_table
+        self.grid_size = placement_table.grid_size
+        self.sizes = sorted(set(ship_sizes))
+        self._initial = {
+            size: [len(placements) for placements in placement_table.coverage(size)[1]]
+            for size in self.sizes
+        }
+        self.reset()
+
+    def reset(self):
+        """Forget every shot"""
+        self.state = bytearray(self.grid_size * self.grid_size)  # UNKNOWN, MISS or HIT per cell
+        self.open = {}
+        self.weighted = {}
+        self._hits = {}
+        self._misses = {}
+        for size in self.sizes:
+            self.open[size] = list(self._initial[size])
+            self.weighted[size] = list(self._initial[size])
+            placements = len(self.table.coverage(size)[0])
+            self._hits[size] = [0] * placements
+            self._misses[size] = [0] * placements
+
+    def record(self, x, y, hit):
+        """
+        Account for a shot (a cell already recorded is ignored)
+
+        Args:
+            x, y: Coordinates of the shot
+            hit: True if it hit a ship
+        """
+        cell = y * self.grid_size + x
+        if self.state[cell] != UNKNOWN:
+            return
+        self.state[cell] = HIT if hit else MISS
+
+        for size in self.sizes:
+            footprints, covering = self.table.coverage(size)
+            open_counts = self.open[size]
+            weighted = self.weighted[size]
+            hits = self._hits[size]
+            misses = self._misses[size]
+            for index in covering[cell]:
+                placement_hits = hits[index]
+                if misses[index]:
+                    # Already ruled out: only its counters change
+                    if hit:
+                        hits[index] = placement_hits + 1
+                    else:
+                        misses[index] += 1
+                    continue
+
+                if hit:
+                    hits[index] = placement_hits + 1
+                    if placement_hits:
+                        continue
+                    # First shot on an open placement, and a hit: no longer open, weight 1 -> 2
+                    for covered in footprints[index]:
+                        open_counts[covered] -= 1
+                        weighted[covered] += 1
+                else:
+                    misses[index] = 1
+                    if placement_hits:
+                        for covered in footprints[index]:
+                            weighted[covered] -= 2
+                    else:
+                        for covered in footprints[index]:
+                            open_counts[covered] -= 1
+                            weighted[covered] -= 1
+
+    def is_shot(self, x, y):
+        """Check if a cell has been recorded"""
+        return self.state[y * self.grid_size + x] != UNKNOWN
+
+    def open_grid(self, ship_counts):
+        """
+        Placements that cover no shot, per cell, summed over a fleet
+
+        Args:
+            ship_counts: Mapping ship size -> number of such ships (e.g. Counter of the remaining ships)
+
+        Returns:
+            Grid [y][x] of ints
+        """
+        return _to_rows(self._sum(self.open, ship_counts), self.grid_size)
+
+    def weighted_grid(self, ship_counts):
+        """
+        Placements that cover no miss, counting 2 if they cover a hit, per
+        cell not shot yet (0 on shot cells), summed over a fleet
+
+        Args:
+            ship_counts: Mapping ship size -> number of such ships
+
+        Returns:
+            Grid [y][x] of ints
+        """
+        totals = self._sum(self.weighted, ship_counts)
+        totals = [0 if shot else total for total, shot in zip(totals, self.state)]
+        return _to_rows(totals, self.grid_size)
+
+    def _sum(self, counts, ship_counts):
+        totals = [0] * (self.grid_size * self.grid_size)
+        for size, count in ship_counts.items():
+            if count == 1:
+                totals = [total + value for total, value in zip(totals, counts[size])]
+            elif count:
+                totals = [total + count * value for total, value in zip(totals, counts[size])]
+        return totals
+
+
+class WindowDensity:
+    """Same grids as PlacementDensity, recomputed with NumPy sliding-window sums"""
+
+    def __init__(self, placement_table, ship_sizes):
+        """
+        Args:
+            placement_table: PlacementTable of the board (only its grid size is used)
+            ship_sizes: Sizes of the ships to count
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if not HAS_NUMPY:
+            raise ImportError("WindowDensity requires NumPy")
+        _load_numpy()
+        self.grid_size = placement_table.grid_size
+        self.sizes = sorted(set(ship_sizes))
+        self.reset()
+
+    def reset(self):
+        """Forget every shot"""
+        self.state = bytearray(self.grid_size * self.grid_size)  # UNKNOWN, MISS or HIT per cell
+        self._misses = np.zeros((self.grid_size, self.grid_size), dtype=np.int32)
+        self._hits = np.zeros((self.grid_size, self.grid_size), dtype=np.int32)
+
+    def record(self, x, y, hit):
+        """Account for a shot (a cell already recorded is ignored)"""
+        cell = y * self.grid_size + x
+        if self.state[cell] != UNKNOWN:
+            return
+        self.state[cell] = HIT if hit else MISS
+        (self._hits if hit else self._misses)[y, x] = 1
+
+    def is_shot(self, x, y):
+        """Check if a cell has been recorded"""
+        return self.state[y * self.grid_size + x] != UNKNOWN
+
+    def open_grid(self, ship_counts):
+        """Same as PlacementDensity.open_grid"""
+        shots = _prefix_sums(self._misses + self._hits)
+        return self._coverage(ship_counts, lambda size: _window_sums(shots, size) == 0).tolist()
+
+    def weighted_grid(self, ship_counts):
+        """Same as PlacementDensity.weighted_grid"""
+        misses = _prefix_sums(self._misses)
+        hits = _prefix_sums(self._hits)
+
+        def weights(size):
+            valid = _window_sums(misses, size) == 0
+            return valid * (1 + (_window_sums(hits, size) > 0))
+
+        grid = self._coverage(ship_counts, weights)
+        grid[(self._misses + self._hits) != 0] = 0
+        return grid.tolist()
+
+    def _coverage(self, ship_counts, weights):
+        """
+        Sum over the fleet of the weights of the placements through each cell
+
+        weights(size) returns a (2, grid_size, grid_size - size + 1) array:
+        the weight of every window of `size` cells along the rows ([0]) and
+        along the columns ([1], i.e. the rows of the transposed grid).
+        """
+        size = self.grid_size
+        # A window starting at cell i adds its weight to cells i to i + ship size - 1:
+        # +weight at i and -weight at i + ship size, then one prefix sum for the whole fleet
+        changes = np.zeros((2, size, size + 1), dtype=np.int32)
+        for ship_size, count in ship_counts.items():
+            if not count or ship_size > size:
+                continue
+            window_weights = weights(ship_size)
+            if count != 1:
+                window_weights = window_weights * count
+            starts = window_weights.shape[-1]
+            changes[..., :starts] += window_weights
+            changes[..., ship_size:ship_size + starts] -= window_weights
+        total = np.cumsum(changes[..., :size], axis=-1)
+        return total[0] + total[1].T
+
+
+def _prefix_sums(values):
+    """
+    Prefix sums along the rows and along the columns of a grid, with a leading 0
+
+    The grid is stacked with its transpose, so that rows and columns are
+    handled by the same array operations.
+    """
+    values = np.stack((values, values.T))
+    sums = np.zeros(values.shape[:-1] + (values.shape[-1] + 1,), dtype=np.int32)
+    np.cumsum(values, axis=-1, out=sums[..., 1:])
+    return sums
+
+
+def _window_sums(prefix, size):
+    """Sums of every run of `size` consecutive cells, from prefix sums"""
+    return prefix[..., size:] - prefix[..., :-size]
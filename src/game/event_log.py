@@ -0,0 +1,100 @@
+"""
+Event log of a GameState.
+
+Every change to a game (a player committing their fleet, a shot, a turn
+switch) is appended to the log as a GameEvent before it is applied. The log
+keeps a cursor: undo moves it back by reverting one event, redo moves it
+forward by applying the next one again, both in O(salvo size) (a shot
+that sinks a ship costs O(ship size)). Recording a new event after some undos drops the
+undone tail, as in an editor.
+
+Every `checkpoint_interval` events the log also holds a read-only snapshot
+of the game (see GameState.snapshot), so jumping to any position replays at
+most checkpoint_interval events instead of the whole game.
+"""
+
+EVENT_FLEET = "fleet"  # A player commits their fleet: data = [(ship index, x, y, horizontal)],
+                       # result = the player's ready flag before the event
+EVENT_SHOT = "shot"    # A player fires a salvo: data = ((x, y), ...), result = [(hit, ship_id, sunk), ...]
+EVENT_TURN = "turn"    # The turn passes to the other player: data = None
+
+CHECKPOINT_INTERVAL = 32
+
+
+class GameEvent:
+    """One change to a game, with what is needed to revert it"""
+
+    __slots__ = ("kind", "player", "data", "before", "result")
+
+    def __init__(self, kind, player, data, before):
+        """
+        Args:
+            kind: EVENT_FLEET, EVENT_SHOT or EVENT_TURN
+            player: Index of the player the event is about
+            data: Payload of the event (see the EVENT_* constants)
+            before: (current player index, state, winner, last shot) of the
+                    game before the event, restored when it is undone
+        """
+        self.kind = kind
+        self.player = player
+        self.data = data
+        self.before = before
+        self.result = None  # Set once the event has been applied
+
+    def __repr__(self):
+        return f"GameEvent({self.kind!r}, player={self.player}, data={self.data!r}, result={self.result!r})"
+
+
+class EventLog:
+    """Events of a game with an undo/redo cursor and periodic checkpoints"""
+
+    def __init__(self, checkpoint_interval=CHECKPOINT_INTERVAL):
+        self.events = []
+        self.cursor = 0  # Number of events currently applied to the game
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints = {}  # cursor -> read-only GameState at that position
+
+    def __len__(self):
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def __getitem__(self, index):
+        return self.events[index]
+
+    def append(self, event):
+        """Add an event at the cursor, dropping the events that had been undone"""
+        if self.cursor < len(self.events):
+            del self.events[self.cursor:]
+            for index in [index for index in self.checkpoints if index > self.cursor]:
+                del self.checkpoints[index]
+        self.events.append(event)
+        self.cursor += 1
+
+    def can_undo(self):
+        """Check if there is an applied event to undo"""
+        return self.cursor > 0
+
+    def can_redo(self):
+        """Check if there is an undone event to redo"""
+        return self.cursor < len(self.events)
+
+    def wants_checkpoint(self):
+        """Check if a checkpoint should be taken at the cursor"""
+        return self.cursor % self.checkpoint_interval == 0 and self.cursor not in self.checkpoints
+
+    def checkpoint_before(self, index):
+        """
+        Get the closest checkpoint at or before an event index
+
+        Returns:
+            (index of the checkpoint, GameState snapshot), or (None, None) if there is none
+        """
+        index -= index % self.checkpoint_interval
+        while index >= 0:
+            checkpoint = self.checkpoints.get(index)
+            if checkpoint is not None:
+                return index, checkpoint
+            index -= self.checkpoint_interval
+        return None, None
@@ -0,0 +1,291 @@
+import random
+from functools import lru_cache
+
+# Blind whole-layout draws sample_fleet() tries first
+REJECTION_ATTEMPTS = 5000
+# Largest board (in cells) and number of partial layouts sample_fleet() counts on
+MAX_COUNTED_CELLS = 144
+MAX_COUNTED_STATES = 50000
+# Moves of every ship when no exact method fits (see sample_fleet)
+WALK_SWEEPS = 20
+
+
+class _BudgetExhausted(Exception):
+    """Raised to abandon a search attempt that explored too many states"""
+
+
+def sample_fleet(table, ship_sizes, rng=random, blocked=0):
+    """
+    Draw a random legal layout for a whole fleet, or prove there is none
+
+    Every legal layout is equally likely wherever that can be done in
+    bounded time, which covers the standard fleets and small dense boards:
+
+    - every ship is drawn uniformly among all its footprints and the whole
+      layout is thrown away at the first overlap or contact, up to
+      REJECTION_ATTEMPTS times; an accepted layout is exactly uniform;
+    - then search_fleet() finds one layout or proves that there is none;
+    - then, on boards of at most MAX_COUNTED_CELLS cells, the legal
+      completions of every partial layout are counted (up to
+      MAX_COUNTED_STATES of them, kept for the next draws) and the layout
+      is built cell by cell, each choice weighted by its completions.
+
+    No fast exact method is known for the fleets left over (big scaled
+    fleets, very dense ones), where a blind draw succeeds less than once in
+    thousands and the counts are out of reach. There the layout found by
+    the search is mixed by WALK_SWEEPS sweeps that each move every ship to
+    a uniformly drawn footprint free next to the others. That walk
+    converges to the uniform distribution, so the result is close to
+    uniform but not exactly so.
+
+    Args:
+        table: PlacementTable of the board
+        ship_sizes: Size of each ship to place
+        rng: Random source (module random or a random.Random instance)
+        blocked: Bitmask of cells no ship may cover (e.g. already placed ships' areas)
+
+    Returns:
+        List of Placement, one per entry of ship_sizes and in the same order,
+        or None if the fleet cannot fit on the board
+    """
+    layout = _rejection_draw(table, ship_sizes, rng, blocked)
+    if layout is not None:
+        return layout
+
+    start = search_fleet(table, ship_sizes, rng, blocked)
+    if start is None:
+        return None
+
+    if table.grid_size * table.grid_size <= MAX_COUNTED_CELLS:
+        counter = _layout_counter(table, tuple(sorted(ship_sizes)), blocked)
+        if counter is not None:
+            return counter.draw(ship_sizes, rng)
+
+    return _walk(table, ship_sizes, start, rng, blocked)
+
+
+def search_fleet(table, ship_sizes, rng=random, blocked=0):
+    """
+    Find a random legal layout for a whole fleet, or prove there is none
+
+    Ships are placed largest first. Each one is drawn uniformly among the
+    footprints still compatible with the ships already placed (no overlap,
+    no contact); a dead end backtracks to the previous ship. A search that
+    wanders too long in a bad branch restarts from scratch with a doubled
+    budget, and dead (ship, blocked cells) states are remembered across
+    restarts, so an infeasible fleet is rejected after exploring each state
+    once. Every legal layout can be found, but layouts are not equiprobable
+    (ships with fewer options left weigh more): use sample_fleet() to draw
+    layouts.
+
+    Args:
+        table: PlacementTable of the board
+        ship_sizes: Size of each ship to place
+        rng: Random source (module random or a random.Random instance)
+        blocked: Bitmask of cells no ship may cover
+
+    Returns:
+        List of Placement, one per entry of ship_sizes and in the same order,
+        or None if the fleet cannot fit on the board
+    """
+    order = sorted(range(len(ship_sizes)), key=lambda i: ship_sizes[i], reverse=True)
+    sizes = [ship_sizes[i] for i in order]
+    dead_states = set()
+    budget = [0]
+
+    def search(depth, blocked):
+        if depth == len(sizes):
+            return []
+        if (depth, blocked) in dead_states:
+            return None
+        budget[0] -= 1
+        if budget[0] < 0:
+            raise _BudgetExhausted()
+
+        # Draw candidates in random order without shuffling the whole list up
+        # front: most of the time the first legal draw leads to a full layout.
+        # Once draws keep hitting blocked cells, drop every blocked footprint at once.
+        pool = list(table.placements_for(sizes[depth]))
+        remaining = len(pool)
+        misses = 0
+        while remaining:
+            pick = rng.randrange(remaining)
+            placement = pool[pick]
+            remaining -= 1
+            pool[pick] = pool[remaining]
+            if placement.mask & blocked:
+                misses += 1
+                if misses == 8:
+                    pool = [p for p in pool[:remaining] if not p.mask & blocked]
+                    remaining = len(pool)
+                continue
+
+            rest = search(depth + 1, blocked | placement.area_mask)
+            if rest is not None:
+                rest.append(placement)
+                return rest
+
+        dead_states.add((depth, blocked))
+        return None
+
+    attempt_budget = 4 * len(sizes)
+    while True:
+        budget[0] = attempt_budget
+        try:
+            chosen = search(0, blocked)
+            break
+        except _BudgetExhausted:
+            attempt_budget *= 2
+
+    if chosen is None:
+        return None
+
+    # search() returns the placements deepest first
+    chosen.reverse()
+    layout = [None] * len(ship_sizes)
+    for index, placement in zip(order, chosen):
+        layout[index] = placement
+    return layout
+
+
+def _rejection_draw(table, ship_sizes, rng, blocked):
+    """Exactly uniform layout by whole-layout rejection, or None after REJECTION_ATTEMPTS draws"""
+    # Largest ships first: most conflicts show up after a draw or two
+    order = sorted(range(len(ship_sizes)), key=lambda i: ship_sizes[i], reverse=True)
+    pools = [table.placements_for(ship_sizes[i]) for i in order]
+    if not all(pools):
+        return None
+    for _ in range(REJECTION_ATTEMPTS):
+        taken = blocked
+        chosen = []
+        for pool in pools:
+            placement = pool[rng.randrange(len(pool))]
+            if placement.mask & taken:
+                break
+            taken |= placement.area_mask
+            chosen.append(placement)
+        else:
+            layout = [None] * len(ship_sizes)
+            for index, placement in zip(order, chosen):
+                layout[index] = placement
+            return layout
+    return None
+
+
+def _walk(table, ship_sizes, layout, rng, blocked):
+    """Mix a legal layout towards the uniform distribution by moving one ship at a time"""
+    for _ in range(WALK_SWEEPS):
+        for index, size in enumerate(ship_sizes):
+            taken = blocked
+            for other, placement in enumerate(layout):
+                if other != index:
+                    taken |= placement.area_mask
+            # Draw until a footprint fits; a crowded ship may give up and stay
+            # put, which keeps every move symmetric and the walk uniform
+            pool = table.placements_for(size)
+            for _ in range(4 * len(ship_sizes) + 16):
+                placement = pool[rng.randrange(len(pool))]
+                if not placement.mask & taken:
+                    layout[index] = placement
+                    break
+    return layout
+
+
+@lru_cache(maxsize=8)
+def _layout_counter(table, ship_sizes, blocked):
+    """Shared _LayoutCounter for a fleet (sizes sorted), or None if it needs too many states"""
+    try:
+        return _LayoutCounter(table, ship_sizes, blocked)
+    except _BudgetExhausted:
+        return None
+
+
+class _LayoutCounter:
+    """
+    Number of legal completions of every partial layout of a fleet
+
+    A partial layout is summed up by the cells still free and the ships
+    still to place: the lowest free cell is either left empty or the first
+    cell of a ship, and ships of the same size are interchangeable (the
+    same scheme as posterior.count_layouts, without shots).
+    """
+
+    def __init__(self, table, ship_sizes, blocked):
+        size = table.grid_size
+        self.lengths = sorted(set(ship_sizes))
+        self.full = tuple(ship_sizes.count(length) for length in self.lengths)
+
+        # Footprints by the bit of their first cell; a 1-cell ship has the same one both ways
+        self.starts = {}
+        for index, length in enumerate(self.lengths):
+            for placement in table.placements_for(length):
+                if length == 1 and not placement.horizontal:
+                    continue
+                bit = 1 << (placement.y * size + placement.x)
+                self.starts.setdefault(bit, []).append((placement, index))
+
+        self.root = ((1 << (size * size)) - 1) & ~blocked
+        self.memo = {}
+        self.total = self.count(self.root, self.full)
+
+    def children(self, free, ships):
+        """States reachable by deciding the lowest free cell, with the placement made (or None)"""
+        low = free & -free
+        result = [(free ^ low, ships, None)]
+        for placement, index in self.starts.get(low, ()):
+            if ships[index] and placement.mask & free == placement.mask:
+                left = ships[:index] + (ships[index] - 1,) + ships[index + 1:]
+                result.append((free & ~placement.area_mask, left, placement))
+        return result
+
+    def count(self, free, ships):
+        """
+        Number of ways to place `ships` on the `free` cells
+
+        Raises:
+            _BudgetExhausted: If more than MAX_COUNTED_STATES states are needed
+        """
+        key = (free, ships)
+        known = self.memo.get(key)
+        if known is not None:
+            return known
+        needed = sum(length * number for length, number in zip(self.lengths, ships))
+        if not needed:
+            total = 1
+        elif needed > bin(free).count("1"):
+            total = 0
+        else:
+            if len(self.memo) >= MAX_COUNTED_STATES:
+                raise _BudgetExhausted()
+            total = 0
+            for child_free, child_ships, _ in self.children(free, ships):
+                total += self.count(child_free, child_ships)
+        self.memo[key] = total
+        return total
+
+    def draw(self, ship_sizes, rng):
+        """
+        Draw a layout uniformly among all those counted
+
+        Returns:
+            List of Placement, one per entry of ship_sizes and in the same order,
+            or None if no layout fits
+        """
+        if not self.total:
+            return None
+        free, ships = self.root, self.full
+        by_size = {}
+        while any(ships):
+            pick = rng.randrange(self.count(free, ships))
+            for child_free, child_ships, placement in self.children(free, ships):
+                pick -= self.count(child_free, child_ships)
+                if pick < 0:
+                    break
+            free, ships = child_free, child_ships
+            if placement is not None:
+                by_size.setdefault(placement.size, []).append(placement)
+
+        # Ships of the same size take the drawn footprints in random order
+        for placements in by_size.values():
+            rng.shuffle(placements)
+        return [by_size[size].pop() for size in ship_sizes]
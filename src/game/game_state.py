@@ -1,32 +1,128 @@
-from importlib import import_module
+import copy
+import logging
+import random
+from .board import Board
 from .player import Player
-from ..utils.constants import PLACING_SHIPS, WAITING_FOR_OPPONENT, YOUR_TURN, OPPONENT_TURN, GAME_OVER, GRID_SIZE
+from .event_log import EventLog, GameEvent, EVENT_FLEET, EVENT_SHOT, EVENT_TURN
+from .rules import DEFAULT_RULES
+from .replay import ReplayWriter, fleet_layout
+from .shot_ledger import MISS, HIT, SUNK
+from .zobrist import TURN_KEY, rotate64
+from ..utils.constants import (
+    PLACING_SHIPS, WAITING_FOR_OPPONENT, YOUR_TURN, OPPONENT_TURN, GAME_OVER, DEFAULT_DIFFICULTY
+)
+
+logger = logging.getLogger(__name__)
 
 class GameState:
     """
     Class to track the overall state of the game,
     especially for network synchronization
+
+    Fleet commitments, shots and turn switches go through an EventLog
+    (self.history), so the game can be moved back and forth with undo(),
+    redo() and goto() without replaying it from the start.
     """
     
-    def __init__(self):
-        self.players = [Player(0), Player(1)]
+    def __init__(self, rules=None, board_class=Board, difficulty=DEFAULT_DIFFICULTY, seed=None):
+        """
+        Args:
+            rules: GameRules of the game (DEFAULT_RULES if None)
+            board_class: Board backend used by both players
+            difficulty: Level of the AI in solo mode ('facile', 'moyenne', 'difficile', 'expert', 'ultime')
+            seed: Seed of the game's random generator; two games with the same
+                  seed and the same moves play out identically (random if None)
+        """
+        self.rules = rules or DEFAULT_RULES
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.players = [
+            Player(0, self.rules, board_class, self.spawn_rng()),
+            Player(1, self.rules, board_class, self.spawn_rng()),
+        ]
         self.current_player_index = 0  # Index of the player whose turn it is
         self.state = PLACING_SHIPS
         self.winner = None
         self.last_shot = None  # (x, y, hit, ship_id, sunk)
         self.is_solo_mode = False  # Flag pour indiquer le mode solo
-        
-        # Récupérer la difficulté depuis ShipPlacement si disponible
-        if hasattr(import_module('src.ui.screens.ship_placement').ShipPlacement, 'last_selected_difficulty'):
-            self.difficulty = import_module('src.ui.screens.ship_placement').ShipPlacement.last_selected_difficulty
-        else:
-            self.difficulty = 'moyenne'  # Valeur par défaut
-        
-        print(f"GameState initialisé avec difficulté: {self.difficulty}")
+        self._frozen = False  # Read-only snapshot
+        self.difficulty = difficulty
         
         # Instance d'IA pour le mode solo
         self.ai = None
         
+        # Journal des événements de la partie (undo/redo, see event_log)
+        self.history = EventLog()
+        
+        # Enregistrement binaire de la partie (see record_replay)
+        self.replay_stream = None
+        self.replay = None
+        
+    def snapshot(self):
+        """
+        Get a read-only copy of the game
+
+        The boards are copy-on-write snapshots (see Board.snapshot), so this
+        is cheap. The AI is not part of the position and is not copied.
+        """
+        return self._clone([player.snapshot() for player in self.players], frozen=True)
+        
+    def fork(self):
+        """Get a writable copy of the game to play hypothetical moves on (see snapshot)"""
+        return self._clone([player.fork() for player in self.players], frozen=False)
+        
+    def _clone(self, players, frozen):
+        """Shallow copy of the game with the given players"""
+        clone = copy.copy(self)
+        clone.players = players
+        clone.rng = copy.copy(self.rng)
+        clone.ai = None
+        clone.history = EventLog(self.history.checkpoint_interval)  # A copy starts its own history
+        clone.replay_stream = clone.replay = None
+        clone._frozen = frozen
+        return clone
+        
+    def _check_writable(self):
+        """Refuse to change a snapshot"""
+        if self._frozen:
+            raise TypeError("GameState snapshots are read-only, fork() them to play on")
+        
+    def record_replay(self, stream):
+        """
+        Stream the game into a binary replay (see replay.ReplayWriter)
+        
+        The header is written as soon as both fleets are placed (right away
+        if they already are), then every valid shot appends a record.
+        
+        Args:
+            stream: Binary file object opened for writing
+        """
+        self.replay_stream = stream
+        if all(player.ready for player in self.players):
+            self._start_replay()
+            
+    def _start_replay(self):
+        """Write the replay header once the fleets are known"""
+        fleets = [fleet_layout(player) for player in self.players]
+        self.replay = ReplayWriter(self.replay_stream, self.rules, fleets, self.seed)
+        
+    @property
+    def position_hash(self):
+        """
+        64-bit Zobrist hash of the position: both boards and whose turn it is
+        
+        O(1): the boards keep their hashes up to date (see Board.hash). The
+        second board's hash is rotated so that swapping the boards changes it.
+        """
+        value = self.players[0].board.hash ^ rotate64(self.players[1].board.hash, 32)
+        if self.current_player_index:
+            value ^= TURN_KEY
+        return value
+        
+    def spawn_rng(self):
+        """Derive an independent random generator (for a player or the AI) from the game's one"""
+        return random.Random(self.rng.getrandbits(64))
+        
     def get_current_player(self):
         """Get the player whose turn it is"""
         return self.players[self.current_player_index]
@@ -37,64 +133,243 @@ class GameState:
         
     def switch_turn(self):
         """Switch to the other player's turn"""
-        self.current_player_index = 1 - self.current_player_index
+        self._check_writable()
+        self._record(EVENT_TURN, self.current_player_index, None)
         
     def player_ready(self, player_id):
         """Mark a player as ready (all ships placed)"""
-        self.players[player_id].ready = True
+        self._check_writable()
+        player = self.players[player_id]
+        layout = [
+            (index, ship.x, ship.y, ship.horizontal)
+            for index, ship in enumerate(player.ships) if ship.is_placed()
+        ]
+        self._record(EVENT_FLEET, player_id, layout)
         
-        # If both players are ready, start the game
-        if all(player.ready for player in self.players):
-            self.state = YOUR_TURN if self.current_player_index == 0 else OPPONENT_TURN
-            
-    def process_shot(self, player_id, x, y):
+    def play_events(self, events):
         """
-        Process a shot from a player
+        Record and apply events again, as when they were first played (e.g. to rebuild a saved game)
         
         Args:
-            player_id: ID of the player making the shot
-            x, y: Coordinates of the shot
-            
-        Returns:
-            True if the shot was valid, False otherwise
-            OR (x, y, hit, ship_id, sunk) en mode solo
+            events: List of (kind, player index, data), see event_log
         """
-        # Ensure it's the player's turn
-        if self.current_player_index != player_id or self.state not in [YOUR_TURN, OPPONENT_TURN]:
-            return False
+        self._check_writable()
+        for kind, player_id, data in events:
+            self._record(kind, player_id, data)
+        
+    def _record(self, kind, player_id, data):
+        """Append a new event to the history and apply it"""
+        event = GameEvent(kind, player_id, data, self._turn_state())
+        self._checkpoint()
+        self.history.append(event)
+        self._apply(event)
+        return event
+        
+    def _turn_state(self):
+        """Fields that events change besides the boards, as stored in GameEvent.before"""
+        return self.current_player_index, self.state, self.winner, self.last_shot
+        
+    def _checkpoint(self):
+        """Keep a snapshot of the position every checkpoint_interval events"""
+        if self.history.wants_checkpoint():
+            self.history.checkpoints[self.history.cursor] = self.snapshot()
+            
+    def _apply(self, event):
+        """Play an event on the game (first time or redo)"""
+        if event.kind == EVENT_SHOT:
+            self._apply_shot(event)
+        elif event.kind == EVENT_TURN:
+            self.current_player_index = 1 - self.current_player_index
+        elif event.kind == EVENT_FLEET:
+            self._apply_fleet(event)
+            
+    def _revert(self, event):
+        """Take an event back"""
+        self.current_player_index, self.state, self.winner, self.last_shot = event.before
+        if event.kind == EVENT_SHOT:
+            board = self.players[1 - event.player].board
+            for hit, ship_id, sunk in reversed(event.result):
+                if ship_id is not None:  # Invalid shots did not touch the board
+                    board.undo_shot()
+        elif event.kind == EVENT_FLEET:
+            # The ships stay where they are, only the commitment is taken back
+            self.players[event.player].ready = event.result
             
-        # Process the shot on the opponent's board
-        opponent = self.get_opponent_player()
-        hit, ship_id, sunk = opponent.receive_shot(x, y)
+    def _apply_fleet(self, event):
+        """Place a player's ships as recorded (they already are unless redoing) and mark them ready"""
+        player = self.players[event.player]
+        moved = [
+            (index, x, y, horizontal) for index, x, y, horizontal in event.data
+            if (player.ships[index].x, player.ships[index].y, player.ships[index].horizontal) != (x, y, horizontal)
+        ]
+        for index, _, _, _ in moved:
+            player.board.remove_ship(player.ships[index])
+        for index, x, y, horizontal in moved:
+            player.place_ship(index, x, y, horizontal)
+        event.result = player.ready  # Player sets it on its own once every ship is placed
+        player.ready = True
+        
+        # If both players are ready, start the game
+        if all(player.ready for player in self.players):
+            self.state = YOUR_TURN if self.current_player_index == 0 else OPPONENT_TURN
+            if self.replay_stream is not None and self.replay is None:
+                self._start_replay()
+                
+    def _apply_shot(self, event):
+        """Fire a recorded salvo and move the game on"""
+        opponent = self.players[1 - event.player]
+        event.result = opponent.receive_shots(event.data)
         
         # Record the last shot for UI updates
+        (x, y), (hit, ship_id, sunk) = event.data[-1], event.result[-1]
         self.last_shot = (x, y, hit, ship_id, sunk)
         
         # Check if the game is over
         if opponent.has_lost():
             self.state = GAME_OVER
-            self.winner = player_id
+            self.winner = event.player
         else:
             # Switch turns
-            self.switch_turn()
+            self.current_player_index = 1 - self.current_player_index
             if self.current_player_index == 0:
                 self.state = YOUR_TURN
             else:
                 self.state = OPPONENT_TURN
+                
+    def undo(self):
+        """
+        Take back the last event (shot, turn switch or fleet commitment)
+        
+        Returns:
+            The GameEvent taken back, or None if there is nothing to undo
+        """
+        self._check_writable()
+        if not self.history.can_undo():
+            return None
+        self.history.cursor -= 1
+        event = self.history[self.history.cursor]
+        self._revert(event)
+        self._after_takeback()
+        return event
+        
+    def redo(self):
+        """
+        Play again the last event taken back
+        
+        Returns:
+            The GameEvent played again, or None if there is nothing to redo
+        """
+        self._check_writable()
+        if not self.history.can_redo():
+            return None
+        event = self.history[self.history.cursor]
+        self._checkpoint()
+        self.history.cursor += 1
+        self._apply(event)
+        self._sync_ai()
+        return event
+        
+    def goto(self, index):
+        """
+        Move the game to the position after its first `index` events
+        
+        Starts from the closest checkpoint when that is nearer than the
+        current position, so at most checkpoint_interval events are replayed.
+        The Player objects are replaced when a checkpoint is restored.
+        
+        Args:
+            index: Number of events of the history to have applied
+        """
+        self._check_writable()
+        history = self.history
+        if not 0 <= index <= len(history):
+            raise IndexError("Event index out of range")
+        
+        checkpoint_index, checkpoint = history.checkpoint_before(index)
+        if checkpoint is not None and index - checkpoint_index < abs(index - history.cursor):
+            self.players = [player.fork() for player in checkpoint.players]
+            self.current_player_index, self.state, self.winner, self.last_shot = checkpoint._turn_state()
+            history.cursor = checkpoint_index
+            self._after_takeback()
+            
+        while history.cursor < index:
+            self.redo()
+        while history.cursor > index:
+            self.undo()
+            
+    def _after_takeback(self):
+        """Bring what lives outside the history in line after moving back"""
+        # A replay holds a single line of play: stop recording at the first takeback
+        self.replay_stream = None
+        self.replay = None
+        self._sync_ai()
+        
+    def _sync_ai(self):
+        """Tell the solo AI which of the human's ships are sunk at the current position"""
+        if self.ai:
+            self.ai.reset()
+            self.ai.update_ship_status([ship.size for ship in self.players[0].board.ships if ship.is_sunk()])
+            
+    def process_shot(self, player_id, x, y):
+        """
+        Process a shot from a player (a salvo of one shot, see process_shots)
+        
+        Args:
+            player_id: ID of the player making the shot
+            x, y: Coordinates of the shot
+            
+        Returns:
+            True if the shot was valid, False otherwise
+            OR (x, y, hit, ship_id, sunk) en mode solo
+        """
+        if not self.process_shots(player_id, [(x, y)]):
+            return False
         
         # Si mode solo et bot qui tire, retourner le tuple complet
         if self.is_solo_mode and player_id == 1:
-            # Mettre à jour l'état des navires coulés pour l'IA
-            sunk_ships = []
-            if self.ai and sunk:
-                for ship in opponent.board.ships:
-                    if ship.hits >= ship.size:
-                        sunk_ships.append(ship.size)
-                self.ai.update_ship_status(sunk_ships)
-            
             return self.last_shot
                 
         return True
+        
+    def process_shots(self, player_id, coords):
+        """
+        Process a salvo: up to rules.salvo_size shots fired in one turn
+        
+        The shots are resolved together on the opponent's board (see
+        Board.receive_shots), then the game is checked for a winner and the
+        turn passes, once for the whole salvo.
+        
+        Args:
+            player_id: ID of the player making the shots
+            coords: List of (x, y) coordinates
+            
+        Returns:
+            List of (x, y, hit, ship_id, sunk), one per shot, or False if it is
+            not the player's turn or the salvo is empty or too big
+        """
+        self._check_writable()
+        coords = tuple((x, y) for x, y in coords)
+        
+        # Ensure it's the player's turn
+        if self.current_player_index != player_id or self.state not in [YOUR_TURN, OPPONENT_TURN]:
+            return False
+        if not 1 <= len(coords) <= self.rules.salvo_size:
+            return False
+            
+        # Process the shots on the opponent's board
+        results = self._record(EVENT_SHOT, player_id, coords).result
+        shots = [(x, y, hit, ship_id, sunk) for (x, y), (hit, ship_id, sunk) in zip(coords, results)]
+        if self.replay:
+            for x, y, _, ship_id, _ in shots:
+                if ship_id is not None:
+                    self.replay.write_shot(player_id, x, y)
+        
+        # Transmettre à l'IA le résultat de ses tirs (navires coulés compris)
+        if self.is_solo_mode and player_id == 1 and self.ai:
+            for x, y, hit, _, sunk in shots:
+                self.ai.observe(x, y, SUNK if sunk else HIT if hit else MISS)
+            
+        return shots
     
     
     def bot_play(self):
@@ -103,7 +378,10 @@ class GameState:
         
         Returns:
             (x, y, hit, ship_id, sunk): Résultat du tir du bot
+                                        (du dernier tir de la salve en mode salve)
         """
+        self._check_writable()
+        
         # Vérifier si c'est le tour du bot (joueur 1)
         if self.current_player_index != 1:
             return None
@@ -114,28 +392,39 @@ class GameState:
         if not self.ai:
             try:
                 from src.game.BattleshipAI import BattleshipAI
-                print(f"Initialisation de l'IA avec difficulté: {self.difficulty}")
-                self.ai = BattleshipAI(self.difficulty)
+                logger.debug("Initialisation de l'IA avec difficulté: %s", self.difficulty)
+                self.ai = BattleshipAI(self.difficulty, self.rules, self.spawn_rng(),
+                                       deterministic=self.seed is not None)
             except Exception as e:
-                print(f"Erreur lors de l'initialisation de l'IA: {e}")
+                logger.warning("Erreur lors de l'initialisation de l'IA: %s", e)
                 # Fallback à la difficulté moyenne en cas d'erreur
                 from src.game.BattleshipAI import BattleshipAI
-                self.ai = BattleshipAI('moyenne')
+                self.ai = BattleshipAI('moyenne', self.rules, self.spawn_rng(),
+                                       deterministic=self.seed is not None)
         
-        # Choisir une cible en fonction de la difficulté
-        x, y = self.ai.choose_target(player.board)
+        # Choisir les cibles en fonction de la difficulté. Les tirs d'une salve partent
+        # ensemble : les cibles déjà choisies sont exclues, sans connaître leur résultat
+        salvo_size = self.rules.salvo_size
+        targets = []
+        while len(targets) < salvo_size:
+            target = self.ai.choose_target(player.board, targets)
+            if target is None or None in target:
+                break
+            targets.append(target)
         
-        if x is None or y is None:
+        if not targets:
             return None
         
-        # Tirer sur la cible
-        shot_result = self.process_shot(1, x, y)
+        # Tirer la salve
+        if not self.process_shots(1, targets):
+            return None
         
         # Retourner le résultat
-        return shot_result
+        return self.last_shot
         
     def reset(self):
         """Reset the game state for a new game"""
+        self._check_writable()
         for player in self.players:
             player.reset()
             
@@ -143,6 +432,11 @@ class GameState:
         self.state = PLACING_SHIPS
         self.winner = None
         self.last_shot = None
+        self.history = EventLog(self.history.checkpoint_interval)
+        
+        # A replay holds a single game: stop recording into the old stream
+        self.replay_stream = None
+        self.replay = None
         
         # Réinitialiser l'IA
         if self.ai:
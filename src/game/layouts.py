@@ -0,0 +1,83 @@
+"""
+Bulk generation of random fleet layouts.
+
+A compact layout is a tuple with one position code per ship, in the order
+of the fleet (see placement_table.encode_position). No Player, Board or Ship
+is built, which keeps generation fast enough for simulations.
+"""
+
+import random
+from array import array
+from .fleet_placement import sample_fleet
+
+
+def generate_layouts(rules, n, seed=None):
+    """
+    Stream random legal layouts of the rules' fleet
+
+    Args:
+        rules: GameRules giving the board size and fleet
+        n: Number of layouts to generate
+        seed: Seed of the private random generator (None for a random seed)
+
+    Yields:
+        Tuples of position codes, one per ship
+
+    Raises:
+        ValueError: If the fleet cannot fit on the board
+    """
+    rng = random.Random(seed)
+    table = rules.placement_table
+    sizes = rules.ship_sizes
+    for _ in range(n):
+        layout = sample_fleet(table, sizes, rng)
+        if layout is None:
+            raise ValueError(f"Fleet {sizes} does not fit on a {rules.grid_size}x{rules.grid_size} board")
+        yield tuple(placement.code for placement in layout)
+
+
+def allocate_layout_buffer(rules, n):
+    """
+    Allocate a zeroed flat buffer able to hold n layouts for fill_layouts()
+
+    Uses 16-bit codes when the board allows it, 32-bit otherwise.
+    """
+    typecode = "H" if 2 * rules.grid_size * rules.grid_size <= 0xFFFF else "I"
+    buffer = array(typecode)
+    buffer.frombytes(bytes(n * len(rules.ship_sizes) * buffer.itemsize))
+    return buffer
+
+
+def fill_layouts(rules, buffer, seed=None):
+    """
+    Fill a preallocated flat buffer with random layouts
+
+    Layout i occupies buffer[i * k:(i + 1) * k] where k is the number of ships.
+    Any mutable sequence of ints works (array.array, list, NumPy array...).
+
+    Args:
+        rules: GameRules giving the board size and fleet
+        buffer: Buffer whose length is a multiple of the fleet size
+        seed: Seed of the private random generator (None for a random seed)
+
+    Returns:
+        Number of layouts written
+    """
+    count = len(buffer) // len(rules.ship_sizes)
+    offset = 0
+    for layout in generate_layouts(rules, count, seed):
+        for code in layout:
+            buffer[offset] = code
+            offset += 1
+    return count
+
+
+def decode_layout(rules, layout):
+    """
+    Expand a compact layout back into Placement objects
+
+    Returns:
+        List of Placement, one per ship of the fleet
+    """
+    table = rules.placement_table
+    return [table.from_code(size, code) for size, code in zip(rules.ship_sizes, layout)]
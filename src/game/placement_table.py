@@ -0,0 +1,141 @@
+from functools import lru_cache
+from ..utils.constants import GRID_SIZE, SHIPS
+
+DEFAULT_SHIP_SIZES = tuple(ship["size"] for ship in SHIPS)
+
+def encode_position(x, y, horizontal, grid_size):
+    """Pack a ship position into one int: start cell index * 2 + (0 horizontal, 1 vertical)"""
+    return (y * grid_size + x) * 2 + (0 if horizontal else 1)
+
+
+class Placement:
+    """One legal ship footprint on an empty board"""
+
+    __slots__ = ("size", "x", "y", "horizontal", "code", "cells", "area", "mask", "area_mask")
+
+    def __init__(self, size, x, y, horizontal, grid_size):
+        self.size = size
+        self.x = x
+        self.y = y
+        self.horizontal = horizontal
+
+        # Compact identifier of the position, unique for a given ship size
+        self.code = encode_position(x, y, horizontal, grid_size)
+
+        # Cells covered by the ship
+        if horizontal:
+            self.cells = tuple((x + i, y) for i in range(size))
+        else:
+            self.cells = tuple((x, y + i) for i in range(size))
+
+        # Cells that must be empty: the ship and its 1-cell border, clipped to the grid
+        length, width = (size, 1) if horizontal else (1, size)
+        self.area = tuple(
+            (nx, ny)
+            for ny in range(max(y - 1, 0), min(y + width + 1, grid_size))
+            for nx in range(max(x - 1, 0), min(x + length + 1, grid_size))
+        )
+
+        # Same sets as bitmasks, cell (x, y) being bit y * grid_size + x
+        self.mask = sum(1 << (cy * grid_size + cx) for cx, cy in self.cells)
+        self.area_mask = sum(1 << (cy * grid_size + cx) for cx, cy in self.area)
+
+    def __repr__(self):
+        return f"Placement(size={self.size}, x={self.x}, y={self.y}, horizontal={self.horizontal})"
+
+
+class PlacementTable:
+    """
+    Every in-bounds ship footprint for a grid size, with its adjacency area.
+
+    Entries are built per ship size on first use; get one through
+    get_placement_table() so the table is shared by everything using the same rules.
+    """
+
+    def __init__(self, grid_size, ship_sizes):
+        self.grid_size = grid_size
+        self.ship_sizes = tuple(ship_sizes)
+        self._by_size = {}
+        self._lookup = {}
+        self._coverage = {}
+
+    def placements_for(self, size):
+        """
+        Get all placements of a ship of the given size
+
+        Returns:
+            List of Placement, horizontal ones first, in row-major order
+        """
+        placements = self._by_size.get(size)
+        if placements is None:
+            placements = []
+            for horizontal in (True, False):
+                max_x = self.grid_size - size if horizontal else self.grid_size - 1
+                max_y = self.grid_size - 1 if horizontal else self.grid_size - size
+                for y in range(max_y + 1):
+                    for x in range(max_x + 1):
+                        placement = Placement(size, x, y, horizontal, self.grid_size)
+                        placements.append(placement)
+                        self._lookup[(size, x, y, horizontal)] = placement
+            self._by_size[size] = placements
+        return placements
+
+    def coverage(self, size):
+        """
+        Get the cells of every placement of a size as indexes, and the reverse index
+
+        Returns:
+            (cells, covering): cells[i] is the tuple of cell indexes (y * grid_size + x)
+            covered by placements_for(size)[i], and covering[cell] the tuple of the
+            indexes i of the placements covering that cell
+        """
+        coverage = self._coverage.get(size)
+        if coverage is None:
+            cells = [
+                tuple(y * self.grid_size + x for x, y in placement.cells)
+                for placement in self.placements_for(size)
+            ]
+            covering = [[] for _ in range(self.grid_size * self.grid_size)]
+            for index, footprint in enumerate(cells):
+                for cell in footprint:
+                    covering[cell].append(index)
+            coverage = self._coverage[size] = (cells, [tuple(indexes) for indexes in covering])
+        return coverage
+
+    def get(self, size, x, y, horizontal):
+        """
+        Look up a single placement
+
+        Returns:
+            The Placement, or None if the ship would leave the grid
+        """
+        if size not in self._by_size:
+            self.placements_for(size)
+        return self._lookup.get((size, x, y, bool(horizontal)))
+
+    def from_code(self, size, code):
+        """
+        Look up a placement from its compact code (see encode_position)
+
+        Returns:
+            The Placement, or None if the code does not describe an in-bounds position
+        """
+        cell, vertical = divmod(code, 2)
+        y, x = divmod(cell, self.grid_size)
+        return self.get(size, x, y, not vertical)
+
+
+def get_placement_table(grid_size=GRID_SIZE, ship_sizes=DEFAULT_SHIP_SIZES):
+    """
+    Get the shared placement table for a grid size and fleet
+
+    Args:
+        grid_size: Width and height of the board
+        ship_sizes: Sizes of the ships in the fleet
+    """
+    return _cached_table(grid_size, tuple(ship_sizes))
+
+
+@lru_cache(maxsize=None)
+def _cached_table(grid_size, ship_sizes):
+    return PlacementTable(grid_size, ship_sizes)
@@ -1,21 +1,48 @@
+import copy
+import random
+
 from .board import Board
-from .ship import Ship
-from ..utils.constants import SHIPS
+from .rules import DEFAULT_RULES
 
 class Player:
-    def __init__(self, id):
+    def __init__(self, id, rules=None, board_class=Board, rng=None):
         self.id = id
-        self.board = Board()
-        self.ships = [Ship(ship["name"], ship["size"]) for ship in SHIPS]
+        self.rules = rules or DEFAULT_RULES
+        self.rng = rng or random.Random()  # Random source of the game, never the shared module one
+        self.board = board_class(self.rules)
+        self._create_ships()
         self.ready = False  # Flag to indicate if player has placed all ships
         
+    def _create_ships(self):
+        """Create the fleet described by the rules on the board"""
+        for ship in self.rules.ships:
+            self.board.new_ship(ship["name"], ship["size"])
+            
+    @property
+    def ships(self):
+        """The player's ships, placed or not (owned by the board)"""
+        return self.board.fleet
+        
     def reset(self):
         """Reset the player for a new game"""
         self.board.reset()
-        Ship.reset_ids()
-        self.ships = [Ship(ship["name"], ship["size"]) for ship in SHIPS]
+        self._create_ships()
         self.ready = False
         
+    def snapshot(self):
+        """Get a read-only copy of the player (see Board.snapshot)"""
+        clone = copy.copy(self)
+        clone.board = self.board.snapshot()
+        clone.rng = copy.copy(self.rng)
+        return clone
+        
+    def fork(self):
+        """Get a writable copy of the player (see Board.fork)"""
+        clone = copy.copy(self)
+        clone.board = self.board.fork()
+        clone.rng = copy.copy(self.rng)
+        return clone
+        
     def place_ship(self, ship_index, x, y, horizontal):
         """
         Place a ship on the player's board
@@ -51,75 +78,38 @@ class Player:
         if not ship.is_placed():
             return
             
-        # Clear the ship from the grid
-        for x, y in ship.get_coordinates():
-            if 0 <= x < len(self.board.grid[0]) and 0 <= y < len(self.board.grid):
-                self.board.grid[y][x] = 0
-                
-        # Reset ship position
-        ship.x = -1
-        ship.y = -1
-        
-        # Remove from ships list if it's there
-        if ship in self.board.ships:
-            self.board.ships.remove(ship)
+        self.board.remove_ship(ship)
             
     def auto_place_ships(self):
         """
         Automatically place all ships on the board randomly
         
         Returns:
-            True if all ships were placed successfully, False otherwise
+            True if all ships were placed successfully,
+            False if the fleet cannot fit on the board at all
         """
-        import random
+        # First take every ship off the board
+        for ship in list(self.board.ships):
+            self.board.remove_ship(ship)
         
-        # First reset the board
-        self.board.reset()
-        
-        # Maximum number of retries for the whole placement
-        max_total_attempts = 3
-        total_attempts = 0
-        
-        while total_attempts < max_total_attempts:
-            # Reset board for a new attempt
-            self.board.reset()
-            ships_placed = 0
-            
-            # Try to place each ship
-            for ship in self.ships:
-                placed = False
-                max_attempts_per_ship = 100
-                attempts = 0
-                
-                while not placed and attempts < max_attempts_per_ship:
-                    # Random position
-                    x = random.randint(0, len(self.board.grid[0]) - 1)
-                    y = random.randint(0, len(self.board.grid) - 1)
-                    horizontal = random.choice([True, False])
-                    
-                    placed = self.board.place_ship(ship, x, y, horizontal)
-                    attempts += 1
-                    
-                if not placed:
-                    # If we couldn't place this ship, break the loop and try again
-                    break
-                else:
-                    ships_placed += 1
+        layout = self.board.sample_layout([ship.size for ship in self.ships], self.rng)
+        if layout is None:
+            return False
             
-            # If all ships were placed successfully
-            if ships_placed == len(self.ships):
-                self.ready = True
-                return True
-                
-            total_attempts += 1
+        for ship, (x, y, horizontal) in zip(self.ships, layout):
+            self.board.place_ship(ship, x, y, horizontal)
             
-        # If we couldn't place all ships after max retries
-        return False
+        self.ready = True
+        return True
         
     def receive_shot(self, x, y):
         """Process a shot from the opponent"""
         return self.board.receive_shot(x, y)
         
+    def receive_shots(self, coords):
+        """Process a salvo from the opponent (see Board.receive_shots)"""
+        return self.board.receive_shots(coords)
+        
     def has_lost(self):
         """Check if the player has lost (all ships sunk)"""
         return self.board.all_ships_sunk()
\ No newline at end of file
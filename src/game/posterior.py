@@ -0,0 +1,478 @@
+"""
+Where the ships left afloat can be, given the shots so far.
+
+PosteriorSampler draws complete layouts of the remaining fleet that agree
+with every shot: no ship on a miss, every hit not yet sunk covered, no ship
+afloat made of hits only, no ship touching a sunk one, and no contact
+between ships. Each cell then gets the
+weighted share of the layouts that put a ship on it.
+
+Layouts are built constructively rather than drawn blindly and rejected:
+first the lowest uncovered hit gets a ship, drawn among the footprints that
+still fit and cover it, until every hit is covered; then the other ships are
+drawn among the footprints that still fit. Only a dead end (no footprint
+left for a hit or a ship) throws a draw away, which stays rare however many
+shots have been fired. Because some layouts are easier to build than others,
+each one is weighted by the number of choices made along the way
+(sequential importance sampling), so that the estimate converges to the
+occupancy over all consistent layouts, each counted once.
+
+Sampling is anytime: run() adds draws until a draw count or a time budget is
+spent, and grid() returns the estimate from everything drawn so far.
+
+count_layouts() gives the exact numbers instead, when they can be had within
+a budget. The board is first split into regions that no ship can join (cells
+a ship may still cover, grouped with their 8 neighbours); each region is
+counted on its own for every share of the fleet it could hold, and the
+shares are recombined. Inside a region, the lowest cell not decided yet is
+either left empty or the first cell of a ship, and the count of what is left
+only depends on the cells still free and the ships still to place, so it is
+memoized on exactly that. A second pass down the same states turns the
+counts into the number of layouts covering each cell.
+
+Cells are indexed y * grid_size + x, as in the placement table.
+"""
+import math
+import time
+from collections import Counter
+from functools import lru_cache
+
+from .shot_ledger import MISS, HIT, SUNK
+
+# Largest region count_layouts() takes on: its search goes one call deeper per cell
+MAX_REGION_CELLS = 500
+
+
+class PosteriorSampler:
+    """Weighted occupancy of every cell over random layouts consistent with the shots"""
+
+    def __init__(self, placement_table, fleet, states):
+        """
+        Args:
+            placement_table: PlacementTable of the board
+            fleet: Size of each ship of the whole fleet
+            states: Shot state of every cell (UNKNOWN, MISS, HIT or SUNK), indexed y * grid_size + x
+        """
+        size = placement_table.grid_size
+        self.grid_size = size
+        self.hits, self.remaining, self._candidates = _read_shots(placement_table, fleet, states)
+
+        # Footprints through each hit, keyed by the hit's bit
+        self._through_hit = {}
+        for candidates in self._candidates.values():
+            for candidate in candidates:
+                covered = candidate[0] & self.hits
+                while covered:
+                    low = covered & -covered
+                    self._through_hit.setdefault(low, []).append(candidate)
+                    covered ^= low
+
+        self.weights = [0.0] * (size * size)
+        self.total = 0.0
+        self.samples = 0  # Layouts drawn
+        self.draws = 0  # Attempts, dead ends included
+        self._log_scale = None  # Weights are stored divided by exp(_log_scale)
+
+    def run(self, rng, samples=None, time_budget=None):
+        """
+        Draw more layouts
+
+        Args:
+            rng: Random source (random.Random)
+            samples: Number of draws to attempt, None for no limit
+            time_budget: Seconds to spend, None for no limit
+
+        Returns:
+            Number of layouts added to the estimate
+
+        Raises:
+            ValueError: If neither samples nor time_budget is given
+        """
+        if samples is None and time_budget is None:
+            raise ValueError("run() needs a sample count or a time budget")
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        added = 0
+        draws = 0
+        while samples is None or draws < samples:
+            draws += 1
+            drawn = self._draw(rng)
+            if drawn is not None:
+                self._add(*drawn)
+                added += 1
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        self.draws += draws
+        self.samples += added
+        return added
+
+    def grid(self):
+        """
+        Estimated probability that each cell holds a ship
+
+        Shot cells are included (1.0 on hits not yet sunk, 0.0 on misses).
+
+        Returns:
+            Grid [y][x] of floats, all 0.0 while no layout has been drawn
+        """
+        size = self.grid_size
+        scale = 1.0 / self.total if self.total else 0.0
+        return [
+            [weight * scale for weight in self.weights[row * size:(row + 1) * size]]
+            for row in range(size)
+        ]
+
+    def _draw(self, rng):
+        """
+        Build one layout
+
+        Returns:
+            (log weight, footprints) or None on a dead end
+        """
+        blocked = 0
+        uncovered = self.hits
+        left = dict(self.remaining)
+        placed = []
+        log_weight = 0.0
+
+        # Cover the hits first, the lowest uncovered one each time. Ships of the same
+        # size count as distinct, so a footprint weighs as many ships of its size are left
+        while uncovered:
+            low = uncovered & -uncovered
+            options = [
+                candidate for candidate in self._through_hit.get(low, ())
+                if left.get(candidate[2]) and not candidate[0] & blocked
+            ]
+            total = sum(left[candidate[2]] for candidate in options)
+            if not total:
+                return None
+            pick = rng.randrange(total)
+            for candidate in options:
+                pick -= left[candidate[2]]
+                if pick < 0:
+                    break
+            log_weight += math.log(total)
+            mask, area_mask, length, _ = candidate
+            blocked |= area_mask
+            uncovered &= ~mask
+            left[length] -= 1
+            placed.append(candidate)
+
+        # Then the rest of the fleet, largest ships first
+        for length in sorted(left, reverse=True):
+            candidates = self._candidates[length]
+            for _ in range(left[length]):
+                options = [candidate for candidate in candidates if not candidate[0] & blocked]
+                if not options:
+                    return None
+                candidate = options[rng.randrange(len(options))]
+                log_weight += math.log(len(options))
+                blocked |= candidate[1]
+                placed.append(candidate)
+
+        return log_weight, placed
+
+    def _add(self, log_weight, placed):
+        """Add a layout to the occupancy weights"""
+        if self._log_scale is None or log_weight > self._log_scale:
+            # Rescale so that the heaviest layout so far weighs 1 (no float overflow)
+            if self._log_scale is not None:
+                factor = math.exp(self._log_scale - log_weight)
+                self.weights = [weight * factor for weight in self.weights]
+                self.total *= factor
+            self._log_scale = log_weight
+        weight = math.exp(log_weight - self._log_scale)
+        weights = self.weights
+        for candidate in placed:
+            for cell in candidate[3]:
+                weights[cell] += weight
+        self.total += weight
+
+
+class _BudgetExhausted(Exception):
+    """Raised to abandon an exact count that needs more states or time than allowed"""
+
+
+def count_layouts(placement_table, fleet, states, max_states=200000, time_budget=None):
+    """
+    Count exactly the layouts of the remaining fleet consistent with the shots
+
+    Ships of the same size are interchangeable: two layouts that only swap
+    them count once.
+
+    Args:
+        placement_table: PlacementTable of the board
+        fleet: Size of each ship of the whole fleet
+        states: Shot state of every cell (UNKNOWN, MISS, HIT or SUNK), indexed y * grid_size + x
+        max_states: Most memoized states to build before giving up, None for no
+                    limit; counting every share of the fleet in every region is
+                    charged against it before any search
+        time_budget: Seconds to spend before giving up, None for no limit
+
+    Returns:
+        (total, grid): number of consistent layouts and grid [y][x] of the
+        number of them that put a ship on each cell; None if the budget ran
+        out, a region is larger than MAX_REGION_CELLS, or no layout is
+        consistent with the shots
+    """
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    size = placement_table.grid_size
+    hits, remaining, candidates = _read_shots(placement_table, fleet, states)
+    lengths = sorted(remaining)
+    full = tuple(remaining[length] for length in lengths)
+
+    # Footprints by the bit of their first cell, with the index of their size in `lengths`
+    starts = {}
+    coverable = set()
+    for index, length in enumerate(lengths):
+        for mask, area_mask, _, cells in candidates[length]:
+            starts.setdefault(1 << cells[0], []).append((mask, area_mask, index, cells))
+            coverable.update(cells)
+    free = _to_mask(coverable, size)
+    if hits & ~free:
+        return None  # A hit no ship can cover
+    memo = {}
+    cells_needed = {}
+    fewer = {}  # (ships, index) -> ships with one less ship of size lengths[index]
+
+    def transitions(free, ships):
+        """States reachable by deciding the lowest free cell, with the footprint placed (or None)"""
+        low = free & -free
+        children = [] if low & hits else [(free ^ low, ships, None)]
+        for candidate in starts.get(low, ()):
+            mask, area_mask, index, _ = candidate
+            if ships[index] and mask & free == mask:
+                left = fewer.get((ships, index))
+                if left is None:
+                    left = fewer[ships, index] = ships[:index] + (ships[index] - 1,) + ships[index + 1:]
+                children.append((free & ~area_mask, left, candidate))
+        return children
+
+    def count(free, ships):
+        key = (free, ships)
+        known = memo.get(key)
+        if known is not None:
+            return known
+        needed = cells_needed.get(ships)
+        if needed is None:
+            needed = cells_needed[ships] = sum(length * number for length, number in zip(lengths, ships))
+        if not needed:
+            return 0 if free & hits else 1
+        if needed > bin(free).count("1"):
+            total = 0
+        else:
+            if max_states is not None and len(memo) >= max_states:
+                raise _BudgetExhausted()
+            if deadline is not None and not len(memo) % 256 and time.perf_counter() >= deadline:
+                raise _BudgetExhausted()
+            total = 0
+            for child_free, child_ships, _ in transitions(free, ships):
+                total += count(child_free, child_ships)
+        memo[key] = total
+        return total
+
+    regions = _regions(free, size)
+    if any(bin(region).count("1") > MAX_REGION_CELLS for region in regions):
+        return None
+    if deadline is not None and time.perf_counter() >= deadline:
+        return None
+    # Each region is counted for every share of the fleet: on a large fleet cut into
+    # many regions, that alone is more work than the budget allows
+    share_count = math.prod(number + 1 for number in full)
+    if max_states is not None and share_count * len(regions) > max_states:
+        return None
+    shares = _shares(full)
+    try:
+        counts = [{share: count(region, share) for share in shares} for region in regions]
+
+        # Ways for the regions before (after) each region to hold each share of the fleet
+        before = [{tuple(0 for _ in full): 1}]
+        for region_counts in counts:
+            before.append(_combine(before[-1], region_counts, full, deadline))
+        after = [{tuple(0 for _ in full): 1}]
+        for region_counts in reversed(counts):
+            after.append(_combine(after[-1], region_counts, full, deadline))
+        after.reverse()
+    except _BudgetExhausted:
+        return None
+    total = before[-1].get(full, 0)
+    if not total:
+        return None
+
+    # Forward pass: ways[state] = number of ways to reach the state, times the ways
+    # for the other regions to hold the rest of the fleet
+    ways = {}
+    for index in range(len(regions)):
+        for share, region_total in counts[index].items():
+            if not region_total:
+                continue
+            rest = tuple(f - s for f, s in zip(full, share))
+            others = sum(
+                number * after[index + 1].get(tuple(r - b for r, b in zip(rest, held)), 0)
+                for held, number in before[index].items()
+                if all(b <= r for b, r in zip(held, rest))
+            )
+            if others:
+                ways[(regions[index], share)] = others
+
+    covered = [0] * (size * size)
+    for free_cells, ships in sorted(memo, key=lambda key: key[0], reverse=True):
+        reached = ways.get((free_cells, ships))
+        if not reached:
+            continue
+        for child_free, child_ships, candidate in transitions(free_cells, ships):
+            completions = count(child_free, child_ships)
+            if not completions:
+                continue
+            if cells_needed[child_ships]:
+                key = (child_free, child_ships)
+                ways[key] = ways.get(key, 0) + reached
+            if candidate is not None:
+                layouts = reached * completions
+                for cell in candidate[3]:
+                    covered[cell] += layouts
+
+    return total, [covered[row * size:(row + 1) * size] for row in range(size)]
+
+
+def _regions(mask, size):
+    """Groups of cells of a mask connected through any of their 8 neighbours, as bitmasks"""
+    # Grow each group from one cell with whole-board shifts (one step per ring of
+    # neighbours) rather than visiting its cells one by one
+    row = (1 << size) - 1
+    not_first = sum((row - 1) << (y * size) for y in range(size))  # Cells with x > 0
+    not_last = sum((row >> 1) << (y * size) for y in range(size))  # Cells with x < size - 1
+    regions = []
+    while mask:
+        region = mask & -mask
+        while True:
+            wide = region | ((region << 1) & not_first) | ((region >> 1) & not_last)
+            grown = (wide | (wide << size) | (wide >> size)) & mask
+            if grown == region:
+                break
+            region = grown
+        mask &= ~region
+        regions.append(region)
+    return regions
+
+
+def _shares(full):
+    """Every sub-fleet of a fleet given as a number of ships per size"""
+    shares = [()]
+    for number in full:
+        shares = [share + (taken,) for share in shares for taken in range(number + 1)]
+    return shares
+
+
+def _combine(held, region_counts, full, deadline=None):
+    """
+    Ways to hold each share of the fleet over the regions of `held` plus one more region
+
+    Raises:
+        _BudgetExhausted: If the deadline (a time.perf_counter() value) passes
+    """
+    combined = {}
+    for share, ways in held.items():
+        if deadline is not None and time.perf_counter() >= deadline:
+            raise _BudgetExhausted()
+        for region_share, region_ways in region_counts.items():
+            if not region_ways:
+                continue
+            total = tuple(a + b for a, b in zip(share, region_share))
+            if all(t <= f for t, f in zip(total, full)):
+                combined[total] = combined.get(total, 0) + ways * region_ways
+    return combined
+
+
+def _read_shots(placement_table, fleet, states):
+    """
+    Turn the shot states into what a layout of the remaining fleet must satisfy
+
+    The last result is kept, so that the exact count and the sampler working on
+    the same position read it once. Callers must not modify it.
+
+    Returns:
+        (hits, remaining, candidates): bitmask of the hits not sunk yet, Counter
+        of the sizes of the ships afloat, and for each of those sizes the list of
+        footprints that agree with the shots on their own, as
+        (mask, area_mask, size, cell indexes) tuples in placement table order
+    """
+    return _read_shots_cached(placement_table, tuple(fleet), bytes(states))
+
+
+@lru_cache(maxsize=1)
+def _read_shots_cached(placement_table, fleet, states):
+    size = placement_table.grid_size
+    miss_cells = [cell for cell, state in enumerate(states) if state == MISS]
+    hit_cells = [cell for cell, state in enumerate(states) if state == HIT]
+    sunk = _to_mask((cell for cell, state in enumerate(states) if state == SUNK), size)
+    hits = _to_mask(hit_cells, size)
+
+    # Ships may not touch, so every group of sunk cells is exactly one sunk ship
+    remaining = Counter(fleet)
+    for length in _group_sizes(sunk, size):
+        if remaining[length]:
+            remaining[length] -= 1
+    remaining = +remaining
+
+    # No miss, no sunk ship or border of one, no hit on the border (it would
+    # belong to a touching ship), and not only hits (that ship would be reported
+    # sunk). A 1-cell ship has the same footprint both ways: keep one
+    forbidden = _to_mask(miss_cells, size) | _dilate(sunk, size)
+    candidates = {}
+    for length in remaining:
+        cells = placement_table.coverage(length)[0]
+        seen = set()
+        candidates[length] = []
+        for index, placement in enumerate(placement_table.placements_for(length)):
+            if placement.mask & forbidden or placement.area_mask & ~placement.mask & hits:
+                continue
+            if not placement.mask & ~hits:
+                continue
+            if placement.mask in seen:
+                continue
+            seen.add(placement.mask)
+            candidates[length].append((placement.mask, placement.area_mask, length, cells[index]))
+    return hits, remaining, candidates
+
+
+def _to_mask(cells, size):
+    """Bitmask of an iterable of cell indexes"""
+    bits = bytearray((size * size + 7) // 8)
+    for cell in cells:
+        bits[cell >> 3] |= 1 << (cell & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _dilate(mask, size):
+    """Cells of a mask and their 8 neighbours"""
+    result = 0
+    while mask:
+        low = mask & -mask
+        mask ^= low
+        y, x = divmod(low.bit_length() - 1, size)
+        for ny in range(max(y - 1, 0), min(y + 2, size)):
+            for nx in range(max(x - 1, 0), min(x + 2, size)):
+                result |= 1 << (ny * size + nx)
+    return result
+
+
+def _group_sizes(mask, size):
+    """Number of cells of each orthogonally connected group of cells of a mask"""
+    sizes = []
+    while mask:
+        low = mask & -mask
+        mask ^= low
+        stack = [low.bit_length() - 1]
+        count = 0
+        while stack:
+            cell = stack.pop()
+            count += 1
+            y, x = divmod(cell, size)
+            for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if 0 <= nx < size and 0 <= ny < size:
+                    bit = 1 << (ny * size + nx)
+                    if mask & bit:
+                        mask ^= bit
+                        stack.append(ny * size + nx)
+        sizes.append(count)
+    return sizes
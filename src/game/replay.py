@@ -0,0 +1,309 @@
+"""
+Compact binary game replays.
+
+A replay is a header (rules, seed, both fleets) followed by one fixed-width
+record per shot: (y * grid_size + x) * 2 + shooter, little-endian, on 1 byte
+up to 11x11 boards, 2 bytes up to 181x181 and 4 bytes beyond. Hit, sunk and
+game-over results are not stored: they follow from the fleets. Because the
+records all have the same width, shot N lives at header_size + N * width and
+the reader can seek to it without an index or a scan.
+
+Header layout (little-endian; "var" is an unsigned LEB128 varint, one byte
+below 128, so no legal GameRules overflows a field):
+    magic b"BSRP", version (B), flags (B), grid size (H), record width (B)
+    seed (Q)                              if flags & FLAG_SEED
+    salvo size (var)                      if flags & FLAG_SALVO
+    ship count (var), then per ship:      unless flags & FLAG_STANDARD_FLEET
+        size (var), name length (var), UTF-8 name
+    for each player: ship count (var), then per ship size (var) and layout
+        code (record width, see placement_table.encode_position)
+
+Version 1 replays, whose counts were H and sizes and name lengths B, are
+still read.
+
+ReplayReader.position() keeps the game it rebuilds, with the periodic
+snapshots of its event log (see GameState.goto), so moving to any shot
+already reached replays at most event_log.CHECKPOINT_INTERVAL events.
+"""
+import struct
+import sys
+from array import array
+
+from .placement_table import encode_position
+from .rules import GameRules
+
+MAGIC = b"BSRP"
+VERSION = 2
+
+FLAG_SEED = 1            # The header stores the game's seed
+FLAG_STANDARD_FLEET = 2  # Fleet is GameRules.scaled(grid_size)'s, not stored
+FLAG_SALVO = 4           # More than one shot per turn, the salvo size is stored
+
+_PREAMBLE = struct.Struct("<4sBBHB")
+_SEED = struct.Struct("<Q")
+_COUNT = struct.Struct("<H")
+_TYPECODES = {1: "B", 2: "H", 4: "I"}
+
+
+def record_width(grid_size):
+    """Bytes per shot record and per layout code for a grid size"""
+    largest = 2 * grid_size * grid_size - 1
+    for width in (1, 2, 4):
+        if largest < 1 << (8 * width):
+            return width
+    raise ValueError(f"Grid too large for a replay: {grid_size}")
+
+
+def _varint(value):
+    """Unsigned LEB128 encoding of a non-negative int"""
+    out = bytearray()
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _decode_values(width, data):
+    """Unsigned little-endian ints of `width` bytes packed in data"""
+    values = array(_TYPECODES[width])
+    if values.itemsize != width:  # Platforms where "I" is not 4 bytes
+        return [int.from_bytes(data[i:i + width], "little") for i in range(0, len(data), width)]
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class ReplayWriter:
+    """
+    Streams a game to a binary file object as it is played.
+
+    The header is written on creation; every write_shot() appends one record,
+    so a replay cut short by a crash is still readable up to its last shot.
+    """
+
+    def __init__(self, stream, rules, fleets, seed=None):
+        """
+        Args:
+            stream: Binary file object opened for writing (file, BytesIO...)
+            rules: GameRules of the game
+            fleets: For each of the two players, a list of (size, x, y, horizontal)
+            seed: Seed of the game (an int in [0, 2**64) or None)
+
+        Raises:
+            ValueError: If the grid is larger than 65535 cells a side, before
+                        anything is written
+        """
+        self.stream = stream
+        self.size = rules.grid_size
+        if self.size > 0xFFFF:
+            raise ValueError(f"Grid too large for a replay: {self.size}")
+        self.width = record_width(self.size)
+
+        flags = 0
+        if isinstance(seed, int) and 0 <= seed < 1 << 64:
+            flags |= FLAG_SEED
+        if rules.ships == GameRules.scaled(rules.grid_size).ships:
+            flags |= FLAG_STANDARD_FLEET
+        if rules.salvo_size > 1:
+            flags |= FLAG_SALVO
+
+        header = [_PREAMBLE.pack(MAGIC, VERSION, flags, self.size, self.width)]
+        if flags & FLAG_SEED:
+            header.append(_SEED.pack(seed))
+        if flags & FLAG_SALVO:
+            header.append(_varint(rules.salvo_size))
+        if not flags & FLAG_STANDARD_FLEET:
+            header.append(_varint(len(rules.ships)))
+            for ship in rules.ships:
+                name = ship["name"].encode("utf-8")
+                header.append(_varint(ship["size"]) + _varint(len(name)) + name)
+        for fleet in fleets:
+            header.append(_varint(len(fleet)))
+            for size, x, y, horizontal in fleet:
+                code = encode_position(x, y, horizontal, self.size)
+                header.append(_varint(size) + code.to_bytes(self.width, "little"))
+        stream.write(b"".join(header))
+
+    def write_shot(self, player, x, y):
+        """
+        Append a shot
+
+        Args:
+            player: Index (0 or 1) of the player who fired
+            x, y: Coordinates of the shot, inside the grid
+        """
+        value = (y * self.size + x) * 2 + player
+        self.stream.write(value.to_bytes(self.width, "little"))
+
+    def flush(self):
+        """Push the buffered records to the underlying file"""
+        self.stream.flush()
+
+
+class ReplayReader:
+    """
+    Random access to a replay written by ReplayWriter.
+
+    The number of shots is taken from the stream length on each call, so a
+    replay can be read while it is still being written.
+    """
+
+    def __init__(self, stream):
+        """
+        Args:
+            stream: Seekable binary file object positioned at the start of the replay
+
+        Raises:
+            ValueError: If the stream does not start with a replay header
+        """
+        self.stream = stream
+
+        magic, version, flags, size, width = _PREAMBLE.unpack(self._read(_PREAMBLE.size))
+        if magic != MAGIC or not 1 <= version <= VERSION:
+            raise ValueError("Not a battleship replay (or unsupported version)")
+        self.version = version
+        self.width = width
+
+        self.seed = _SEED.unpack(self._read(_SEED.size))[0] if flags & FLAG_SEED else None
+        salvo_size = self._read_small() if flags & FLAG_SALVO else 1
+        if flags & FLAG_STANDARD_FLEET:
+            self.rules = GameRules.scaled(size, salvo_size=salvo_size)
+        else:
+            ships = []
+            for _ in range(self._read_count()):
+                ship_size, name_length = self._read_small(), self._read_small()
+                ships.append({"name": self._read(name_length).decode("utf-8"), "size": ship_size})
+            self.rules = GameRules(size, ships, salvo_size)
+
+        self.fleets = []
+        for _ in range(2):
+            fleet = []
+            for _ in range(self._read_count()):
+                ship_size = self._read_small()
+                code = int.from_bytes(self._read(width), "little")
+                cell, vertical = divmod(code, 2)
+                y, x = divmod(cell, size)
+                fleet.append((ship_size, x, y, not vertical))
+            self.fleets.append(fleet)
+
+        self._records = stream.tell()
+        self._games = {}  # board_class -> (game played so far, history cursor after each shot)
+
+    def _read(self, count):
+        data = self.stream.read(count)
+        if len(data) != count:
+            raise ValueError("Truncated replay header")
+        return data
+
+    def _read_varint(self):
+        value = shift = 0
+        while True:
+            byte = self._read(1)[0]
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def _read_count(self):
+        if self.version == 1:
+            return _COUNT.unpack(self._read(_COUNT.size))[0]
+        return self._read_varint()
+
+    def _read_small(self):
+        """Salvo size, ship size or name length (a single byte in version 1)"""
+        if self.version == 1:
+            return self._read(1)[0]
+        return self._read_varint()
+
+    def __len__(self):
+        """Number of complete shot records"""
+        end = self.stream.seek(0, 2)
+        return (end - self._records) // self.width
+
+    def _decode(self, value):
+        cell, player = divmod(value, 2)
+        y, x = divmod(cell, self.rules.grid_size)
+        return player, x, y
+
+    def shot(self, index):
+        """
+        Get shot number `index` in O(1)
+
+        Returns:
+            (player, x, y)
+        """
+        if not 0 <= index < len(self):
+            raise IndexError("Shot index out of range")
+        self.stream.seek(self._records + index * self.width)
+        return self._decode(int.from_bytes(self.stream.read(self.width), "little"))
+
+    def shots(self, start=0, stop=None):
+        """
+        Get a range of shots with a single read
+
+        Returns:
+            List of (player, x, y)
+        """
+        count = len(self)
+        stop = count if stop is None else min(stop, count)
+        if start >= stop:
+            return []
+        self.stream.seek(self._records + start * self.width)
+        values = _decode_values(self.width, self.stream.read((stop - start) * self.width))
+        return [self._decode(value) for value in values]
+
+    def position(self, index, board_class=None):
+        """
+        Rebuild the game as it stood after the first `index` shots
+
+        The reader keeps one game per board backend, played as far as the
+        furthest shot asked for, and moves it with GameState.goto: from the
+        second call on, any shot already reached is at most
+        event_log.CHECKPOINT_INTERVAL events away from a checkpoint, and only
+        the shots beyond the furthest one are played for the first time.
+
+        Args:
+            index: Number of shots to apply
+            board_class: Board backend for the players (Board by default)
+
+        Returns:
+            GameState with both fleets placed and the shots applied, a fork
+            with an empty history (see GameState.fork)
+        """
+        game, marks = self._games.get(board_class) or self._start(board_class)
+        index = max(0, min(index, len(self)))
+
+        if index >= len(marks):
+            game.goto(marks[-1])
+            for player, x, y in self.shots(len(marks) - 1, index):
+                game.current_player_index = player
+                game.process_shot(player, x, y)
+                marks.append(game.history.cursor)
+        game.goto(marks[index])
+        return game.fork()
+
+    def _start(self, board_class):
+        """Game with both fleets placed and no shot yet, kept for position()"""
+        # Imported here: game_state imports this module to record replays
+        from .game_state import GameState
+
+        kwargs = {"board_class": board_class} if board_class else {}
+        game = GameState(self.rules, seed=self.seed, **kwargs)
+        for player, fleet in zip(game.players, self.fleets):
+            free = list(range(len(player.ships)))
+            for size, x, y, horizontal in fleet:
+                ship_index = next(i for i in free if player.ships[i].size == size)
+                free.remove(ship_index)
+                player.place_ship(ship_index, x, y, horizontal)
+        game.player_ready(0)
+        game.player_ready(1)
+
+        self._games[board_class] = game, [game.history.cursor]
+        return self._games[board_class]
+
+
+def fleet_layout(player):
+    """Fleet of a Player in the form ReplayWriter expects"""
+    return [(ship.size, ship.x, ship.y, ship.horizontal) for ship in player.ships if ship.is_placed()]
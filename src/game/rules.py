@@ -0,0 +1,72 @@
+from ..utils.constants import GRID_SIZE, SHIPS
+from .placement_table import get_placement_table
+
+class GameRules:
+    """
+    Board dimensions, fleet and number of shots per turn of a game.
+
+    One instance is shared by the boards, players, AI, server and UI grids
+    of a game instead of each reading GRID_SIZE / SHIPS on its own.
+    """
+
+    def __init__(self, grid_size=GRID_SIZE, ships=SHIPS, salvo_size=1):
+        """
+        Args:
+            grid_size: Width and height of the square board
+            ships: List of {"name": ..., "size": ...} dicts describing the fleet
+            salvo_size: Shots fired per turn (1 for the classic game, more for salvo mode)
+        """
+        if salvo_size < 1:
+            raise ValueError(f"A salvo needs at least one shot: {salvo_size}")
+        self.grid_size = grid_size
+        self.ships = [{"name": ship["name"], "size": ship["size"]} for ship in ships]
+        self.ship_sizes = tuple(ship["size"] for ship in self.ships)
+        self.salvo_size = salvo_size
+
+    @property
+    def placement_table(self):
+        """Shared PlacementTable for this grid size and fleet"""
+        return get_placement_table(self.grid_size, self.ship_sizes)
+
+    @classmethod
+    def scaled(cls, grid_size, ships=SHIPS, salvo_size=1):
+        """
+        Build rules for a bigger board, repeating the fleet so that the
+        share of the board covered by ships stays about the same
+
+        Args:
+            grid_size: Width and height of the square board
+            ships: Fleet used on a GRID_SIZE x GRID_SIZE board
+            salvo_size: Shots fired per turn
+        """
+        copies = max(1, (grid_size * grid_size) // (GRID_SIZE * GRID_SIZE))
+        fleet = []
+        for copy in range(copies):
+            for ship in ships:
+                name = ship["name"] if copies == 1 else f"{ship['name']} {copy + 1}"
+                fleet.append({"name": name, "size": ship["size"]})
+        return cls(grid_size, fleet, salvo_size)
+
+    def to_dict(self):
+        """Serialize the rules for the network"""
+        return {"grid_size": self.grid_size, "ships": self.ships, "salvo_size": self.salvo_size}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild rules sent with to_dict()"""
+        return cls(data["grid_size"], data["ships"], data.get("salvo_size", 1))
+
+    def __eq__(self, other):
+        return (isinstance(other, GameRules) and self.grid_size == other.grid_size
+                and self.ships == other.ships and self.salvo_size == other.salvo_size)
+
+    def __hash__(self):
+        return hash((self.grid_size, self.ship_sizes, self.salvo_size))
+
+    def __repr__(self):
+        return (f"GameRules(grid_size={self.grid_size}, ship_sizes={self.ship_sizes}, "
+                f"salvo_size={self.salvo_size})")
+
+
+# Standard 10x10 game with the classic fleet
+DEFAULT_RULES = GameRules()
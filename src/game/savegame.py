@@ -0,0 +1,283 @@
+"""
+Save and resume games.
+
+A save is a small JSON document: the rules, the game's event log (fleet
+commitments, shots and turn switches, see event_log), the turn state and
+what the solo AI keeps between turns. The AI's shot history is not stored:
+it rebuilds it from the board on its next move.
+
+Random generators are not stored as their full states (some 2.5 KB each):
+capturing a save draws a 64-bit seed from each generator of the game and
+reseeds it with it, and the save keeps those seeds. The saved game and the
+game that goes on draw the same numbers from then on.
+
+Loading plays the event log again, which takes a few milliseconds for a
+10x10 game and brings back the whole history: moves made before the save
+can still be undone.
+
+Autosaver writes saves on a background thread so that the render loop
+only pays for a copy-on-write snapshot of the game and a copy of its log.
+"""
+import json
+import os
+import threading
+
+from .bitboard import BitBoard
+from .board import Board
+from .event_log import EVENT_FLEET, EVENT_SHOT, EVENT_TURN
+from .game_state import GameState
+from .rules import GameRules
+from .sparse_board import SparseBoard
+
+SAVE_VERSION = 2
+
+# Board backends a save can name
+BOARD_CLASSES = {cls.__name__: cls for cls in (Board, BitBoard, SparseBoard)}
+
+
+def reseed(rng):
+    """Reset a random.Random to a seed drawn from it, and return the seed"""
+    seed = rng.getrandbits(64)
+    rng.seed(seed)
+    return seed
+
+
+def capture(game_state):
+    """
+    Freeze what a save needs, on the thread that plays the game
+
+    Costs O(number of ships + number of events): the boards are
+    copy-on-write snapshots (see GameState.snapshot), so the result can be
+    serialized on another thread while the game goes on. The generators of
+    the game are reseeded (see reseed).
+
+    Returns:
+        (read-only GameState, what the snapshot does not hold: see save_extras)
+    """
+    extras = save_extras(game_state)
+    return game_state.snapshot(), extras
+
+
+def save_extras(game_state):
+    """
+    Seeds, event log and AI state of a live game, reseeding its generators
+
+    Returns:
+        JSON-friendly dict, used by game_to_dict
+    """
+    size = game_state.rules.grid_size
+    events = []
+    for event in game_state.history:
+        if event.kind == EVENT_SHOT:
+            data = [y * size + x for x, y in event.data]
+        elif event.kind == EVENT_FLEET:
+            data = [[index, x, y, int(horizontal)] for index, x, y, horizontal in event.data]
+        else:
+            data = None
+        events.append([event.kind, event.player, data])
+
+    ai = game_state.ai
+    ai_state = None
+    if ai:
+        ai_state = {
+            "difficulty": ai.difficulty,
+            "remaining_ships": list(ai.remaining_ships),
+            "seed": reseed(ai.rng),
+        }
+    return {
+        "seeds": [reseed(game_state.rng)] + [reseed(player.rng) for player in game_state.players],
+        "events": events,
+        "cursor": game_state.history.cursor,
+        "ai": ai_state,
+    }
+
+
+def game_to_dict(game_state, extras=None):
+    """
+    Serialize a game (usually a snapshot taken by capture)
+
+    Args:
+        game_state: GameState to save
+        extras: What capture returned with the snapshot, or None to take
+                it from game_state itself (which must then be the live game)
+
+    Returns:
+        JSON-friendly dict
+    """
+    if extras is None:
+        extras = save_extras(game_state)
+    seed = game_state.seed if isinstance(game_state.seed, (int, str)) else None
+    return dict(
+        extras,
+        version=SAVE_VERSION,
+        rules=game_state.rules.to_dict(),
+        board=type(game_state.players[0].board).__name__,
+        seed=seed,
+        difficulty=game_state.difficulty,
+        solo=game_state.is_solo_mode,
+        state=game_state.state,
+        current_player=game_state.current_player_index,
+        winner=game_state.winner,
+        last_shot=list(game_state.last_shot) if game_state.last_shot else None,
+    )
+
+
+def game_from_dict(data):
+    """
+    Rebuild a game serialized by game_to_dict
+
+    Raises:
+        ValueError: If the data is not a save this version can read
+    """
+    version = data.get("version") if isinstance(data, dict) else None
+    if version != SAVE_VERSION:
+        raise ValueError(f"Unsupported save version: {version}")
+    try:
+        return _game_from_dict(data)
+    except (KeyError, TypeError, IndexError, AttributeError) as e:
+        raise ValueError(f"Corrupt save: {e!r}") from e
+
+
+def _game_from_dict(data):
+    rules = GameRules.from_dict(data["rules"])
+    board_class = BOARD_CLASSES.get(data["board"], Board)
+    game = GameState(rules, board_class, data["difficulty"], data["seed"])
+    game.is_solo_mode = data["solo"]
+
+    game_seed, *player_seeds = data["seeds"]
+    if len(player_seeds) != len(game.players):
+        raise ValueError("Corrupt save: one seed per player expected")
+    game.rng.seed(game_seed)
+    for player, seed in zip(game.players, player_seeds):
+        player.rng.seed(seed)
+
+    size = rules.grid_size
+    events = []
+    for kind, player_id, saved in data["events"]:
+        if kind == EVENT_SHOT:
+            events.append((kind, player_id, tuple(divmod(cell, size)[::-1] for cell in saved)))
+        elif kind == EVENT_FLEET:
+            events.append((kind, player_id, [(index, x, y, bool(horizontal)) for index, x, y, horizontal in saved]))
+        elif kind == EVENT_TURN:
+            events.append((kind, player_id, None))
+        else:
+            raise ValueError(f"Corrupt save: unknown event {kind!r}")
+    game.play_events(events)
+    game.goto(data["cursor"])
+
+    game.state = data["state"]
+    game.current_player_index = data["current_player"]
+    game.winner = data["winner"]
+    game.last_shot = tuple(data["last_shot"]) if data["last_shot"] else None
+
+    if data["ai"]:
+        from .BattleshipAI import BattleshipAI
+        ai = BattleshipAI(data["ai"]["difficulty"], rules, deterministic=game.seed is not None)
+        ai.remaining_ships = list(data["ai"]["remaining_ships"])
+        ai.rng.seed(data["ai"]["seed"])
+        game.ai = ai
+    return game
+
+
+def save_game(game_state, path):
+    """Write a save of the game to `path`, replacing it atomically"""
+    _write(path, game_to_dict(*capture(game_state)))
+
+
+def load_game(path):
+    """
+    Read a save written by save_game or Autosaver
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If it is not a readable save
+    """
+    with open(path, encoding="utf-8") as file:
+        return game_from_dict(json.load(file))
+
+
+def _write(path, data):
+    """Write JSON to a temporary file then move it over `path`, so a crash never leaves half a save"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump(data, file, separators=(",", ":"))
+    os.replace(temporary, path)
+
+
+_DELETE = object()  # Pending "save" that removes the file
+
+
+class Autosaver:
+    """
+    Saves a game in the background.
+
+    save() captures the game (see capture) and returns; a daemon thread
+    serializes and writes it. When saves come faster than the disk, only
+    the most recent pending one is written.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: File the saves are written to
+        """
+        self.path = path
+        self._pending = None
+        self._busy = False
+        self._has_save = os.path.exists(path)
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def has_save(self):
+        """Check if there is a save to resume (without touching the disk)"""
+        return self._has_save
+
+    def save(self, game_state):
+        """Queue a save of the game"""
+        self._submit(capture(game_state))
+        self._has_save = True
+
+    def clear(self):
+        """Queue the removal of the save (e.g. once the game is over)"""
+        self._submit(_DELETE)
+        self._has_save = False
+
+    def flush(self, timeout=None):
+        """
+        Wait until every queued save is on disk
+
+        Returns:
+            True if the queue is empty, False if the timeout expired first
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending is None and not self._busy, timeout)
+
+    def _submit(self, job):
+        with self._condition:
+            self._pending = job
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None)
+                job, self._pending = self._pending, None
+                self._busy = True
+            try:
+                if job is _DELETE:
+                    if os.path.exists(self.path):
+                        os.remove(self.path)
+                else:
+                    _write(self.path, game_to_dict(*job))
+            except Exception as e:
+                print(f"Erreur lors de la sauvegarde automatique: {e}")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
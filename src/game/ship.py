@@ -1,56 +1,107 @@
 class Ship:
     """Class representing a ship in the game"""
-    
-    next_id = 1  # Class variable to ensure unique IDs
-    
-    def __init__(self, name, size):
-        self.id = Ship.next_id
-        Ship.next_id += 1
-        
+
+    __slots__ = ('id', 'name', 'size', 'hits', '_x', '_y', '_horizontal', '_coordinates', '_coordinate_set')
+
+    def __init__(self, name, size, ship_id):
+        """
+        Args:
+            name: Display name of the ship
+            size: Number of cells covered by the ship
+            ship_id: Id of the ship, unique on its board (see Board.new_ship)
+        """
+        self.id = ship_id
+
         self.name = name
         self.size = size
-        self.x = -1  # Initial position (not placed)
-        self.y = -1
-        self.horizontal = True  # True for horizontal, False for vertical
+        self._x = -1  # Initial position (not placed)
+        self._y = -1
+        self._horizontal = True  # True for horizontal, False for vertical
         self.hits = 0  # Number of times this ship has been hit
-        
+
+        # Coordinates cache, cleared whenever the position or orientation changes
+        self._coordinates = None
+        self._coordinate_set = None
+
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._x = value
+        self._coordinates = self._coordinate_set = None
+
+    @property
+    def y(self):
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        self._y = value
+        self._coordinates = self._coordinate_set = None
+
+    @property
+    def horizontal(self):
+        return self._horizontal
+
+    @horizontal.setter
+    def horizontal(self, value):
+        self._horizontal = value
+        self._coordinates = self._coordinate_set = None
+
+    def copy(self):
+        """Get an independent copy of the ship (same id, position and hits)"""
+        clone = Ship.__new__(Ship)
+        clone.id = self.id
+        clone.name = self.name
+        clone.size = self.size
+        clone.hits = self.hits
+        clone._x = self._x
+        clone._y = self._y
+        clone._horizontal = self._horizontal
+        clone._coordinates = self._coordinates
+        clone._coordinate_set = self._coordinate_set
+        return clone
+
     def is_placed(self):
         """Check if the ship has been placed on the board"""
-        return self.x >= 0 and self.y >= 0
-        
+        return self._x >= 0 and self._y >= 0
+
     def is_sunk(self):
         """Check if the ship has been sunk"""
         return self.hits >= self.size
-        
+
     def get_coordinates(self):
-        """Get the coordinates of all cells occupied by the ship"""
-        if not self.is_placed():
-            return []
-            
-        coords = []
-        for i in range(self.size):
-            if self.horizontal:
-                coords.append((self.x + i, self.y))
+        """Get the coordinates of all cells occupied by the ship, as a tuple of (x, y)"""
+        coordinates = self._coordinates
+        if coordinates is None:
+            if not self.is_placed():
+                coordinates = ()
+            elif self._horizontal:
+                coordinates = tuple((self._x + i, self._y) for i in range(self.size))
             else:
-                coords.append((self.x, self.y + i))
-                
-        return coords
-        
+                coordinates = tuple((self._x, self._y + i) for i in range(self.size))
+            self._coordinates = coordinates
+        return coordinates
+
+    def get_coordinate_set(self):
+        """Get the cells occupied by the ship as a frozenset of (x, y)"""
+        coordinate_set = self._coordinate_set
+        if coordinate_set is None:
+            coordinate_set = self._coordinate_set = frozenset(self.get_coordinates())
+        return coordinate_set
+
     def contains_point(self, x, y):
         """Check if the ship contains the given point"""
         if not self.is_placed():
             return False
-            
-        if self.horizontal:
-            return self.y == y and self.x <= x < self.x + self.size
+
+        if self._horizontal:
+            return self._y == y and self._x <= x < self._x + self.size
         else:
-            return self.x == x and self.y <= y < self.y + self.size
-            
+            return self._x == x and self._y <= y < self._y + self.size
+
     def rotate(self):
         """Rotate the ship"""
-        self.horizontal = not self.horizontal
-        
-    @classmethod
-    def reset_ids(cls):
-        """Reset the ship ID counter (useful for starting a new game)"""
-        cls.next_id = 1
\ No newline at end of file
+        self.horizontal = not self._horizontal
@@ -0,0 +1,205 @@
+# Per-cell shot states
+UNKNOWN = 0
+MISS = 1
+HIT = 2
+SUNK = 3
+
+class ShotLedger:
+    """
+    Record of the shots fired at a board.
+
+    Keeps a per-cell state array for O(1) lookups next to the chronological
+    log of (x, y, hit) tuples. Iterating the ledger yields the log, so it can
+    be used wherever the old list of shots was.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.states = bytearray(size * size)
+        self.log = []
+
+    def __iter__(self):
+        return iter(self.log)
+
+    def __len__(self):
+        return len(self.log)
+
+    def __getitem__(self, index):
+        return self.log[index]
+
+    def copy(self):
+        """Get an independent copy of the ledger"""
+        clone = self.__class__.__new__(self.__class__)
+        clone.size = self.size
+        clone.states = self.states.copy()
+        clone.log = self.log.copy()
+        return clone
+
+    def is_shot(self, x, y):
+        """Check if the cell has already been shot"""
+        return self.states[y * self.size + x] != UNKNOWN
+
+    def cell_state(self, x, y):
+        """Get the state of a cell: UNKNOWN, MISS, HIT or SUNK"""
+        return self.states[y * self.size + x]
+
+    def record(self, x, y, hit):
+        """Record a new shot at the end of the log"""
+        self.states[y * self.size + x] = HIT if hit else MISS
+        self.log.append((x, y, hit))
+
+    def mark_sunk(self, cells):
+        """Flag the cells of a ship that has just been sunk"""
+        for x, y in cells:
+            self.states[y * self.size + x] = SUNK
+
+    def pop(self):
+        """
+        Remove the last shot from the log and clear its cell
+
+        Returns:
+            (x, y, hit) of the removed shot
+
+        Raises:
+            IndexError: If no shot has been recorded
+        """
+        x, y, hit = self.log.pop()
+        self.states[y * self.size + x] = UNKNOWN
+        return x, y, hit
+
+    def unmark_sunk(self, cells):
+        """Turn the cells of a ship that is no longer sunk back into hits"""
+        for x, y in cells:
+            self.states[y * self.size + x] = HIT
+
+    def shots_since(self, index):
+        """
+        Get the shots recorded after the first `index` ones
+
+        Args:
+            index: Number of shots already read by the caller (e.g. len(ledger) last time)
+
+        Returns:
+            List of (x, y, hit) tuples in firing order
+        """
+        return self.log[index:]
+
+
+class SparseShotLedger(ShotLedger):
+    """
+    ShotLedger keeping the per-cell states in a dict keyed by (x, y), so its
+    memory grows with the number of shots instead of the board area
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.states = {}
+        self.log = []
+
+    def is_shot(self, x, y):
+        """Check if the cell has already been shot"""
+        return (x, y) in self.states
+
+    def cell_state(self, x, y):
+        """Get the state of a cell: UNKNOWN, MISS, HIT or SUNK"""
+        return self.states.get((x, y), UNKNOWN)
+
+    def record(self, x, y, hit):
+        """Record a new shot at the end of the log"""
+        self.states[(x, y)] = HIT if hit else MISS
+        self.log.append((x, y, hit))
+
+    def mark_sunk(self, cells):
+        """Flag the cells of a ship that has just been sunk"""
+        for x, y in cells:
+            self.states[(x, y)] = SUNK
+
+    def pop(self):
+        """
+        Remove the last shot from the log and clear its cell
+
+        Returns:
+            (x, y, hit) of the removed shot
+
+        Raises:
+            IndexError: If no shot has been recorded
+        """
+        x, y, hit = self.log.pop()
+        del self.states[(x, y)]
+        return x, y, hit
+
+    def unmark_sunk(self, cells):
+        """Turn the cells of a ship that is no longer sunk back into hits"""
+        for cell in cells:
+            self.states[cell] = HIT
+
+
+class BitShotLedger(ShotLedger):
+    """
+    ShotLedger keeping the per-cell states as bitmasks of the hit, missed
+    and sunk cells (bit y * size + x), for BitBoard: a shot sets one bit
+    and the states are read back from the masks
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.hits = 0    # Cells hit, sunk ones included
+        self.misses = 0
+        self.sunk = 0
+        self.log = []
+
+    def copy(self):
+        """Get an independent copy of the ledger"""
+        clone = BitShotLedger.__new__(BitShotLedger)
+        clone.size = self.size
+        clone.hits = self.hits
+        clone.misses = self.misses
+        clone.sunk = self.sunk
+        clone.log = self.log.copy()
+        return clone
+
+    def is_shot(self, x, y):
+        """Check if the cell has already been shot"""
+        return bool((self.hits | self.misses) >> (y * self.size + x) & 1)
+
+    def cell_state(self, x, y):
+        """Get the state of a cell: UNKNOWN, MISS, HIT or SUNK"""
+        bit = 1 << (y * self.size + x)
+        if self.hits & bit:
+            return SUNK if self.sunk & bit else HIT
+        return MISS if self.misses & bit else UNKNOWN
+
+    def record(self, x, y, hit):
+        """Record a new shot at the end of the log"""
+        if hit:
+            self.hits |= 1 << (y * self.size + x)
+        else:
+            self.misses |= 1 << (y * self.size + x)
+        self.log.append((x, y, hit))
+
+    def mark_sunk(self, cells):
+        """Flag the cells of a ship that has just been sunk"""
+        for x, y in cells:
+            self.sunk |= 1 << (y * self.size + x)
+
+    def pop(self):
+        """
+        Remove the last shot from the log and clear its cell
+
+        Returns:
+            (x, y, hit) of the removed shot
+
+        Raises:
+            IndexError: If no shot has been recorded
+        """
+        x, y, hit = self.log.pop()
+        keep = ~(1 << (y * self.size + x))
+        self.hits &= keep
+        self.misses &= keep
+        self.sunk &= keep
+        return x, y, hit
+
+    def unmark_sunk(self, cells):
+        """Turn the cells of a ship that is no longer sunk back into hits"""
+        for x, y in cells:
+            self.sunk &= ~(1 << (y * self.size + x))
@@ -0,0 +1,151 @@
+import random
+
+from .board import Board
+from .shot_ledger import SparseShotLedger
+
+class SparseBoard(Board):
+    """
+    Board backend for very large grids whose memory grows with ships + shots.
+
+    Ship cells live in a dict keyed by (x, y) and shots in a SparseShotLedger;
+    nothing is allocated per board cell. Placement checks look up the few
+    cells around the ship instead of going through the placement table, so
+    the table is never built for the board size. The public API mirrors Board.
+    """
+
+    def _reset_storage(self):
+        """Clear the coordinate index"""
+        self.cells = {}  # (x, y) -> id of the ship covering the cell
+
+    def _copy_storage(self):
+        """Replace the coordinate index with a private copy"""
+        self.cells = self.cells.copy()
+
+    def _new_ledger(self):
+        """Create the shot ledger used by this board"""
+        return SparseShotLedger(self.size)
+
+    @property
+    def grid(self):
+        """Read-only grid[y][x] view of the board (ship id per cell, 0 for water)"""
+        return _GridView(self.cells, self.size)
+
+    def _mark_ship(self, ship):
+        """Write a freshly positioned ship into the coordinate index"""
+        for cell in ship.get_coordinates():
+            self.cells[cell] = ship.id
+
+    def _unmark_ship(self, ship):
+        """Clear a placed ship from the coordinate index"""
+        for cell in ship.get_coordinates():
+            self.cells.pop(cell, None)
+
+    def _ship_id_at(self, x, y):
+        """Get the id of the ship covering an in-bounds cell, 0 for water"""
+        return self.cells.get((x, y), 0)
+
+    def is_valid_placement(self, ship, x, y, horizontal):
+        """
+        Check if a ship can be placed at the given position
+
+        Args:
+            ship: Ship object to place
+            x, y: Coordinates of the ship's start
+            horizontal: True for horizontal placement, False for vertical
+
+        Returns:
+            True if placement is valid, False otherwise
+        """
+        return self._area_is_free(self.cells, ship.size, x, y, horizontal)
+
+    def _area_is_free(self, cells, size, x, y, horizontal):
+        """Check that a footprint is in bounds and that it and its border are not in `cells`"""
+        end_x = x + size - 1 if horizontal else x
+        end_y = y if horizontal else y + size - 1
+        if x < 0 or y < 0 or end_x >= self.size or end_y >= self.size:
+            return False
+
+        # Check that the ship and its 1-cell border (no adjacent ships rule) are empty
+        for ny in range(max(0, y - 1), min(self.size, end_y + 2)):
+            for nx in range(max(0, x - 1), min(self.size, end_x + 2)):
+                if (nx, ny) in cells:
+                    return False
+        return True
+
+    def sample_layout(self, ship_sizes, rng=random, attempts=1000):
+        """
+        Draw a random legal layout for a fleet on this (empty) board
+
+        Every ship is drawn at a uniformly random position and the whole
+        layout is thrown away at the first overlap or contact, which makes
+        every legal layout equally likely and almost always succeeds at
+        once on the sparse boards this backend is meant for. After
+        `attempts` layouts thrown away, Board.sample_layout takes over (and
+        builds the placement table).
+
+        Args:
+            ship_sizes: Size of each ship to place
+            rng: Random source (module random or a random.Random instance)
+            attempts: Whole layouts drawn before falling back
+
+        Returns:
+            List of (x, y, horizontal), one per entry of ship_sizes,
+            or None if the fleet cannot fit on the board
+        """
+        if any(size > self.size for size in ship_sizes):
+            return None
+
+        order = sorted(range(len(ship_sizes)), key=lambda i: ship_sizes[i], reverse=True)
+        for _ in range(attempts):
+            layout = [None] * len(ship_sizes)
+            taken = set()
+            for index in order:
+                size = ship_sizes[index]
+                horizontal = rng.random() < 0.5
+                x = rng.randrange(self.size - size + 1 if horizontal else self.size)
+                y = rng.randrange(self.size if horizontal else self.size - size + 1)
+                if not self._area_is_free(taken, size, x, y, horizontal):
+                    break
+                layout[index] = (x, y, horizontal)
+                for i in range(size):
+                    taken.add((x + i, y) if horizontal else (x, y + i))
+            else:
+                return layout
+        return super().sample_layout(ship_sizes, rng)
+
+
+class _GridView:
+    """grid[y][x] access to a SparseBoard coordinate index"""
+
+    def __init__(self, cells, size):
+        self._cells = cells
+        self._size = size
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, y):
+        return _RowView(self._cells, y, self._size)
+
+    def __iter__(self):
+        for y in range(self._size):
+            yield _RowView(self._cells, y, self._size)
+
+
+class _RowView:
+    """One row of a _GridView"""
+
+    def __init__(self, cells, y, size):
+        self._cells = cells
+        self._y = y
+        self._size = size
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, x):
+        return self._cells.get((x, self._y), 0)
+
+    def __iter__(self):
+        for x in range(self._size):
+            yield self._cells.get((x, self._y), 0)
@@ -0,0 +1,280 @@
+"""
+Headless AI-vs-AI tournament between the BattleshipAI difficulty levels.
+
+Games are played in batches on a process pool; each batch returns a small
+TournamentStats that is merged into the running totals as soon as it
+arrives, so memory does not grow with the number of games.
+
+Usage: python -m src.game.tournament [--games 1000] [--levels facile moyenne difficile expert ultime]
+                                     [--workers N] [--batch 25] [--seed 0] [--grid-size 10]
+"""
+import argparse
+import itertools
+import math
+import os
+import random
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from .BattleshipAI import BattleshipAI
+from .player import Player
+from .rules import GameRules
+from .shot_ledger import MISS, HIT, SUNK
+from ..utils.constants import GRID_SIZE
+
+LEVELS = ['facile', 'moyenne', 'difficile', 'expert', 'ultime']
+
+# Latency histogram: bucket i holds latencies in [2**(i/8), 2**((i+1)/8)) µs (~9% wide)
+_BUCKETS_PER_OCTAVE = 8
+
+
+class LevelStats:
+    """Running totals for one difficulty level"""
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.draws = 0
+        self.shots_to_win = Counter()  # Shots fired by the winner -> number of games
+        self.latency_buckets = Counter()  # Histogram of choose_target latencies
+        self.latency_total = 0.0  # Seconds
+        self.moves = 0
+
+    def record_latency(self, seconds):
+        """Add one choose_target call to the latency histogram"""
+        self.latency_total += seconds
+        self.moves += 1
+        micros = max(seconds * 1e6, 1.0)
+        self.latency_buckets[int(math.log2(micros) * _BUCKETS_PER_OCTAVE)] += 1
+
+    def merge(self, other):
+        """Add the totals of another LevelStats to this one"""
+        self.games += other.games
+        self.wins += other.wins
+        self.draws += other.draws
+        self.shots_to_win.update(other.shots_to_win)
+        self.latency_buckets.update(other.latency_buckets)
+        self.latency_total += other.latency_total
+        self.moves += other.moves
+
+    def mean_latency_us(self):
+        """Mean choose_target latency in µs"""
+        return self.latency_total / self.moves * 1e6 if self.moves else 0.0
+
+    def latency_percentile_us(self, percentile):
+        """Approximate choose_target latency percentile in µs (upper edge of the bucket)"""
+        if not self.moves:
+            return 0.0
+        threshold = self.moves * percentile / 100
+        seen = 0
+        for bucket in sorted(self.latency_buckets):
+            seen += self.latency_buckets[bucket]
+            if seen >= threshold:
+                return 2 ** ((bucket + 1) / _BUCKETS_PER_OCTAVE)
+        return 2 ** ((max(self.latency_buckets) + 1) / _BUCKETS_PER_OCTAVE)
+
+    def shots_percentile(self, percentile):
+        """Shots needed to win at the given percentile of won games"""
+        if not self.wins:
+            return 0
+        threshold = self.wins * percentile / 100
+        seen = 0
+        for shots in sorted(self.shots_to_win):
+            seen += self.shots_to_win[shots]
+            if seen >= threshold:
+                return shots
+        return max(self.shots_to_win)
+
+
+class TournamentStats:
+    """Per-level and per-matchup totals of a set of games"""
+
+    def __init__(self):
+        self.games = 0
+        self.levels = {}  # level -> LevelStats
+        self.matchups = Counter()  # (winner level, loser level) -> games
+
+    def level(self, name):
+        """Get (creating if needed) the LevelStats of a level"""
+        stats = self.levels.get(name)
+        if stats is None:
+            stats = self.levels[name] = LevelStats()
+        return stats
+
+    def merge(self, other):
+        """Add the totals of another TournamentStats to this one"""
+        self.games += other.games
+        for name, stats in other.levels.items():
+            self.level(name).merge(stats)
+        self.matchups.update(other.matchups)
+
+
+def play_game(rules, levels, first, stats, rng):
+    """
+    Play one AI-vs-AI game and add it to `stats`
+
+    Args:
+        rules: GameRules of the game
+        levels: Difficulty of player 0 and player 1
+        first: Index of the player who shoots first
+        stats: TournamentStats updated in place
+        rng: random.Random the players' and AIs' generators are derived from
+
+    Returns:
+        Index of the winner, or None if the game had to be stopped
+    """
+    players = [Player(index, rules, rng=random.Random(rng.getrandbits(64))) for index in range(2)]
+    for player in players:
+        player.auto_place_ships()
+    # Sans budget en secondes : un lot rejoue à l'identique avec sa graine
+    ais = [BattleshipAI(level, rules, random.Random(rng.getrandbits(64)), deterministic=True) for level in levels]
+    level_stats = [stats.level(level) for level in levels]
+    shots = [0, 0]
+    max_shots = rules.grid_size * rules.grid_size
+
+    stats.games += 1
+    for level in level_stats:
+        level.games += 1
+
+    turn = first
+    while True:
+        opponent = players[1 - turn]
+        start = time.perf_counter()
+        target = ais[turn].choose_target(opponent.board)
+        level_stats[turn].record_latency(time.perf_counter() - start)
+        shots[turn] += 1
+
+        if target is None or None in target or shots[turn] > max_shots:
+            for level in level_stats:
+                level.draws += 1
+            return None
+
+        hit, ship_id, sunk = opponent.receive_shot(*target)
+        ais[turn].observe(*target, SUNK if sunk else HIT if hit else MISS)
+        if opponent.has_lost():
+            level_stats[turn].wins += 1
+            level_stats[turn].shots_to_win[shots[turn]] += 1
+            stats.matchups[(levels[turn], levels[1 - turn])] += 1
+            return turn
+
+        turn = 1 - turn
+
+
+def schedule(levels, games):
+    """
+    Generate the games to play: every pair of distinct levels in turn
+    (or self-play if there is a single level), alternating who shoots first
+
+    Yields:
+        ((level of player 0, level of player 1), first player)
+    """
+    pairs = list(itertools.combinations(levels, 2)) or [(levels[0], levels[0])]
+    for i in range(games):
+        yield pairs[i % len(pairs)], (i // len(pairs)) % 2
+
+
+# Rules of the worker process, set once by _init_worker instead of pickled with every batch
+_worker_rules = None
+
+
+def _init_worker(rules_dict):
+    global _worker_rules
+    _worker_rules = GameRules.from_dict(rules_dict)
+    for size in set(_worker_rules.ship_sizes):
+        _worker_rules.placement_table.placements_for(size)
+
+
+def _play_batch(task):
+    """Play a batch of scheduled games in a worker and return their TournamentStats"""
+    seed, games = task
+    rng = random.Random(seed)
+    stats = TournamentStats()
+    for levels, first in games:
+        play_game(_worker_rules, levels, first, stats, rng)
+    return stats
+
+
+def run_tournament(rules, levels, games, workers=None, batch_size=25, seed=0, on_batch=None):
+    """
+    Play a tournament on a process pool
+
+    Args:
+        rules: GameRules of every game
+        levels: Difficulty levels taking part
+        games: Number of games to play
+        workers: Number of worker processes (os.cpu_count() if None)
+        batch_size: Games per task sent to a worker
+        seed: Base seed; batch i is played with seed + i, so results do not
+              depend on how batches are spread over workers
+        on_batch: Optional callback(totals, elapsed seconds) called after each merged batch
+
+    Returns:
+        TournamentStats of all games
+    """
+    plan = schedule(levels, games)
+    tasks = (
+        (seed + index, list(itertools.islice(plan, batch_size)))
+        for index in range((games + batch_size - 1) // batch_size)
+    )
+
+    totals = TournamentStats()
+    start = time.perf_counter()
+    with Pool(workers, initializer=_init_worker, initargs=(rules.to_dict(),)) as pool:
+        for batch in pool.imap_unordered(_play_batch, tasks):
+            totals.merge(batch)
+            if on_batch:
+                on_batch(totals, time.perf_counter() - start)
+    return totals
+
+
+def print_report(stats, elapsed):
+    """Print the final tables of a tournament"""
+    print()
+    print(f"{stats.games} parties en {elapsed:.1f} s ({stats.games / elapsed:.1f} parties/s)")
+    print()
+    print(f"{'niveau':<10} {'parties':>8} {'victoires':>10} {'nuls':>5} "
+          f"{'tirs p10/p50/p90':>17} {'µs moy':>9} {'µs p99':>9}")
+    for name in LEVELS + sorted(set(stats.levels) - set(LEVELS)):
+        level = stats.levels.get(name)
+        if level is None:
+            continue
+        win_rate = level.wins / level.games * 100 if level.games else 0.0
+        shots = "/".join(str(level.shots_percentile(p)) for p in (10, 50, 90)) if level.wins else "-"
+        print(f"{name:<10} {level.games:>8} {win_rate:>9.1f}% {level.draws:>5} {shots:>17} "
+              f"{level.mean_latency_us():>9.0f} {level.latency_percentile_us(99):>9.0f}")
+
+    print()
+    print("Victoires par confrontation :")
+    pairs = sorted({tuple(sorted(pair)) for pair in stats.matchups})
+    for a, b in pairs:
+        wins_a = stats.matchups[(a, b)]
+        wins_b = stats.matchups[(b, a)] if a != b else 0
+        print(f"  {a} - {b} : {wins_a} - {wins_b}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--levels", nargs="+", default=LEVELS, choices=LEVELS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch", type=int, default=25, help="parties par tâche envoyée à un worker")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--grid-size", type=int, default=GRID_SIZE)
+    args = parser.parse_args()
+
+    rules = GameRules.scaled(args.grid_size)
+    last_report = [0.0]
+
+    def progress(totals, elapsed):
+        if elapsed - last_report[0] >= 1.0 or totals.games == args.games:
+            last_report[0] = elapsed
+            print(f"{totals.games}/{args.games} parties - {totals.games / elapsed:.1f} parties/s", flush=True)
+
+    start = time.perf_counter()
+    stats = run_tournament(rules, args.levels, args.games, args.workers, args.batch, args.seed, progress)
+    print_report(stats, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Zobrist keys for position hashing.
+
+Every (cell, feature) pair gets a fixed pseudo-random 64-bit key; the hash
+of a board is the XOR of the keys of its features, so placing a ship or
+firing a shot updates it with one XOR per cell. The keys come from
+splitmix64 of the cell index, not from a random generator: every process
+(client, server, tournament worker) derives the same keys for a grid size
+without exchanging anything.
+
+Cell (x, y) is index y * grid_size + x, as in BitBoard and replays.
+"""
+from functools import lru_cache
+
+MASK64 = (1 << 64) - 1
+
+# Features of a cell
+SHIP = 0
+MISS = 1
+HIT = 2
+_FEATURES = 3
+
+# Grids up to this many cells keep their keys in a table; larger ones
+# (SparseBoard territory) compute them on the fly
+TABLE_MAX_CELLS = 1 << 16
+
+
+def splitmix64(value):
+    """Mix a 64-bit integer into a well-distributed pseudo-random 64-bit integer"""
+    value = (value + 0x9E3779B97F4A7C15) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+
+# Key XORed into GameState.position_hash when it is player 1's turn
+TURN_KEY = splitmix64(MASK64)
+
+
+def rotate64(value, bits):
+    """Rotate a 64-bit integer left"""
+    return ((value << bits) | (value >> (64 - bits))) & MASK64
+
+
+class ZobristKeys:
+    """
+    Keys of every cell feature for one grid size.
+
+    Get one through get_zobrist_keys() so boards of the same size share it.
+    """
+
+    def __init__(self, grid_size):
+        self.grid_size = grid_size
+        cells = grid_size * grid_size
+        if cells <= TABLE_MAX_CELLS:
+            self._table = [splitmix64(index) for index in range(cells * _FEATURES)]
+        else:
+            self._table = None
+
+    def key(self, cell, feature):
+        """Key of a feature (SHIP, MISS or HIT) of a cell index"""
+        index = cell * _FEATURES + feature
+        if self._table is not None:
+            return self._table[index]
+        return splitmix64(index)
+
+    def ship(self, cell):
+        """Key of a ship covering a cell index"""
+        return self.key(cell, SHIP)
+
+    def shot(self, cell, hit):
+        """Key of a shot (hit or miss) on a cell index"""
+        # key() inlined: called on every shot
+        index = cell * _FEATURES + (HIT if hit else MISS)
+        if self._table is not None:
+            return self._table[index]
+        return splitmix64(index)
+
+
+@lru_cache(maxsize=None)
+def get_zobrist_keys(grid_size):
+    """Get the shared ZobristKeys for a grid size"""
+    return ZobristKeys(grid_size)
@@ -3,6 +3,8 @@ import threading
 import json
 import time
 import logging
+from ..game.rules import GameRules, DEFAULT_RULES
+from ..game.zobrist import get_zobrist_keys
 
 # Configuration client - PORT FIXÉ À 65432
 DEFAULT_HOST = 'localhost'
@@ -15,8 +17,6 @@ WATER = '~'
 SHIP = 'B'
 MISSED_SHOT = 'X'
 HIT_SHOT = 'O'
-GRID_SIZE = 10
-SHIP_SIZES = [5, 4, 3, 3, 2]
 
 class Client:
     """
@@ -66,9 +66,11 @@ class Client:
         }
         
         # État du jeu
+        self.rules = DEFAULT_RULES  # Remplacées par celles du serveur à la connexion
         self.opponent_username = ""
         self.my_grid = None
         self.opponent_grid = None
+        self.opponent_shots_hash = 0  # Hachage Zobrist des tirs visibles sur opponent_grid
         self.my_turn = False
         
         # Ajout de l'attribut game_state pour stocker l'état de la partie en mode réseau
@@ -228,7 +230,23 @@ class Client:
         """
         message = {
             'type': 'fire_shot',
-            'position': [row, column]
+            'position': [row, column],
+            'hash': self.opponent_shots_hash
+        }
+        
+        return self._send_message(message)
+    
+    def fire_salvo(self, positions):
+        """
+        Envoyer tous les tirs du tour au serveur en un seul message (mode salve)
+        
+        Args:
+            positions: Liste de (ligne, colonne), au plus rules.salvo_size
+        """
+        message = {
+            'type': 'fire_salvo',
+            'positions': [[row, column] for row, column in positions],
+            'hash': self.opponent_shots_hash
         }
         
         return self._send_message(message)
@@ -334,6 +352,8 @@ class Client:
                 
                 if message_type == 'login_success':
                     self.client_id = message.get('id')
+                    if 'rules' in message:
+                        self.rules = GameRules.from_dict(message['rules'])
                     self.logger.info(f"Connecté avec succès. ID: {self.client_id}")
                     # Initialiser le temps du dernier pong
                     self.last_pong_time = time.time()
@@ -341,7 +361,7 @@ class Client:
                 elif message_type == 'game_start':
                     self.opponent_username = message.get('opponent', "Adversaire")
                     self.my_grid = message.get('my_grid')
-                    self.opponent_grid = message.get('opponent_grid')
+                    self._resync_opponent_grid(message.get('opponent_grid'))
                     self.my_turn = message.get('first_player', False)
                     self.logger.info(f"Partie commencée contre {self.opponent_username}")
                     # Stocker le game_state reçu du serveur
@@ -352,7 +372,7 @@ class Client:
                     self.logger.info("C'est votre tour")
                 
                 elif message_type == 'shot_result':
-                    self.opponent_grid = message.get('opponent_grid', self.opponent_grid)
+                    self._apply_shot_results(message, [message.get('position')], [message.get('result')])
                     self.my_turn = False
                     self.logger.info(f"Résultat du tir: {message.get('result')}")
                 
@@ -361,6 +381,16 @@ class Client:
                     self.my_turn = True
                     self.logger.info(f"L'adversaire a tiré en {message.get('position')}")
                 
+                elif message_type == 'salvo_result':
+                    self._apply_shot_results(message, message.get('positions', []), message.get('results', []))
+                    self.my_turn = False
+                    self.logger.info(f"Résultats de la salve: {message.get('results')}")
+                
+                elif message_type == 'opponent_salvo':
+                    self.my_grid = message.get('my_grid', self.my_grid)
+                    self.my_turn = True
+                    self.logger.info(f"L'adversaire a tiré une salve en {message.get('positions')}")
+                
                 elif message_type == 'opponent_disconnected':
                     self.logger.info("L'adversaire s'est déconnecté")
                     # Réinitialiser l'état de la partie
@@ -380,6 +410,43 @@ class Client:
                 if self.connected:
                     time.sleep(0.1)
                     
+    def _apply_shot_results(self, message, positions, results):
+        """
+        Reporter le résultat de nos tirs sur opponent_grid
+        
+        Le serveur ne renvoie la grille adverse que si le hachage envoyé avec
+        le tir ne correspondait pas au sien ; sinon la grille est mise à jour
+        localement et comparée au hachage qu'il renvoie.
+        """
+        if 'opponent_grid' in message:
+            self._resync_opponent_grid(message['opponent_grid'])
+            return
+        
+        if self.opponent_grid:
+            keys = get_zobrist_keys(self.rules.grid_size)
+            for (row, column), result in zip(positions, results):
+                hit = result != "miss"
+                self.opponent_grid['matrix'][row][column] = HIT_SHOT if hit else MISSED_SHOT
+                self.opponent_shots_hash ^= keys.shot(row * self.rules.grid_size + column, hit)
+        
+        if message.get('hash', self.opponent_shots_hash) != self.opponent_shots_hash:
+            # La grille sera renvoyée par le serveur au prochain tir
+            self.logger.warning("Vue de la grille adverse désynchronisée avec le serveur")
+    
+    def _resync_opponent_grid(self, grid):
+        """
+        Remplacer opponent_grid par une grille reçue du serveur et recalculer son hachage
+        """
+        self.opponent_grid = grid
+        self.opponent_shots_hash = 0
+        if not grid:
+            return
+        keys = get_zobrist_keys(self.rules.grid_size)
+        for row, cells in enumerate(grid['matrix']):
+            for column, cell in enumerate(cells):
+                if cell in (MISSED_SHOT, HIT_SHOT):
+                    self.opponent_shots_hash ^= keys.shot(row * self.rules.grid_size + column, cell == HIT_SHOT)
+    
     def reconnect(self):
         """
         Tenter de se reconnecter au serveur après une perte de connexion
@@ -0,0 +1,179 @@
+"""
+Validation des flottes envoyées par les clients (message 'place_ships').
+
+Une grille au format du serveur est un dictionnaire :
+    'matrix': grille_size lignes de grille_size cases, WATER ou SHIP
+    'ships': liste de {'size': n, 'positions': [[ligne, colonne], ...], ...}
+
+validate_fleet() vérifie en un seul passage linéaire que la flotte est celle
+des règles (tailles des bateaux), que chaque bateau est une ligne droite
+dans la grille, que les bateaux ne se chevauchent ni ne se touchent (même
+règle que Board.is_valid_placement, diagonales comprises) et que la matrice
+correspond aux bateaux. Les tailles sont vérifiées avant de parcourir les
+positions : une charge énorme est rejetée sans être parcourue.
+"""
+from collections import Counter
+
+from ..game.rules import DEFAULT_RULES
+
+# Constantes pour la grille (identiques à celles du serveur)
+WATER = '~'
+SHIP = 'B'
+
+# Codes d'erreur
+MALFORMED = 'malformed'          # La grille n'a pas le format attendu
+WRONG_FLEET = 'wrong_fleet'      # Les tailles des bateaux ne sont pas celles des règles
+BAD_SHIP = 'bad_ship'            # Bateau mal décrit (taille, positions, tirs déjà reçus)
+OUT_OF_GRID = 'out_of_grid'      # Position hors de la grille
+NOT_STRAIGHT = 'not_straight'    # Bateau qui n'est pas une ligne continue
+OVERLAP = 'overlap'              # Deux bateaux sur la même case
+ADJACENT = 'adjacent'            # Deux bateaux qui se touchent
+MATRIX_MISMATCH = 'matrix_mismatch'  # Case de la matrice en désaccord avec les bateaux
+
+MAX_ERRORS = 20  # Au-delà, les erreurs suivantes ne sont pas rapportées
+
+
+def _error(code, message, ship=None, position=None):
+    """Erreur structurée, envoyable telle quelle au client"""
+    error = {'code': code, 'message': message}
+    if ship is not None:
+        error['ship'] = ship
+    if position is not None:
+        error['position'] = position
+    return error
+
+
+def _is_index(value, size):
+    return type(value) is int and 0 <= value < size
+
+
+def validate_fleet(grid, rules=None):
+    """
+    Vérifier une flotte au format du serveur
+
+    Args:
+        grid: Grille reçue du client ({'matrix': ..., 'ships': ...})
+        rules: GameRules de la partie (règles standard par défaut)
+
+    Returns:
+        Liste d'erreurs ({'code', 'message'} et, selon l'erreur, 'ship' : indice
+        du bateau, 'position' : [ligne, colonne]), vide si la flotte est valide
+    """
+    rules = rules or DEFAULT_RULES
+    size = rules.grid_size
+
+    if not isinstance(grid, dict):
+        return [_error(MALFORMED, "La grille doit être un objet avec 'matrix' et 'ships'.")]
+    matrix = grid.get('matrix')
+    ships = grid.get('ships')
+    if not isinstance(matrix, list) or len(matrix) != size:
+        return [_error(MALFORMED, f"La matrice doit compter {size} lignes.")]
+    if not isinstance(ships, list):
+        return [_error(MALFORMED, "La liste des bateaux est manquante.")]
+    if len(ships) != len(rules.ship_sizes):
+        return [_error(WRONG_FLEET, f"La flotte doit compter {len(rules.ship_sizes)} bateaux.")]
+
+    errors = []
+    allowed_sizes = set(rules.ship_sizes)
+    sizes = Counter()
+    owner = [0] * (size * size)  # Case (ligne, colonne) -> indice du bateau + 1, 0 pour l'eau
+    ship_cells = []
+
+    for index, ship in enumerate(ships):
+        if len(errors) >= MAX_ERRORS:
+            break
+        if not isinstance(ship, dict):
+            errors.append(_error(BAD_SHIP, "Bateau mal décrit.", index))
+            continue
+        ship_size = ship.get('size')
+        positions = ship.get('positions')
+        if type(ship_size) is not int or ship_size not in allowed_sizes:
+            errors.append(_error(BAD_SHIP, f"Taille de bateau invalide : {ship_size!r}.", index))
+            continue
+        if not isinstance(positions, list) or len(positions) != ship_size:
+            errors.append(_error(BAD_SHIP, f"Un bateau de taille {ship_size} doit occuper {ship_size} cases.", index))
+            continue
+        if ship.get('hits'):
+            errors.append(_error(BAD_SHIP, "Un bateau ne peut pas être déjà touché.", index))
+            continue
+
+        cells = []
+        for position in positions:
+            if (not isinstance(position, (list, tuple)) or len(position) != 2
+                    or not _is_index(position[0], size) or not _is_index(position[1], size)):
+                errors.append(_error(OUT_OF_GRID, "Position hors de la grille.", index))
+                break
+            cells.append(position[0] * size + position[1])
+        else:
+            # Une ligne droite continue : cases consécutives sur une même ligne, ou espacées d'une ligne
+            cells.sort()
+            first = cells[0]
+            step = 1 if ship_size > 1 and cells[1] - first == 1 else size
+            straight = cells == list(range(first, first + step * ship_size, step))
+            if not straight or (step == 1 and cells[-1] // size != first // size):
+                errors.append(_error(NOT_STRAIGHT, "Un bateau doit être une ligne droite continue.", index))
+                continue
+
+            sizes[ship_size] += 1
+            ship_cells.extend(cells)
+            for cell in cells:
+                if owner[cell]:
+                    errors.append(_error(OVERLAP, "Deux bateaux se chevauchent.", index, list(divmod(cell, size))))
+                else:
+                    owner[cell] = index + 1
+
+    # La matrice n'est comparée qu'à des bateaux bien formés, sans quoi chaque
+    # bateau rejeté ajouterait une erreur par case
+    if errors:
+        return errors[:MAX_ERRORS]
+    if sizes != Counter(rules.ship_sizes):
+        expected = ", ".join(str(ship_size) for ship_size in sorted(rules.ship_sizes, reverse=True))
+        return [_error(WRONG_FLEET, f"La flotte doit compter des bateaux de tailles {expected}.")]
+
+    # Matrice : si chaque case de bateau vaut SHIP et que chaque ligne compte
+    # exactement autant de SHIP que de cases de bateau, et WATER partout ailleurs,
+    # la matrice correspond (les comptages sont faits par list.count, en C)
+    row_ships = [0] * size
+    for cell in ship_cells:
+        row_ships[cell // size] += 1
+    for row, line in enumerate(matrix):
+        if not isinstance(line, list) or len(line) != size:
+            return [_error(MALFORMED, f"Chaque ligne de la matrice doit compter {size} cases.")]
+        if line.count(SHIP) == row_ships[row] and line.count(WATER) == size - row_ships[row]:
+            continue
+        base = row * size
+        for column, value in enumerate(line):
+            if value != (SHIP if owner[base + column] else WATER):
+                errors.append(_error(MATRIX_MISMATCH, "La matrice ne correspond pas aux bateaux.",
+                                     position=[row, column]))
+        if len(errors) >= MAX_ERRORS:
+            return errors[:MAX_ERRORS]
+    for cell in ship_cells:
+        row, column = divmod(cell, size)
+        if matrix[row][column] != SHIP:
+            errors.append(_error(MATRIX_MISMATCH, "La matrice ne correspond pas aux bateaux.",
+                                 position=[row, column]))
+
+    # Contacts : seuls les voisins suivants (droite et ligne du dessous) de chaque
+    # case de bateau sont vus, chaque contact n'est signalé qu'une fois
+    last_row = size * (size - 1)
+    for cell in ship_cells:
+        ship = owner[cell]
+        column = cell % size
+        neighbours = []
+        if column + 1 < size:
+            neighbours.append(cell + 1)
+        if cell < last_row:
+            below = cell + size
+            neighbours.append(below)
+            if column:
+                neighbours.append(below - 1)
+            if column + 1 < size:
+                neighbours.append(below + 1)
+        for neighbour in neighbours:
+            other = owner[neighbour]
+            if other and other != ship:
+                errors.append(_error(ADJACENT, "Deux bateaux se touchent.", ship - 1, list(divmod(cell, size))))
+                break
+
+    return errors[:MAX_ERRORS]
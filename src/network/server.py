@@ -3,12 +3,17 @@ import threading
 import json
 import time
 import logging
+import os
 import random
-import requests  # Pour obtenir l'IP publique
+from ..game.rules import DEFAULT_RULES
+from ..game.replay import ReplayWriter
+from ..game.zobrist import get_zobrist_keys
+from .fleet_validator import validate_fleet
 
 # Configuration du serveur
 HOST = '0.0.0.0'  # Accepte les connexions de toutes les interfaces
 PORT = 65432  # Port utilisé par l'autre projet
+MAX_MESSAGE_SIZE = 64 * 1024  # Taille maximale d'un message client (octets), relevée pour les grandes grilles
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,17 +31,30 @@ WATER = '~'
 SHIP = 'B'
 MISSED_SHOT = 'X'
 HIT_SHOT = 'O'
-GRID_SIZE = 10
-SHIP_SIZES = [5, 4, 3, 3, 2]
 
 class Server:
     """
     Serveur pour gérer les connexions réseau du jeu de bataille navale
     """
     
-    def __init__(self, host=HOST, port=PORT):
+    def __init__(self, host=HOST, port=PORT, rules=None, seed=None, replay_dir=None):
+        """
+        Args:
+            host, port: Adresse d'écoute
+            rules: Règles des parties (GameRules), règles standard par défaut
+            seed: Graine du générateur aléatoire du serveur ; chaque partie reçoit
+                  son propre générateur dérivé de celui-ci (aléatoire si None)
+            replay_dir: Dossier où enregistrer chaque partie au format replay
+                        binaire (<graine de la partie>.bsr), rien n'est enregistré si None
+        """
         self.host = host
         self.port = port
+        self.rules = rules or DEFAULT_RULES  # Taille de grille et flotte des parties
+        self.rng = random.Random(seed)
+        self.replay_dir = replay_dir
+        self.zobrist = get_zobrist_keys(self.rules.grid_size)  # Hachage des tirs reçus par chaque grille
+        # Un placement de bateaux ('matrix' et 'ships' en JSON) fait moins de 16 octets par case
+        self.max_message_size = max(MAX_MESSAGE_SIZE, 16 * self.rules.grid_size ** 2)
         self.server_socket = None
         self.running = False
         self.local_ip = None
@@ -50,6 +68,9 @@ class Server:
             str ou None: Adresse IP publique ou None en cas d'échec
         """
         try:
+            # Import local : requests coûte ~60 ms à l'import et ne sert qu'ici
+            import requests
+            
             # Essayer différents services pour récupérer l'IP publique
             services = [
                 "https://api.ipify.org?format=json",
@@ -219,6 +240,7 @@ class Server:
                     'id': client_id,
                     'username': username,
                     'grid': self._create_empty_grid(),
+                    'shots_hash': 0,  # Hachage Zobrist des tirs reçus par la grille
                     'status': 'waiting_placement',
                     'address': addr,
                     'last_activity': time.time()
@@ -230,6 +252,7 @@ class Server:
             self._send_message(client_socket, {
                 'type': 'login_success',
                 'id': client_id,
+                'rules': self.rules.to_dict(),
                 'message': f"Bienvenue {username}! Placez vos bateaux."
             })
             
@@ -250,8 +273,19 @@ class Server:
                     message_type = message.get('type')
                     
                     if message_type == 'place_ships':
+                        # Vérifier le placement des bateaux avant de l'accepter
+                        errors = validate_fleet(message.get('grid'), self.rules)
+                        if errors:
+                            self._send_message(client_socket, {
+                                'type': 'error',
+                                'message': errors[0]['message'],
+                                'errors': errors
+                            })
+                            continue
+                        
                         # Recevoir le placement des bateaux
                         client_info['grid'] = message['grid']
+                        client_info['shots_hash'] = 0
                         client_info['status'] = 'ready'
                         
                         self._send_message(client_socket, {
@@ -279,6 +313,11 @@ class Server:
                         opponent_socket = client_info['opponent']
                         opponent_info = clients[opponent_socket]
                         
+                        # Le client envoie le hachage de sa vue des tirs adverses :
+                        # la grille ne lui est renvoyée que s'il diverge
+                        client_hash = message.get('hash')
+                        in_sync = client_hash == opponent_info['shots_hash']
+                        
                         # Traiter le tir sur la grille adverse
                         result = self._process_shot(opponent_info['grid'], row, column)
                         
@@ -289,17 +328,24 @@ class Server:
                             })
                             continue
                         
+                        self._hash_shot(opponent_info, row, column, result)
+                        if client_info.get('replay'):
+                            client_info['replay'].write_shot(client_info['replay_player'], column, row)
+                        
                         # Vérifier si la partie est terminée
                         game_over = self._check_game_over(opponent_info['grid'])
                         
                         # Envoyer le résultat au tireur
-                        self._send_message(client_socket, {
+                        response = {
                             'type': 'shot_result',
                             'result': result,
                             'position': [row, column],
                             'game_over': game_over,
-                            'opponent_grid': opponent_info['grid']
-                        })
+                            'hash': opponent_info['shots_hash']
+                        }
+                        if not in_sync:
+                            response['opponent_grid'] = self._resync_grid(client_info, opponent_info, client_hash)
+                        self._send_message(client_socket, response)
                         
                         # Envoyer le résultat à l'adversaire
                         self._send_message(opponent_socket, {
@@ -307,41 +353,72 @@ class Server:
                             'result': result,
                             'position': [row, column],
                             'game_over': game_over,
+                            'hash': opponent_info['shots_hash'],
                             'my_grid': opponent_info['grid']
                         })
                         
-                        if not game_over:
-                            # Passer le tour
-                            client_info['turn'] = False
-                            opponent_info['turn'] = True
-                            
-                            # Informer l'adversaire que c'est son tour
-                            self._send_message(opponent_socket, {
-                                'type': 'your_turn',
-                                'message': "C'est votre tour de tirer."
-                            })
-                        else:
-                            # Fin de partie
-                            client_info.pop('opponent', None)
-                            opponent_info.pop('opponent', None)
-                            client_info['status'] = 'waiting_placement'
-                            opponent_info['status'] = 'waiting_placement'
-                            
+                        self._end_turn(client_socket, opponent_socket, game_over)
+                    
+                    elif message_type == 'fire_salvo':
+                        # Traiter une salve : tous les tirs du tour en un seul message
+                        if 'opponent' not in client_info or client_info.get('turn', False) is False:
                             self._send_message(client_socket, {
-                                'type': 'game_over',
-                                'winner': True,
-                                'message': "Félicitations ! Vous avez gagné !"
+                                'type': 'error',
+                                'message': "Ce n'est pas votre tour."
                             })
-                            
-                            self._send_message(opponent_socket, {
-                                'type': 'game_over',
-                                'winner': False,
-                                'message': "Dommage, vous avez perdu. Votre adversaire a coulé tous vos bateaux."
+                            continue
+                        
+                        positions = [tuple(position) for position in message.get('positions', [])]
+                        opponent_socket = client_info['opponent']
+                        opponent_info = clients[opponent_socket]
+                        
+                        error = self._check_salvo(opponent_info['grid'], positions)
+                        if error:
+                            self._send_message(client_socket, {
+                                'type': 'error',
+                                'message': error
                             })
+                            continue
+                        
+                        client_hash = message.get('hash')
+                        in_sync = client_hash == opponent_info['shots_hash']
+                        
+                        # Traiter toute la salve avant de répondre
+                        results = [self._process_shot(opponent_info['grid'], row, column) for row, column in positions]
+                        for (row, column), result in zip(positions, results):
+                            self._hash_shot(opponent_info, row, column, result)
+                        if client_info.get('replay'):
+                            for row, column in positions:
+                                client_info['replay'].write_shot(client_info['replay_player'], column, row)
+                        
+                        game_over = self._check_game_over(opponent_info['grid'])
+                        
+                        response = {
+                            'type': 'salvo_result',
+                            'results': results,
+                            'positions': [list(position) for position in positions],
+                            'game_over': game_over,
+                            'hash': opponent_info['shots_hash']
+                        }
+                        if not in_sync:
+                            response['opponent_grid'] = self._resync_grid(client_info, opponent_info, client_hash)
+                        self._send_message(client_socket, response)
+                        
+                        self._send_message(opponent_socket, {
+                            'type': 'opponent_salvo',
+                            'results': results,
+                            'positions': [list(position) for position in positions],
+                            'game_over': game_over,
+                            'hash': opponent_info['shots_hash'],
+                            'my_grid': opponent_info['grid']
+                        })
+                        
+                        self._end_turn(client_socket, opponent_socket, game_over)
                     
                     elif message_type == 'ready_for_new_game':
                         # Préparer une nouvelle partie
                         client_info['grid'] = self._create_empty_grid()
+                        client_info['shots_hash'] = 0
                         client_info['status'] = 'waiting_placement'
                         
                         self._send_message(client_socket, {
@@ -386,6 +463,7 @@ class Server:
                         'message': f"{client_info['username']} s'est déconnecté. La partie est terminée."
                     })
                     
+                    self._stop_replay(client_info, opponent_info)
                     opponent_info.pop('opponent', None)
                 
                 logger.info(f"Client {client_info['username']} (ID: {client_info['id']}) déconnecté depuis {client_info['address']}.")
@@ -418,13 +496,21 @@ class Server:
                 client_info['opponent'] = other_socket
                 other_info['opponent'] = client_socket
                 
+                # Générateur propre à la partie, partagé par les deux joueurs
+                match_seed = self.rng.getrandbits(64)
+                match_rng = random.Random(match_seed)
+                client_info['match_seed'] = other_info['match_seed'] = match_seed
+                client_info['match_rng'] = other_info['match_rng'] = match_rng
+                
                 # Tirer au sort qui commence
-                first_player = random.choice([client_socket, other_socket])
+                first_player = match_rng.choice([client_socket, other_socket])
                 second_player = other_socket if first_player == client_socket else client_socket
                 
                 clients[first_player]['turn'] = True
                 clients[second_player]['turn'] = False
                 
+                self._start_replay(client_info, other_info, match_seed)
+                
                 # Informer les deux joueurs du démarrage de la partie
                 self._send_message(client_socket, {
                     'type': 'game_start',
@@ -457,6 +543,55 @@ class Server:
             'message': "En attente d'un adversaire..."
         })
     
+    def _start_replay(self, player_info, opponent_info, match_seed):
+        """
+        Ouvrir le fichier replay d'une partie qui commence (si replay_dir est défini)
+        
+        Args:
+            player_info, opponent_info: Infos des joueurs 0 et 1 de la partie
+            match_seed: Graine de la partie, utilisée comme nom de fichier
+        """
+        if not self.replay_dir:
+            return
+        try:
+            fleets = [self._fleet_layout(player_info['grid']), self._fleet_layout(opponent_info['grid'])]
+            os.makedirs(self.replay_dir, exist_ok=True)
+            stream = open(os.path.join(self.replay_dir, f"{match_seed:016x}.bsr"), 'wb')
+            replay = ReplayWriter(stream, self.rules, fleets, match_seed)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Partie non enregistrée : {e}")
+            return
+        player_info['replay'] = opponent_info['replay'] = replay
+        player_info['replay_player'] = 0
+        opponent_info['replay_player'] = 1
+    
+    def _stop_replay(self, *infos):
+        """Fermer le fichier replay d'une partie terminée"""
+        replay = None
+        for info in infos:
+            replay = info.pop('replay', None) or replay
+            info.pop('replay_player', None)
+        if replay:
+            replay.stream.close()
+    
+    def _fleet_layout(self, grid):
+        """
+        Convertir les bateaux d'une grille ('ships' avec 'positions' en [ligne, colonne])
+        au format (taille, x, y, horizontal) des replays
+        
+        Raises:
+            ValueError: Si un bateau n'est pas une ligne droite
+        """
+        fleet = []
+        for ship in grid['ships']:
+            rows = [position[0] for position in ship['positions']]
+            columns = [position[1] for position in ship['positions']]
+            horizontal = len(set(rows)) == 1
+            if not horizontal and len(set(columns)) != 1:
+                raise ValueError("bateau qui n'est pas en ligne droite")
+            fleet.append((ship['size'], min(columns), min(rows), horizontal))
+        return fleet
+    
     def _hide_ships(self, grid):
         """
         Cacher les bateaux d'une grille (remplacer 'B' par '~')
@@ -511,6 +646,9 @@ class Server:
                 return None
             
             message_size = int.from_bytes(size_bytes, byteorder='big')
+            if message_size > self.max_message_size:
+                logger.warning(f"Message de {message_size} octets refusé (maximum {self.max_message_size})")
+                return None
             
             # Recevoir le message par morceaux si nécessaire
             message_bytes = b''
@@ -530,6 +668,72 @@ class Server:
             logger.error(f"Erreur lors de la réception du message: {e}")
             return None
     
+    def _end_turn(self, client_socket, opponent_socket, game_over):
+        """
+        Passer le tour à l'adversaire, ou terminer la partie
+        (à appeler avec le verrou des clients)
+        
+        Args:
+            client_socket: Socket du joueur qui vient de tirer
+            opponent_socket: Socket de son adversaire
+            game_over: True si le joueur vient de couler le dernier bateau adverse
+        """
+        client_info = clients[client_socket]
+        opponent_info = clients[opponent_socket]
+        
+        if not game_over:
+            # Passer le tour
+            client_info['turn'] = False
+            opponent_info['turn'] = True
+            
+            # Informer l'adversaire que c'est son tour
+            self._send_message(opponent_socket, {
+                'type': 'your_turn',
+                'message': "C'est votre tour de tirer."
+            })
+        else:
+            # Fin de partie
+            self._stop_replay(client_info, opponent_info)
+            client_info.pop('opponent', None)
+            opponent_info.pop('opponent', None)
+            client_info['status'] = 'waiting_placement'
+            opponent_info['status'] = 'waiting_placement'
+            
+            self._send_message(client_socket, {
+                'type': 'game_over',
+                'winner': True,
+                'message': "Félicitations ! Vous avez gagné !"
+            })
+            
+            self._send_message(opponent_socket, {
+                'type': 'game_over',
+                'winner': False,
+                'message': "Dommage, vous avez perdu. Votre adversaire a coulé tous vos bateaux."
+            })
+    
+    def _check_salvo(self, grid, positions):
+        """
+        Vérifier une salve avant de la traiter
+        
+        Args:
+            grid: Grille cible
+            positions: Liste de (ligne, colonne)
+            
+        Returns:
+            Message d'erreur, ou None si la salve est valide
+        """
+        if not 1 <= len(positions) <= self.rules.salvo_size:
+            return f"Une salve compte de 1 à {self.rules.salvo_size} tirs."
+        if len(set(positions)) != len(positions):
+            return "Une salve ne peut pas viser deux fois la même case."
+        for position in positions:
+            if len(position) != 2 or not all(0 <= value < self.rules.grid_size for value in position):
+                return "Tir hors de la grille."
+            row, column = position
+            if grid['matrix'][row][column] in [MISSED_SHOT, HIT_SHOT]:
+                return "Vous avez déjà tiré à cette position."
+        return None
+    
     def _create_empty_grid(self):
         """
         Créer une grille vide
@@ -538,10 +742,40 @@ class Server:
             Grille vide
         """
         return {
-            'matrix': [[WATER for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)],
+            'matrix': [[WATER for _ in range(self.rules.grid_size)] for _ in range(self.rules.grid_size)],
             'ships': []
         }
     
+    def _hash_shot(self, info, row, column, result):
+        """
+        Mettre à jour le hachage Zobrist des tirs reçus par la grille d'un client
+        
+        Même clé que Board.shots_hash pour la case (y * taille + x), un XOR par tir.
+        
+        Args:
+            info: Informations du client dont la grille a reçu le tir
+            row, column: Coordonnées du tir
+            result: Résultat renvoyé par _process_shot
+        """
+        cell = row * self.rules.grid_size + column
+        info['shots_hash'] ^= self.zobrist.shot(cell, result != "miss")
+    
+    def _resync_grid(self, client_info, opponent_info, client_hash):
+        """
+        Grille adverse à renvoyer à un client dont le hachage diverge (ou qui
+        n'en envoie pas)
+        
+        Args:
+            client_hash: Hachage envoyé par le client, None pour un ancien client
+        
+        Returns:
+            Grille de l'adversaire, bateaux cachés comme au début de la partie
+        """
+        if client_hash is not None:
+            logger.warning(f"Vue de la grille adverse désynchronisée pour {client_info['username']}, "
+                           f"renvoi de la grille.")
+        return self._hide_ships(opponent_info['grid'])
+    
     def _process_shot(self, grid, row, column):
         """
         Traiter un tir sur une grille
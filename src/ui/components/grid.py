@@ -3,18 +3,18 @@ from ...utils.constants import (
     GRID_SIZE, CELL_SIZE, WHITE, BLACK, BLUE, LIGHT_BLUE, 
     RED, GREEN, GRAY
 )
+from ...game.shot_ledger import UNKNOWN, MISS
+from ...game.rules import DEFAULT_RULES
 
 class Grid:
     """
     A grid component for rendering the game board
     """
     
-    def __init__(self, x, y, is_player_grid=True):
+    def __init__(self, x, y, is_player_grid=True, rules=None):
         self.x = x
         self.y = y
         self.is_player_grid = is_player_grid
-        self.width = GRID_SIZE * CELL_SIZE
-        self.height = GRID_SIZE * CELL_SIZE
         
         # Labels for rows and columns
         self.font = pygame.font.Font(None, 24)
@@ -23,6 +23,21 @@ class Grid:
         self.selected_cell = None
         self.hover_cell = None
         
+        self.set_rules(rules or DEFAULT_RULES)
+        
+    def set_rules(self, rules):
+        """
+        Adapt the grid to the board size of the given rules
+        
+        Bigger boards keep the on-screen size of a standard board by
+        shrinking the cells; labels are only drawn while they fit.
+        """
+        self.grid_size = rules.grid_size
+        self.cell_size = max(1, min(CELL_SIZE, GRID_SIZE * CELL_SIZE // self.grid_size))
+        self.width = self.grid_size * self.cell_size
+        self.height = self.grid_size * self.cell_size
+        self.show_labels = self.cell_size >= 20 and self.grid_size <= 26
+        
     def handle_event(self, event):
         """
         Handle mouse events on the grid
@@ -37,7 +52,7 @@ class Grid:
             mouse_x, mouse_y = event.pos
             cell_x, cell_y = self._get_cell_at_pos(mouse_x, mouse_y)
             
-            if 0 <= cell_x < GRID_SIZE and 0 <= cell_y < GRID_SIZE:
+            if 0 <= cell_x < self.grid_size and 0 <= cell_y < self.grid_size:
                 self.hover_cell = (cell_x, cell_y)
             else:
                 self.hover_cell = None
@@ -46,7 +61,7 @@ class Grid:
             mouse_x, mouse_y = event.pos
             cell_x, cell_y = self._get_cell_at_pos(mouse_x, mouse_y)
             
-            if 0 <= cell_x < GRID_SIZE and 0 <= cell_y < GRID_SIZE:
+            if 0 <= cell_x < self.grid_size and 0 <= cell_y < self.grid_size:
                 self.selected_cell = (cell_x, cell_y)
                 return (cell_x, cell_y)
                 
@@ -63,11 +78,11 @@ class Grid:
             (cell_x, cell_y): Cell coordinates (may be out of bounds)
         """
         # Adjust for row/column labels
-        grid_x = mouse_x - (self.x + CELL_SIZE)
-        grid_y = mouse_y - (self.y + CELL_SIZE)
+        grid_x = mouse_x - (self.x + self.cell_size)
+        grid_y = mouse_y - (self.y + self.cell_size)
         
-        cell_x = grid_x // CELL_SIZE
-        cell_y = grid_y // CELL_SIZE
+        cell_x = grid_x // self.cell_size
+        cell_y = grid_y // self.cell_size
         
         return (cell_x, cell_y)
         
@@ -81,31 +96,37 @@ class Grid:
             show_ships: Whether to show ships on the board
             ship_preview: (ship, x, y, horizontal) for ship placement preview
         """
+        cell_size = self.cell_size
+        
         # Draw labels
-        # Column labels (A-J)
-        for i in range(GRID_SIZE):
-            label = self.font.render(chr(65 + i), True, WHITE)
-            label_rect = label.get_rect(
-                center=(self.x + CELL_SIZE * (i + 1) + CELL_SIZE // 2, self.y + CELL_SIZE // 2)
-            )
-            surface.blit(label, label_rect)
-            
-        # Row labels (1-10)
-        for i in range(GRID_SIZE):
-            label = self.font.render(str(i + 1), True, WHITE)
-            label_rect = label.get_rect(
-                center=(self.x + CELL_SIZE // 2, self.y + CELL_SIZE * (i + 1) + CELL_SIZE // 2)
-            )
-            surface.blit(label, label_rect)
+        if self.show_labels:
+            # Column labels (A-J)
+            for i in range(self.grid_size):
+                label = self.font.render(chr(65 + i), True, WHITE)
+                label_rect = label.get_rect(
+                    center=(self.x + cell_size * (i + 1) + cell_size // 2, self.y + cell_size // 2)
+                )
+                surface.blit(label, label_rect)
+                
+            # Row labels (1-10)
+            for i in range(self.grid_size):
+                label = self.font.render(str(i + 1), True, WHITE)
+                label_rect = label.get_rect(
+                    center=(self.x + cell_size // 2, self.y + cell_size * (i + 1) + cell_size // 2)
+                )
+                surface.blit(label, label_rect)
             
+        # Read the ship layout once per frame (computed on access by some backends)
+        ship_grid = board.grid if board else None
+        
         # Draw grid cells
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
+        for y in range(self.grid_size):
+            for x in range(self.grid_size):
                 rect = pygame.Rect(
-                    self.x + CELL_SIZE * (x + 1),
-                    self.y + CELL_SIZE * (y + 1),
-                    CELL_SIZE,
-                    CELL_SIZE
+                    self.x + cell_size * (x + 1),
+                    self.y + cell_size * (y + 1),
+                    cell_size,
+                    cell_size
                 )
                 
                 # Default cell color
@@ -114,14 +135,15 @@ class Grid:
                 # Draw cell based on board state
                 if board:
                     # Ship cell
-                    if board.grid[y][x] != 0 and show_ships:
+                    if ship_grid[y][x] != 0 and show_ships:
                         cell_color = GRAY
                         
                     # Shot cell
-                    for shot_x, shot_y, hit in board.shots:
-                        if shot_x == x and shot_y == y:
-                            cell_color = RED if hit else BLUE
-                            break
+                    state = board.cell_state(x, y)
+                    if state == MISS:
+                        cell_color = BLUE
+                    elif state != UNKNOWN:
+                        cell_color = RED
                 
                 # Draw the cell
                 pygame.draw.rect(surface, cell_color, rect)
@@ -139,25 +161,27 @@ class Grid:
         if ship_preview:
             ship, ship_x, ship_y, horizontal = ship_preview
             
+            placement = board.placement_table.get(ship.size, ship_x, ship_y, horizontal) if board else None
+            if placement:
+                cells = placement.cells
+                # Use green for valid placement, red for invalid
+                color = GREEN if board.is_valid_placement(ship, ship_x, ship_y, horizontal) else RED
+            else:
+                # Out of the grid: show the part of the ship that is still inside in red
+                cells = [
+                    (ship_x + i, ship_y) if horizontal else (ship_x, ship_y + i)
+                    for i in range(ship.size)
+                ]
+                color = RED
+            
             # Draw preview cells
-            for i in range(ship.size):
-                if horizontal:
-                    x, y = ship_x + i, ship_y
-                else:
-                    x, y = ship_x, ship_y + i
-                    
-                if 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE:
+            for x, y in cells:
+                if 0 <= x < self.grid_size and 0 <= y < self.grid_size:
                     rect = pygame.Rect(
-                        self.x + CELL_SIZE * (x + 1),
-                        self.y + CELL_SIZE * (y + 1),
-                        CELL_SIZE,
-                        CELL_SIZE
+                        self.x + cell_size * (x + 1),
+                        self.y + cell_size * (y + 1),
+                        cell_size,
+                        cell_size
                     )
-                    
-                    # Use green for valid placement, red for invalid
-                    if board and board.is_valid_placement(ship, ship_x, ship_y, horizontal):
-                        pygame.draw.rect(surface, GREEN, rect)
-                    else:
-                        pygame.draw.rect(surface, RED, rect)
-                        
+                    pygame.draw.rect(surface, color, rect)
                     pygame.draw.rect(surface, BLACK, rect, 1)
\ No newline at end of file
@@ -89,6 +89,9 @@ class GameScreen:
         self.game_state = None
         self.game_state_initialized = False
         
+        # Last position autosaved in solo mode: (game state, history cursor)
+        self.saved_position = None
+        
     def _init_game_state(self):
         """Initialize game state based on network mode"""
         if not self.game_state_initialized:
@@ -109,11 +112,14 @@ class GameScreen:
                                 if current_difficulty != self.game_state.difficulty:
                                     print(f"Réinitialisation de l'IA avec la difficulté: {self.game_state.difficulty}")
                                     from src.game.BattleshipAI import BattleshipAI
-                                    self.game_state.ai = BattleshipAI(self.game_state.difficulty)
+                                    self.game_state.ai = BattleshipAI(self.game_state.difficulty, self.game_state.rules,
+                                                                      self.game_state.spawn_rng(),
+                                                                      deterministic=self.game_state.seed is not None)
                     else:
-                        # Créer un nouveau GameState si nécessaire
+                        # Créer un nouveau GameState si nécessaire, au niveau choisi en dernier
                         from ...game.game_state import GameState
-                        self.game_state = GameState()
+                        from .ship_placement import ShipPlacement
+                        self.game_state = GameState(difficulty=ShipPlacement.last_selected_difficulty)
                         print("Nouvel état de jeu créé")
                 else:
                     # En mode réseau, l'état du jeu vient du serveur
@@ -130,6 +136,12 @@ class GameScreen:
                         
                         self.game.client.set_callback(on_game_state_update)
                 
+                # Adapter les grilles à la taille du plateau de la partie
+                rules = getattr(self.game_state, 'rules', None)
+                if rules:
+                    self.player_grid.set_rules(rules)
+                    self.opponent_grid.set_rules(rules)
+                
                 self.game_state_initialized = True
             except Exception as e:
                 print(f"Erreur lors de l'initialisation du game state: {e}")
@@ -185,10 +197,26 @@ class GameScreen:
                 import traceback
                 traceback.print_exc()
                 
+        # Sauvegarder la partie solo après chaque tour (en arrière-plan)
+        if self.game.network_mode == "solo" and self.game_state:
+            self._autosave()
+            
         # Update animations
         if self.animation_timer > 0:
             self.animation_timer -= 1
             
+    def _autosave(self):
+        """Queue a save of the solo game whenever a move has been played since the last one"""
+        position = (self.game_state, self.game_state.history.cursor)
+        if position == self.saved_position:
+            return
+        self.saved_position = position
+        
+        if self.game_state.state == GAME_OVER:
+            self.game.autosaver.clear()
+        elif self.game_state.state in [YOUR_TURN, OPPONENT_TURN]:
+            self.game.autosaver.save(self.game_state)
+            
     def _update_status_text(self):
         """Update the status text based on the current game state"""
         if not hasattr(self, 'game_state') or not self.game_state:
@@ -279,15 +307,16 @@ class GameScreen:
         # Determine which grid to draw on
         if self._is_player_turn():
             # Player's shot on opponent grid
-            x = self.opponent_grid.x + CELL_SIZE * (grid_x + 1) + CELL_SIZE // 2
-            y = self.opponent_grid.y + CELL_SIZE * (grid_y + 1) + CELL_SIZE // 2
+            grid = self.opponent_grid
         else:
             # Opponent's shot on player grid
-            x = self.player_grid.x + CELL_SIZE * (grid_x + 1) + CELL_SIZE // 2
-            y = self.player_grid.y + CELL_SIZE * (grid_y + 1) + CELL_SIZE // 2
+            grid = self.player_grid
+        cell_size = grid.cell_size
+        x = grid.x + cell_size * (grid_x + 1) + cell_size // 2
+        y = grid.y + cell_size * (grid_y + 1) + cell_size // 2
             
         # Animation size depends on timer
-        max_size = CELL_SIZE * 0.8
+        max_size = cell_size * 0.8
         size = max_size * (1 - self.animation_timer / 30)
         
         # Draw circle for the shot
@@ -346,13 +375,10 @@ class GameScreen:
                 if hasattr(self.game, 'screens') and "ship_placement" in self.game.screens:
                     ship_screen = self.game.screens["ship_placement"]
                     
-                    # Réinitialiser l'ID statique des navires 
-                    from ...game.ship import Ship
-                    Ship.next_id = 1
-                    
                     # Créer un nouveau GameState
                     from ...game.game_state import GameState
-                    new_game_state = GameState()
+                    new_game_state = GameState(self.game_state.rules if self.game_state else None,
+                                               difficulty=ship_screen.last_selected_difficulty)
                     
                     # Mettre à jour l'écran de placement
                     ship_screen.game_state = new_game_state
@@ -7,6 +7,7 @@ from ...utils.constants import (
 )
 from ..components.button import Button
 from ..components.panel import Panel
+from ...game.savegame import load_game
 
 class MainScreen:
     """
@@ -30,7 +31,7 @@ class MainScreen:
         
         # Créer un panneau pour les boutons
         panel_width = 300
-        panel_height = 350
+        panel_height = 420
         panel_x = (SCREEN_WIDTH - panel_width) // 2
         panel_y = SCREEN_HEIGHT // 2 - 50
         
@@ -53,6 +54,14 @@ class MainScreen:
             bg_color=BLUE, hover_color=BUTTON_HOVER_COLOR
         )
         
+        button_y += button_height + button_margin
+        self.resume_button = Button(
+            button_x, button_y, button_width, button_height,
+            "Reprendre la partie", self._resume_solo,
+            font_size=28, border_radius=10,
+            bg_color=BLUE, hover_color=BUTTON_HOVER_COLOR
+        )
+        
         button_y += button_height + button_margin
         self.host_button = Button(
             button_x, button_y, button_width, button_height,
@@ -80,6 +89,7 @@ class MainScreen:
         # Rassembler les boutons pour faciliter la gestion
         self.buttons = [
             self.solo_button,
+            self.resume_button,
             self.host_button,
             self.join_button,
             self.quit_button
@@ -110,6 +120,9 @@ class MainScreen:
             
     def update(self):
         """Mettre à jour l'état de l'écran"""
+        # Reprendre n'est possible que s'il existe une sauvegarde de partie solo
+        self.resume_button.disabled = not self.game.autosaver.has_save()
+        
         # Mettre à jour les boutons
         for button in self.buttons:
             button.update()
@@ -156,6 +169,25 @@ class MainScreen:
         self.game.set_network_mode("solo")
         self.game.change_screen("ship_placement")
         
+    def _resume_solo(self):
+        """Reprendre la dernière partie solo sauvegardée"""
+        try:
+            game_state = load_game(self.game.autosaver.path)
+        except (OSError, ValueError) as e:  # load_game reports corrupt saves as ValueError
+            print(f"Impossible de charger la sauvegarde: {e}")
+            self.game.autosaver.clear()
+            return
+        
+        # L'écran de jeu récupère le GameState de l'écran de placement en mode solo
+        ship_screen = self.game.screens["ship_placement"]
+        ship_screen.game_state = game_state
+        ship_screen.current_player_index = 0
+        ship_screen.player = game_state.players[0]
+        self.game.screens["game_screen"].game_state_initialized = False
+        
+        self.game.set_network_mode("solo")
+        self.game.change_screen("game_screen")
+        
     def _host_game(self):
         """Héberger une partie en réseau"""
         # On définit le mode réseau sur "host" et on redirige vers l'écran HostScreen.
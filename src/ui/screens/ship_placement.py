@@ -4,7 +4,7 @@ import math  # Utilisation de math.sin pour les motifs
 from ...utils.constants import (
     SCREEN_WIDTH, SCREEN_HEIGHT, GRID_SIZE, CELL_SIZE, 
     WHITE, BLACK, BLUE, GREEN, RED, GRAY, DARK_BLUE, LIGHT_BLUE, YELLOW,
-    SHIPS
+    SHIPS, DEFAULT_DIFFICULTY
 )
 from ...game.game_state import GameState, YOUR_TURN  # Import de YOUR_TURN pour éviter une erreur
 from ..components.button import Button
@@ -17,6 +17,9 @@ from ...game.player import Player
 class ShipPlacement:
     """Écran de placement des navires avec design amélioré"""
     
+    # Niveau de l'IA choisi en dernier, transmis aux GameState créés par l'écran
+    last_selected_difficulty = DEFAULT_DIFFICULTY
+    
     def __init__(self, game):
         self.game = game
         
@@ -38,11 +41,12 @@ class ShipPlacement:
         # Configuration du joueur et game_state selon le mode
         self.current_player_index = 0
         if self.game.network_mode in ["solo", "local"]:
-            self.game_state = GameState()
+            self.game_state = GameState(difficulty=self.last_selected_difficulty)
             self.player = self.game_state.players[self.current_player_index]
         else:
             # Mode réseau : l'état réel viendra du serveur ultérieurement
             self.player = Player(0)
+        self.grid.set_rules(self.player.rules)
         
         # Navire sélectionné et son orientation
         self.selected_ship_index = 0
@@ -135,7 +139,7 @@ class ShipPlacement:
         self.status_color = WHITE
 
         # Gestion des difficultés
-        self.difficulties = ['Facile', 'Moyenne', 'Difficile', 'Expert']
+        self.difficulties = ['Facile', 'Moyenne', 'Difficile', 'Expert', 'Ultime']
         self.current_difficulty_index = 1  # Moyenne par défaut
         
         # Rassembler les boutons pour faciliter leur gestion
@@ -165,7 +169,7 @@ class ShipPlacement:
             if not hasattr(self, 'game_state'):
                 # Créer un game_state s'il n'existe pas encore
                 from ...game.game_state import GameState
-                self.game_state = GameState()
+                self.game_state = GameState(difficulty=difficulty)
                 self.game_state.is_solo_mode = True
                 print("Nouveau game_state créé pour stocker la difficulté")
                 
@@ -454,7 +458,7 @@ class ShipPlacement:
                         print("Erreur: impossible de placer les navires de l'IA")
                 else:
                     print("Initialisation de game_state en mode solo")
-                    self.game_state = GameState()
+                    self.game_state = GameState(difficulty=self.last_selected_difficulty)
                     self.current_player_index = 0
                     for i, ship in enumerate(self.player.ships):
                         if ship.is_placed():
@@ -26,6 +26,8 @@ GRID_SIZE = 10  # 10x10 grid for the game board
 CELL_SIZE = 40  # Size of each cell in pixels
 BOARD_MARGIN = 50  # Margin around the board
 
+DEFAULT_DIFFICULTY = "moyenne"  # AI level used when none was chosen
+
 # Responsive settings
 SMALL_SCREEN_WIDTH = 640
 SMALL_SCREEN_HEIGHT = 480
@@ -0,0 +1,58 @@
+"""
+IA : le niveau 'ultime' d'une partie déterministe ne dépend pas de l'horloge
+"""
+import itertools
+import random
+
+from src.game import BattleshipAI as ai_module, posterior
+from src.game.BattleshipAI import BattleshipAI
+from src.game.game_state import GameState
+from src.game.player import Player
+from src.game.rules import GameRules
+from src.game.shot_ledger import MISS, HIT, SUNK
+
+
+def targets(rules, seed, shots, **kwargs):
+    """Les premières cibles du niveau 'ultime' contre une flotte tirée avec la graine"""
+    rng = random.Random(seed)
+    player = Player(0, rules, rng=random.Random(rng.getrandbits(64)))
+    player.auto_place_ships()
+    ai = BattleshipAI('ultime', rules, random.Random(rng.getrandbits(64)), **kwargs)
+    chosen = []
+    for _ in range(shots):
+        x, y = ai.choose_target(player.board)
+        hit, _, sunk = player.receive_shot(x, y)
+        ai.observe(x, y, SUNK if sunk else HIT if hit else MISS)
+        chosen.append((x, y))
+    return chosen
+
+
+def slow_clock(monkeypatch):
+    """Une machine très lente : chaque lecture de l'horloge avance d'une seconde"""
+    ticks = itertools.count()
+    for module in (ai_module, posterior):
+        monkeypatch.setattr(module.time, "perf_counter", lambda: float(next(ticks)))
+
+
+def test_deterministic_ultimate_ignores_the_clock(monkeypatch):
+    rules = GameRules.scaled(7)
+    expected = targets(rules, 1, 25, deterministic=True)
+    slow_clock(monkeypatch)
+    assert targets(rules, 1, 25, deterministic=True) == expected
+    assert BattleshipAI('ultime', rules, deterministic=True).time_budget is None
+
+
+def test_interactive_ultimate_keeps_its_time_budget():
+    assert BattleshipAI('ultime').time_budget == BattleshipAI.TIME_BUDGET
+
+
+def test_seeded_games_get_a_deterministic_ai():
+    for seed, budget in ((4, None), (None, BattleshipAI.TIME_BUDGET)):
+        game = GameState(difficulty='ultime', seed=seed)
+        game.is_solo_mode = True
+        for player_id, player in enumerate(game.players):
+            player.auto_place_ships()
+            game.player_ready(player_id)
+        game.current_player_index = 1
+        game.bot_play()
+        assert game.ai.time_budget == budget
@@ -0,0 +1,53 @@
+"""
+BitBoard doit se comporter exactement comme Board, tir par tir
+"""
+import random
+
+from src.game.bitboard import BitBoard
+from src.game.board import Board
+from src.game.rules import DEFAULT_RULES
+
+
+def same_fleet(layout):
+    boards = []
+    for board_class in (Board, BitBoard):
+        board = board_class()
+        for spec, (x, y, horizontal) in zip(DEFAULT_RULES.ships, layout):
+            assert board.place_ship(board.new_ship(spec["name"], spec["size"]), x, y, horizontal)
+        boards.append(board)
+    return boards
+
+
+def states(board):
+    return [board.cell_state(x, y) for y in range(board.size) for x in range(board.size)]
+
+
+def test_shots_and_undo_match_board():
+    rng = random.Random(0)
+    cells = [(x, y) for y in range(10) for x in range(10)]
+    for _ in range(20):
+        board, bits = same_fleet(Board().sample_layout(DEFAULT_RULES.ship_sizes, rng))
+        rng.shuffle(cells)
+        # Quelques tirs hors grille ou répétés au passage
+        order = cells + [(-1, 0), (10, 3), cells[0]]
+        for x, y in order:
+            assert bits.receive_shot(x, y) == board.receive_shot(x, y)
+            assert bits.all_ships_sunk() == board.all_ships_sunk()
+            assert bits.shots_hash == board.shots_hash
+        assert states(bits) == states(board)
+        assert list(bits.shots) == list(board.shots)
+
+        while len(board.shots) > 30:
+            assert bits.undo_shot() == board.undo_shot()
+        assert states(bits) == states(board)
+        assert (bits.remaining_cells, bits.ships_afloat) == (board.remaining_cells, board.ships_afloat)
+        assert bits.hits == sum(1 << (y * 10 + x) for x, y, hit in board.shots if hit)
+
+
+def test_fork_does_not_see_later_shots():
+    board, bits = same_fleet(Board().sample_layout(DEFAULT_RULES.ship_sizes, random.Random(1)))
+    bits.receive_shot(0, 0)
+    fork = bits.fork()
+    fork.receive_shot(5, 5)
+    assert not bits.shots.is_shot(5, 5)
+    assert fork.shots.is_shot(0, 0) and fork.shots.is_shot(5, 5)
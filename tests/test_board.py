@@ -0,0 +1,96 @@
+"""
+Instantanés et copies des plateaux : partagés jusqu'à la première écriture,
+jamais visibles l'un de l'autre ensuite
+"""
+import random
+
+import pytest
+
+from src.game.bitboard import BitBoard
+from src.game.board import Board
+from src.game.rules import DEFAULT_RULES
+from src.game.sparse_board import SparseBoard
+
+BOARD_CLASSES = [Board, BitBoard, SparseBoard]
+
+
+def placed_board(board_class, seed):
+    board = board_class()
+    layout = Board().sample_layout(DEFAULT_RULES.ship_sizes, random.Random(seed))
+    for spec, (x, y, horizontal) in zip(DEFAULT_RULES.ships, layout):
+        assert board.place_ship(board.new_ship(spec["name"], spec["size"]), x, y, horizontal)
+    return board
+
+
+def state_of(board):
+    """Tout ce qu'un tir ou un placement peut changer"""
+    return (
+        [board.cell_state(x, y) for y in range(board.size) for x in range(board.size)],
+        [(ship.name, ship.x, ship.y, ship.horizontal, ship.is_sunk()) for ship in board.ships],
+        list(board.shots), board.hash, board.all_ships_sunk(),
+    )
+
+
+def fire(board, rng, count):
+    cells = [(x, y) for y in range(board.size) for x in range(board.size)]
+    for x, y in rng.sample(cells, count):
+        board.receive_shot(x, y)
+
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_snapshot_keeps_the_position(board_class):
+    rng = random.Random(1)
+    board = placed_board(board_class, 1)
+    fire(board, rng, 30)
+    snapshot = board.snapshot()
+    expected = state_of(board)
+
+    fire(board, rng, 40)
+    board.undo_shot()
+    board.remove_ship(board.ships[0])
+    assert state_of(snapshot) == expected
+    # Et la copie d'un instantané continue de son côté
+    fork = snapshot.fork()
+    fire(fork, rng, 10)
+    assert state_of(snapshot) == expected
+
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_fork_and_board_do_not_see_each_other(board_class):
+    rng = random.Random(2)
+    board = placed_board(board_class, 2)
+    fire(board, rng, 20)
+    fork = board.fork()
+    before = state_of(board)
+
+    fire(fork, rng, 60)
+    assert state_of(board) == before
+    forked = state_of(fork)
+
+    while board.shots:
+        board.undo_shot()
+    assert state_of(fork) == forked
+
+    # La copie rejoue comme un plateau neuf rejouant les mêmes tirs
+    replayed = placed_board(board_class, 2)
+    for x, y, _ in fork.shots:
+        replayed.receive_shot(x, y)
+    assert state_of(replayed) == forked
+
+
+@pytest.mark.parametrize("board_class", BOARD_CLASSES)
+def test_snapshot_is_read_only(board_class):
+    board = placed_board(board_class, 3)
+    board.receive_shot(4, 4)
+    snapshot = board.snapshot()
+    writes = [
+        lambda: snapshot.receive_shot(0, 0),
+        lambda: snapshot.receive_shots([(1, 1)]),
+        lambda: snapshot.undo_shot(),
+        lambda: snapshot.remove_ship(snapshot.ships[0]),
+        lambda: snapshot.new_ship("canot", 2),
+    ]
+    for write in writes:
+        with pytest.raises(TypeError):
+            write()
+    assert state_of(snapshot) == state_of(board)
@@ -0,0 +1,86 @@
+"""
+BoardBatch : chaque plateau du lot se comporte comme un Board recevant les
+mêmes tirs
+"""
+import random
+from collections import Counter
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.game.board_batch import BoardBatch
+from src.game.rules import DEFAULT_RULES, GameRules
+from src.game.shot_ledger import UNKNOWN
+
+
+def states(board):
+    return [[board.cell_state(x, y) for x in range(board.size)] for y in range(board.size)]
+
+
+@pytest.mark.parametrize("rules", [DEFAULT_RULES, GameRules.scaled(7), GameRules.scaled(20)])
+def test_batch_matches_boards_shot_by_shot(rules):
+    batch = BoardBatch.random(rules, 40, seed=1)
+    boards = [batch.board(index) for index in range(batch.count)]
+    for board in boards:
+        assert len(board.ships) == len(rules.ships)  # Flottes légales, toutes placées
+
+    rng = random.Random(2)
+    size = rules.grid_size
+    # Tirs au hasard, parfois hors grille ou déjà tirés, différents d'un plateau à l'autre
+    while not batch.all_sunk().all():
+        x = np.array([rng.randrange(-1, size + 1) for _ in boards])
+        y = np.array([rng.randrange(-1, size + 1) for _ in boards])
+        hit, ship_id, sunk = batch.fire(x, y)
+        for index, board in enumerate(boards):
+            if board.all_ships_sunk():
+                assert (hit[index], ship_id[index], sunk[index]) == (False, 0, False)
+                continue
+            expected_hit, expected_id, expected_sunk = board.receive_shot(int(x[index]), int(y[index]))
+            assert (hit[index], ship_id[index], sunk[index]) == (expected_hit, expected_id or 0, expected_sunk)
+        assert batch.all_sunk().tolist() == [board.all_ships_sunk() for board in boards]
+
+    for index, board in enumerate(boards):
+        assert batch.states[index].tolist() == states(board)
+        assert batch.shots_fired[index] == len(board.shots)
+
+
+def test_inactive_boards_are_not_shot():
+    batch = BoardBatch.random(DEFAULT_RULES, 6, seed=3)
+    active = np.array([True, False] * 3)
+    batch.fire(4, 4, active)
+    assert batch.shots_fired.tolist() == [1, 0] * 3
+    assert (batch.states[~active] == UNKNOWN).all()
+
+
+def test_board_rebuilds_the_shots():
+    batch = BoardBatch.random(DEFAULT_RULES, 5, seed=4)
+    rng = np.random.default_rng(5)
+    for _ in range(30):
+        batch.fire(*batch.random_targets(rng))
+    for index in range(batch.count):
+        assert states(batch.board(index)) == batch.states[index].tolist()
+
+
+def test_random_targets_are_new_and_uniform():
+    rules = GameRules(4, [{"name": "a", "size": 2}])
+    batch = BoardBatch.random(rules, 4000, seed=6)
+    rng = np.random.default_rng(7)
+    # Deux premiers tirs, puis le troisième doit être uniforme sur les 14 cases restantes
+    batch.fire(0, 0)
+    batch.fire(3, 3)
+    x, y = batch.random_targets(rng)
+    assert not ((x == 0) & (y == 0)).any() and not ((x == 3) & (y == 3)).any()
+    drawn = Counter(zip(x.tolist(), y.tolist()))
+    assert len(drawn) == 14
+    expected = batch.count / 14
+    chi2 = sum((count - expected) ** 2 / expected for count in drawn.values())
+    assert chi2 / 13 < 2.5
+
+    # Jusqu'au bout, jamais deux fois la même case
+    for _ in range(14):
+        before = batch.shots_fired.copy()
+        active = (batch.states.reshape(batch.count, -1) == UNKNOWN).any(axis=1)
+        batch.fire(*batch.random_targets(rng), active=active)
+        assert (batch.shots_fired - before == active).all()
+    assert (batch.states != UNKNOWN).all()
@@ -0,0 +1,75 @@
+"""
+Grilles de placements de l'IA : les deux backends donnent les comptes d'une
+énumération directe des placements
+"""
+import random
+from collections import Counter
+
+import pytest
+
+from src.game import density
+from src.game.density import PlacementDensity, WindowDensity, new_density
+from src.game.placement_table import PlacementTable
+from src.game.shot_ledger import MISS, HIT
+
+
+def enumerated_grids(table, shots, ship_counts):
+    """(open, weighted) en parcourant chaque placement de chaque taille"""
+    size = table.grid_size
+    open_grid = [[0] * size for _ in range(size)]
+    weighted = [[0] * size for _ in range(size)]
+    for ship_size, count in ship_counts.items():
+        if ship_size > size:
+            continue
+        for placement in table.placements_for(ship_size):
+            covered = [shots.get(cell) for cell in placement.cells]
+            if MISS in covered:
+                continue
+            weight = 2 if HIT in covered else 1
+            for x, y in placement.cells:
+                weighted[y][x] += count * weight
+                if not any(covered):
+                    open_grid[y][x] += count
+    for x, y in shots:
+        weighted[y][x] = 0
+    return open_grid, weighted
+
+
+BACKENDS = [PlacementDensity]
+if density.HAS_NUMPY:
+    BACKENDS.append(WindowDensity)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("size, fleet", [(6, (4, 3, 3, 1)), (10, (5, 4, 3, 3, 2)), (12, (13, 2, 2))])
+def test_grids_match_enumeration(backend, size, fleet):
+    table = PlacementTable(size, fleet)
+    grids = backend(table, fleet)
+    rng = random.Random(size)
+    cells = [(x, y) for y in range(size) for x in range(size)]
+    rng.shuffle(cells)
+    shots = {}
+    for index, (x, y) in enumerate(cells[:size * size * 2 // 3]):
+        hit = rng.random() < 0.3
+        grids.record(x, y, hit)
+        grids.record(x, y, not hit)  # Une case déjà tirée est ignorée
+        shots[(x, y)] = HIT if hit else MISS
+        if index % 7:
+            continue
+        remaining = Counter(rng.sample(fleet, rng.randrange(1, len(fleet) + 1)))
+        expected_open, expected_weighted = enumerated_grids(table, shots, remaining)
+        assert grids.open_grid(remaining) == expected_open
+        assert grids.weighted_grid(remaining) == expected_weighted
+        assert all(grids.is_shot(x, y) == ((x, y) in shots) for x, y in cells)
+
+    grids.reset()
+    assert grids.open_grid(Counter(fleet)) == enumerated_grids(table, {}, Counter(fleet))[0]
+
+
+def test_new_density_picks_the_backend():
+    assert isinstance(new_density(PlacementTable(10, (3,)), (3,), vectorized=False), PlacementDensity)
+    small = new_density(PlacementTable(10, (3,)), (3,))
+    assert isinstance(small, PlacementDensity)
+    if density.HAS_NUMPY:
+        big = new_density(PlacementTable(density.VECTOR_MIN_GRID_SIZE, (3,)), (3,))
+        assert isinstance(big, WindowDensity)
@@ -0,0 +1,97 @@
+"""
+Tirage des flottes : toujours une flotte légale ou la preuve qu'il n'y en a
+pas, et chaque flotte légale aussi probable que les autres
+"""
+import itertools
+import random
+from collections import Counter
+
+import pytest
+
+from src.game import fleet_placement
+from src.game.fleet_placement import sample_fleet, search_fleet
+from src.game.placement_table import PlacementTable
+
+
+def legal_layouts(table, ship_sizes):
+    """Toutes les flottes légales, navire par navire, en masques de cases"""
+    layouts = set()
+    for combination in itertools.product(*(table.placements_for(size) for size in ship_sizes)):
+        blocked = 0
+        for placement in combination:
+            if placement.mask & blocked:
+                break
+            blocked |= placement.area_mask
+        else:
+            layouts.add(tuple(placement.mask for placement in combination))
+    return layouts
+
+
+def chi2_per_degree(generator, table, ship_sizes, per_layout=40):
+    """Écart des flottes tirées à la loi uniforme, proche de 1 quand elle est respectée"""
+    layouts = legal_layouts(table, ship_sizes)
+    rng = random.Random(1)
+    drawn = Counter(
+        tuple(placement.mask for placement in generator(table, ship_sizes, rng))
+        for _ in range(per_layout * len(layouts))
+    )
+    assert set(drawn) <= layouts
+    chi2 = sum((drawn[layout] - per_layout) ** 2 / per_layout for layout in layouts)
+    return chi2 / (len(layouts) - 1)
+
+
+def is_legal(table, ship_sizes, layout):
+    blocked = 0
+    for size, placement in zip(ship_sizes, layout):
+        if placement.size != size or placement.mask & blocked:
+            return False
+        blocked |= placement.area_mask
+    return True
+
+
+@pytest.mark.parametrize("stage, attempts, counted_cells", [
+    ("rejet", 5000, 144),
+    ("comptage", 0, 144),
+    ("marche", 0, 0),
+])
+@pytest.mark.parametrize("ship_sizes", [(3, 2, 1), (2, 2, 1)])
+def test_every_stage_draws_uniform_layouts(monkeypatch, stage, attempts, counted_cells, ship_sizes):
+    monkeypatch.setattr(fleet_placement, "REJECTION_ATTEMPTS", attempts)
+    monkeypatch.setattr(fleet_placement, "MAX_COUNTED_CELLS", counted_cells)
+    fleet_placement._layout_counter.cache_clear()
+    table = PlacementTable(4, ship_sizes)
+    assert chi2_per_degree(sample_fleet, table, ship_sizes) < 1.5
+
+
+def test_search_alone_is_biased():
+    # Sans correction, la recherche navire par navire favorise certaines flottes
+    table = PlacementTable(4, (3, 2, 1))
+    assert chi2_per_degree(search_fleet, table, (3, 2, 1)) > 10
+
+
+@pytest.mark.parametrize("grid_size, ship_sizes", [
+    (10, (5, 5, 4, 4, 3, 3, 3, 2, 2, 2, 2)),
+    (8, (4, 4, 3, 3, 2, 2, 2, 1, 1)),
+    (6, (4, 3, 3, 2, 2, 1)),
+])
+def test_dense_fleets_are_always_placed(grid_size, ship_sizes):
+    table = PlacementTable(grid_size, ship_sizes)
+    rng = random.Random(2)
+    for _ in range(5):
+        layout = sample_fleet(table, ship_sizes, rng)
+        assert layout is not None and is_legal(table, ship_sizes, layout)
+
+
+def test_infeasible_fleet_is_proven_so():
+    table = PlacementTable(6, (5, 5, 5, 5))
+    assert sample_fleet(table, (5, 5, 5, 5), random.Random(3)) is None
+    assert search_fleet(table, (5, 5, 5, 5), random.Random(3)) is None
+
+
+def test_blocked_cells_are_left_free():
+    table = PlacementTable(6, (3, 2))
+    blocked = sum(1 << cell for cell in range(0, 36, 2))
+    rng = random.Random(4)
+    for _ in range(50):
+        layout = sample_fleet(table, (3, 2), rng, blocked)
+        assert layout is not None and not any(placement.mask & blocked for placement in layout)
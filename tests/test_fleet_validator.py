@@ -0,0 +1,140 @@
+"""
+Validation des flottes reçues par le serveur : même verdict que Board sur des
+flottes au hasard, et une erreur précise pour chaque défaut
+"""
+import copy
+import random
+
+import pytest
+
+from src.game.board import Board
+from src.game.player import Player
+from src.game.rules import DEFAULT_RULES, GameRules
+from src.network.fleet_validator import (
+    ADJACENT, BAD_SHIP, MALFORMED, MATRIX_MISMATCH, MAX_ERRORS, NOT_STRAIGHT, OUT_OF_GRID, OVERLAP,
+    SHIP, WATER, WRONG_FLEET, validate_fleet,
+)
+
+
+def server_grid(rules, layout):
+    """Grille au format du serveur pour une flotte [(x, y, horizontal)] dans l'ordre des règles"""
+    size = rules.grid_size
+    matrix = [[WATER] * size for _ in range(size)]
+    ships = []
+    for spec, (x, y, horizontal) in zip(rules.ships, layout):
+        positions = [[y, x + i] if horizontal else [y + i, x] for i in range(spec['size'])]
+        for row, column in positions:
+            if 0 <= row < size and 0 <= column < size:
+                matrix[row][column] = SHIP
+        ships.append({'name': spec['name'], 'size': spec['size'], 'positions': positions})
+    return {'matrix': matrix, 'ships': ships}
+
+
+def board_accepts(rules, layout):
+    board = Board(rules)
+    return all(
+        board.place_ship(board.new_ship(spec['name'], spec['size']), x, y, horizontal)
+        for spec, (x, y, horizontal) in zip(rules.ships, layout)
+    )
+
+
+def codes(errors):
+    return {error['code'] for error in errors}
+
+
+def legal_grid(seed, rules=DEFAULT_RULES):
+    layout = Board(rules).sample_layout(rules.ship_sizes, random.Random(seed))
+    return server_grid(rules, layout)
+
+
+@pytest.mark.parametrize("rules", [DEFAULT_RULES, GameRules.scaled(7), GameRules.scaled(20)])
+def test_verdict_matches_board(rules):
+    rng = random.Random(rules.grid_size)
+    size = rules.grid_size
+    layouts = [Board(rules).sample_layout(rules.ship_sizes, rng) for _ in range(10)]
+    verdicts = set()
+    for _ in range(300):
+        layout = list(rng.choice(layouts))
+        # Un bateau déplacé au hasard : collé, à cheval ou toujours à l'écart
+        moved = rng.randrange(len(layout))
+        layout[moved] = (rng.randrange(size), rng.randrange(size), rng.random() < 0.5)
+        horizontal = layout[moved][2]
+        ship_size = rules.ship_sizes[moved]
+        if (layout[moved][0] if horizontal else layout[moved][1]) + ship_size > size:
+            continue  # Hors grille : vu par un autre test
+        accepted = board_accepts(rules, layout)
+        assert (validate_fleet(server_grid(rules, layout), rules) == []) == accepted
+        verdicts.add(accepted)
+    assert verdicts == {True, False}
+
+
+def test_players_fleets_are_valid():
+    for seed in range(20):
+        player = Player(0, DEFAULT_RULES, rng=random.Random(seed))
+        player.auto_place_ships()
+        layout = [(ship.x, ship.y, ship.horizontal) for ship in player.ships]
+        assert validate_fleet(server_grid(DEFAULT_RULES, layout)) == []
+
+
+def damaged(change):
+    grid = legal_grid(1)
+    change(grid)
+    return validate_fleet(grid)
+
+
+def reversed_positions(grid):
+    grid['ships'][0]['positions'].reverse()
+
+
+def bent_ship(grid):
+    ship = grid['ships'][0]
+    row, column = ship['positions'][-1]
+    ship['positions'][-1] = [row + 1, column + 1] if column + 1 < 10 and row + 1 < 10 else [row - 1, column - 1]
+
+
+def overlapping(grid):
+    first, last = grid['ships'][0], grid['ships'][-1]
+    last['positions'] = copy.deepcopy(first['positions'][:last['size']])
+
+
+@pytest.mark.parametrize("change, code", [
+    (lambda grid: grid.update(matrix=None), MALFORMED),
+    (lambda grid: grid.pop('ships'), MALFORMED),
+    (lambda grid: grid['matrix'].pop(), MALFORMED),
+    (lambda grid: grid['matrix'][3].append(WATER), MALFORMED),
+    (lambda grid: grid['ships'].pop(), WRONG_FLEET),
+    (lambda grid: grid['ships'][0].update(size=7), BAD_SHIP),
+    (lambda grid: grid['ships'][0].update(size=grid['ships'][-1]['size'],
+                                          positions=grid['ships'][0]['positions'][:grid['ships'][-1]['size']]),
+     WRONG_FLEET),
+    (lambda grid: grid['ships'][0]['positions'].pop(), BAD_SHIP),
+    (lambda grid: grid['ships'][0].update(hits=1), BAD_SHIP),
+    (lambda grid: grid['ships'][0]['positions'][0].__setitem__(0, 10), OUT_OF_GRID),
+    (lambda grid: grid['ships'][0]['positions'][0].__setitem__(1, -1), OUT_OF_GRID),
+    (lambda grid: grid['ships'][0]['positions'][0].__setitem__(1, 2.0), OUT_OF_GRID),
+    (bent_ship, NOT_STRAIGHT),
+    (overlapping, OVERLAP),
+    (lambda grid: grid['matrix'][0].__setitem__(0, SHIP if grid['matrix'][0][0] == WATER else WATER),
+     MATRIX_MISMATCH),
+])
+def test_each_defect_has_its_error(change, code):
+    assert codes(damaged(change)) == {code}
+
+
+def test_positions_may_come_in_any_order():
+    assert damaged(reversed_positions) == []
+
+
+def test_diagonal_contact_is_refused():
+    rules = GameRules(4, [{'name': 'a', 'size': 2}, {'name': 'b', 'size': 1}])
+    errors = validate_fleet(server_grid(rules, [(0, 0, True), (2, 1, True)]), rules)
+    assert codes(errors) == {ADJACENT}
+    assert not board_accepts(rules, [(0, 0, True), (2, 1, True)])
+    assert validate_fleet(server_grid(rules, [(0, 0, True), (3, 1, True)]), rules) == []
+
+
+def test_errors_are_capped():
+    rules = GameRules(30, [{'name': f'b{index}', 'size': 1} for index in range(60)])
+    grid = server_grid(rules, [(0, 0, True)] * 60)
+    errors = validate_fleet(grid, rules)
+    assert len(errors) == MAX_ERRORS and codes(errors) == {OVERLAP}
@@ -0,0 +1,144 @@
+"""
+GameState sans interface : création silencieuse, annulation, reprise et instantanés
+"""
+import random
+
+import pytest
+
+from src.game.game_state import GameState
+from src.utils.constants import PLACING_SHIPS, YOUR_TURN
+
+
+def test_headless_engine_prints_nothing(capsys):
+    game = GameState(difficulty="expert", seed=1)
+    for player in game.players:
+        player.auto_place_ships()
+    game.fork()
+    game.snapshot()
+    assert capsys.readouterr().out == ""
+
+
+def started_game(seed, difficulty="expert"):
+    game = GameState(difficulty=difficulty, seed=seed)
+    for player_id, player in enumerate(game.players):
+        player.auto_place_ships()
+        game.player_ready(player_id)
+    return game
+
+
+def play_shots(game, rng, count):
+    """Tirs au hasard, chacun au tour du joueur qui doit tirer"""
+    size = game.rules.grid_size
+    for _ in range(count):
+        if game.winner is not None:
+            break
+        game.process_shot(game.current_player_index, rng.randrange(size), rng.randrange(size))
+
+
+def position_of(game):
+    size = game.rules.grid_size
+    boards = [
+        [player.board.cell_state(x, y) for y in range(size) for x in range(size)]
+        for player in game.players
+    ]
+    return boards, game.current_player_index, game.state, game.winner, game.last_shot, game.position_hash
+
+
+def test_snapshot_and_fork_are_independent_of_the_game():
+    rng = random.Random(1)
+    game = started_game(1)
+    play_shots(game, rng, 30)
+    snapshot, fork = game.snapshot(), game.fork()
+    expected = position_of(game)
+
+    play_shots(game, rng, 30)
+    assert position_of(snapshot) == position_of(fork) == expected
+    play_shots(fork, rng, 30)
+    assert position_of(snapshot) == expected
+    assert position_of(fork) != position_of(game)
+
+    for write in (lambda: snapshot.process_shot(snapshot.current_player_index, 0, 0),
+                  lambda: snapshot.undo(), lambda: snapshot.player_ready(0), lambda: snapshot.reset()):
+        with pytest.raises(TypeError):
+            write()
+    assert position_of(snapshot) == expected
+
+
+def recorded_positions(game, rng, count):
+    """Position après chaque événement de l'historique, en jouant `count` tirs"""
+    positions = {len(game.history): position_of(game)}
+    size = game.rules.grid_size
+    for _ in range(count):
+        if game.winner is not None:
+            break
+        game.process_shot(game.current_player_index, rng.randrange(size), rng.randrange(size))
+        positions[len(game.history)] = position_of(game)
+    return positions
+
+
+def test_undo_and_redo_walk_through_every_position():
+    game = started_game(2)
+    positions = recorded_positions(game, random.Random(2), 150)
+    end = len(game.history)
+
+    while game.history.cursor > 2:
+        assert game.undo() is not None
+        assert position_of(game) == positions[game.history.cursor]
+    while game.redo() is not None:
+        assert position_of(game) == positions[game.history.cursor]
+    assert game.history.cursor == end
+
+
+def test_undoing_a_fleet_takes_the_game_back_to_placement():
+    game = GameState(seed=3)
+    for player in game.players:
+        player.auto_place_ships()
+    game.players[1].ready = False  # Flotte placée mais pas encore validée
+    game.player_ready(0)
+    game.player_ready(1)
+    assert game.state == YOUR_TURN
+
+    game.undo()
+    assert game.state == PLACING_SHIPS
+    assert not game.players[1].ready and game.players[0].ready
+    game.undo()
+    assert game.undo() is None
+    game.redo()
+    game.redo()
+    assert game.state == YOUR_TURN and all(player.ready for player in game.players)
+
+
+def test_goto_starts_from_the_nearest_checkpoint(monkeypatch):
+    game = started_game(4)
+    positions = recorded_positions(game, random.Random(4), 200)
+    interval = game.history.checkpoint_interval
+    assert len(game.history) > 3 * interval
+
+    redone = []
+    original = GameState.redo
+    monkeypatch.setattr(GameState, "redo", lambda state: redone.append(1) or original(state))
+    rng = random.Random(5)
+    for index in [2, len(game.history), interval, interval - 1] + rng.sample(sorted(positions), 30):
+        redone.clear()
+        game.goto(index)
+        assert game.history.cursor == index
+        assert position_of(game) == positions[index]
+        assert len(redone) < interval
+    with pytest.raises(IndexError):
+        game.goto(len(game.history) + 1)
+
+
+def test_playing_after_undo_drops_the_undone_events():
+    game = started_game(5)
+    rng = random.Random(5)
+    recorded_positions(game, rng, 100)
+    game.goto(40)
+    play_shots(game, rng, 1)
+    assert len(game.history) == 41 and not game.history.can_redo()
+    assert all(index <= 40 for index in game.history.checkpoints)
+
+    # Le nouvel embranchement se rejoue comme une partie neuve
+    branch = position_of(game)
+    game.goto(0)
+    game.goto(41)
+    assert position_of(game) == branch
@@ -0,0 +1,139 @@
+"""
+Comptage exact et échantillonneur de la position, comparés à une énumération
+brute de toutes les flottes sur de petites grilles
+"""
+import random
+
+import pytest
+
+from src.game.board import Board
+from src.game.placement_table import PlacementTable
+from src.game.posterior import PosteriorSampler, count_layouts
+from src.game.rules import GameRules
+from src.game.shot_ledger import UNKNOWN, MISS, HIT, SUNK
+
+
+def all_layouts(table, fleet):
+    """Toutes les flottes légales, les navires de même taille étant interchangeables"""
+    fleet = sorted(fleet, reverse=True)
+
+    def place(index, blocked, first):
+        if index == len(fleet):
+            yield []
+            return
+        # Un navire d'une case a la même empreinte dans les deux sens : une seule fois
+        placements = [p for p in table.placements_for(fleet[index]) if p.horizontal or p.size > 1]
+        # Deux navires de même taille : le second après le premier dans la table
+        start = first if index and fleet[index] == fleet[index - 1] else 0
+        for position in range(start, len(placements)):
+            placement = placements[position]
+            if placement.mask & blocked:
+                continue
+            for rest in place(index + 1, blocked | placement.area_mask, position + 1):
+                yield [placement] + rest
+
+    return list(place(0, 0, 0))
+
+
+def agrees(layout, states, size):
+    """La flotte donne-t-elle exactement ces états de tir ?"""
+    expected = [UNKNOWN] * (size * size)
+    for placement in layout:
+        cells = [y * size + x for x, y in placement.cells]
+        shot = [states[cell] != UNKNOWN for cell in cells]
+        for cell, fired in zip(cells, shot):
+            if fired:
+                expected[cell] = SUNK if all(shot) else HIT
+    for cell, state in enumerate(states):
+        if state == MISS and expected[cell] == UNKNOWN:
+            expected[cell] = MISS
+    return expected == list(states)
+
+
+def brute_force(table, fleet, states):
+    """(nombre de flottes cohérentes, grille des navires à flot sur chaque case)"""
+    size = table.grid_size
+    total = 0
+    covered = [0] * (size * size)
+    for layout in all_layouts(table, fleet):
+        if not agrees(layout, states, size):
+            continue
+        total += 1
+        for placement in layout:
+            cells = [y * size + x for x, y in placement.cells]
+            if not all(states[cell] != UNKNOWN for cell in cells):
+                for cell in cells:
+                    covered[cell] += 1
+    return total, [covered[row * size:(row + 1) * size] for row in range(size)]
+
+
+def random_positions(size, fleet, count, seed):
+    """États de tir de parties réelles, arrêtées après un nombre de tirs au hasard"""
+    rng = random.Random(seed)
+    ships = [{"name": f"navire {index}", "size": length} for index, length in enumerate(fleet)]
+    rules = GameRules(size, ships)
+    cells = [(x, y) for y in range(size) for x in range(size)]
+    for _ in range(count):
+        board = Board(rules)
+        for spec, (x, y, horizontal) in zip(rules.ships, board.sample_layout(rules.ship_sizes, rng)):
+            board.place_ship(board.new_ship(spec["name"], spec["size"]), x, y, horizontal)
+        rng.shuffle(cells)
+        for x, y in cells[:rng.randrange(len(cells) // 2)]:
+            board.receive_shot(x, y)
+        yield [board.cell_state(x, y) for y in range(size) for x in range(size)]
+
+
+def test_hits_alone_are_not_a_ship_afloat():
+    # Deux coups au but côte à côte, non coulés : un 2 dessus serait déjà coulé
+    table = PlacementTable(5, (3, 2))
+    states = [UNKNOWN] * 25
+    states[0] = states[1] = HIT
+    total, grid = count_layouts(table, (3, 2), states)
+    assert (total, grid) == brute_force(table, (3, 2), states)
+    assert total == 24
+
+
+@pytest.mark.parametrize("size, fleet", [(5, (3, 2)), (6, (3, 2, 2)), (6, (4, 3, 1))])
+def test_count_layouts_matches_brute_force(size, fleet):
+    table = PlacementTable(size, fleet)
+    for states in random_positions(size, fleet, 40, seed=size + len(fleet)):
+        # La vraie flotte est toujours cohérente : il y a au moins une flotte à compter
+        assert count_layouts(table, fleet, states) == brute_force(table, fleet, states)
+
+
+@pytest.mark.parametrize("size, fleet", [(5, (3, 2)), (6, (3, 2, 2)), (6, (4, 3, 1))])
+def test_sampled_fleets_agree_with_the_shots(size, fleet):
+    table = PlacementTable(size, fleet)
+    rng = random.Random(7)
+    for states in random_positions(size, fleet, 20, seed=size * len(fleet)):
+        sampler = PosteriorSampler(table, fleet, states)
+        shot = sum(1 << cell for cell, state in enumerate(states) if state != UNKNOWN)
+        for _ in range(30):
+            drawn = sampler._draw(rng)
+            if drawn is None:
+                continue
+            placed = drawn[1]
+            assert sorted(length for _, _, length, _ in placed) == sorted(sampler.remaining.elements())
+            occupied = 0
+            for mask, area_mask, _, _ in placed:
+                assert mask & ~shot, "un navire à flot entièrement touché serait coulé"
+                assert not area_mask & occupied, "deux navires se touchent"
+                occupied |= mask
+            # Les navires à flot, plus ceux déjà coulés, redonnent exactement les tirs
+            hits = sum(1 << cell for cell, state in enumerate(states) if state == HIT)
+            misses = sum(1 << cell for cell, state in enumerate(states) if state == MISS)
+            sunk = sum(1 << cell for cell, state in enumerate(states) if state == SUNK)
+            assert occupied & shot == hits
+            assert not occupied & (misses | sunk)
+
+
+def test_sampler_converges_to_the_exact_count():
+    size, fleet = 6, (3, 2, 2)
+    table = PlacementTable(size, fleet)
+    for states in random_positions(size, fleet, 5, seed=3):
+        total, counts = count_layouts(table, fleet, states)
+        sampler = PosteriorSampler(table, fleet, states)
+        sampler.run(random.Random(11), samples=20000)
+        for row, exact_row in zip(sampler.grid(), counts):
+            for estimate, exact in zip(row, exact_row):
+                assert estimate == pytest.approx(exact / total, abs=0.05)
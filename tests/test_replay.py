@@ -0,0 +1,116 @@
+"""
+Replays : en-têtes sans limite de taille et accès direct à n'importe quel coup
+"""
+import io
+import random
+
+import pytest
+
+from src.game.bitboard import BitBoard
+from src.game.game_state import GameState
+from src.game.replay import ReplayReader, ReplayWriter, _PREAMBLE
+from src.game.rules import GameRules
+
+
+def played_replay(seed, rules=None):
+    """Une partie complète à coups aléatoires, enregistrée en mémoire"""
+    game = GameState(rules, seed=seed)
+    stream = io.BytesIO()
+    game.record_replay(stream)
+    for player_id, player in enumerate(game.players):
+        player.auto_place_ships()
+        game.player_ready(player_id)
+
+    rng = random.Random(seed)
+    size = game.rules.grid_size
+    targets = [[(x, y) for y in range(size) for x in range(size)] for _ in range(2)]
+    for cells in targets:
+        rng.shuffle(cells)
+    while game.winner is None:
+        player = game.current_player_index
+        x, y = targets[player].pop()
+        game.process_shot(player, x, y)
+    stream.seek(0)
+    return stream
+
+
+def position_of(game):
+    """Tout ce qui distingue deux positions"""
+    size = game.rules.grid_size
+    boards = [
+        [player.board.cell_state(x, y) for y in range(size) for x in range(size)]
+        for player in game.players
+    ]
+    return boards, game.current_player_index, game.state, game.winner, game.position_hash
+
+
+def test_header_accepts_large_rules():
+    ships = [{"name": "très long navire " * 20, "size": 300}, {"name": "é", "size": 2}]
+    rules = GameRules(400, ships, salvo_size=300)
+    fleets = [[(300, 0, 0, True), (2, 0, 5, False)], [(300, 10, 399, True), (2, 399, 0, False)]]
+    stream = io.BytesIO()
+    ReplayWriter(stream, rules, fleets, seed=5).write_shot(1, 399, 399)
+
+    stream.seek(0)
+    reader = ReplayReader(stream)
+    assert reader.rules == rules
+    assert reader.fleets == fleets
+    assert reader.seed == 5
+    assert reader.shots() == [(1, 399, 399)]
+
+
+def test_header_rejects_oversized_grid_before_writing():
+    stream = io.BytesIO()
+    with pytest.raises(ValueError):
+        ReplayWriter(stream, GameRules(70000, []), [[], []])
+    assert stream.getvalue() == b""
+
+
+def test_version_1_replays_are_still_read():
+    # En-tête version 1 écrit à la main : salve sur un octet, flotte maison en H/B/B
+    header = _PREAMBLE.pack(b"BSRP", 1, 0b100, 5, 1)
+    header += bytes((3,))
+    header += (1).to_bytes(2, "little") + bytes((2, 1)) + b"a"
+    for x in (0, 3):
+        header += (1).to_bytes(2, "little") + bytes((2, x * 2))
+    reader = ReplayReader(io.BytesIO(header + bytes((7,))))
+    assert reader.rules == GameRules(5, [{"name": "a", "size": 2}], salvo_size=3)
+    assert reader.fleets == [[(2, 0, 0, True)], [(2, 3, 0, True)]]
+    assert reader.shots() == [(1, 3, 0)]
+
+
+@pytest.mark.parametrize("board_class", [None, BitBoard])
+def test_position_matches_a_straight_replay(board_class):
+    stream = played_replay(seed=3)
+    reader = ReplayReader(stream)
+    count = len(reader)
+    assert count > 64  # Plusieurs points de reprise dans l'historique
+
+    # Dans le désordre, en avant comme en arrière, puis au-delà de la fin
+    rng = random.Random(4)
+    indexes = [count // 2, 0, count, 5, count - 1, 40] + [rng.randrange(count + 1) for _ in range(20)]
+    for index in indexes + [count + 10]:
+        straight = ReplayReader(io.BytesIO(stream.getvalue())).position(index, board_class)
+        assert position_of(reader.position(index, board_class)) == position_of(straight)
+
+
+def test_position_is_a_fork_of_the_cached_game():
+    reader = ReplayReader(played_replay(seed=8))
+    game = reader.position(10)
+    expected = position_of(game)
+    assert len(game.history) == 0
+    # Jouer sur la position rendue ne change pas celles rendues ensuite
+    game.process_shot(game.current_player_index, 0, 0)
+    assert position_of(reader.position(10)) == expected
+
+
+def test_position_uses_the_checkpoints(monkeypatch):
+    reader = ReplayReader(played_replay(seed=6))
+    reader.position(len(reader))
+
+    redone = []
+    original = GameState.redo
+    monkeypatch.setattr(GameState, "redo", lambda game: redone.append(1) or original(game))
+    reader.position(len(reader) // 2 + 1)
+    reader.position(len(reader) // 4 + 3)
+    assert 0 < len(redone) <= 2 * 32
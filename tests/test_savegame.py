@@ -0,0 +1,114 @@
+"""
+Sauvegardes : une partie rechargée continue exactement comme l'originale
+"""
+import json
+import random
+
+import pytest
+
+from src.game.game_state import GameState
+from src.game.savegame import capture, game_from_dict, game_to_dict, load_game, save_game
+
+
+def solo_game(difficulty, seed):
+    game = GameState(difficulty=difficulty, seed=seed)
+    game.is_solo_mode = True
+    for player_id, player in enumerate(game.players):
+        player.auto_place_ships()
+        game.player_ready(player_id)
+    return game
+
+
+def play(game, human_targets, turns):
+    """Le joueur vise dans l'ordre de sa liste, l'IA répond ; rend les tirs de l'IA"""
+    answers = []
+    for _ in range(turns):
+        if game.winner is not None:
+            break
+        if game.current_player_index == 0:
+            game.process_shot(0, *human_targets.pop())
+        else:
+            answers.append(game.bot_play())
+    return answers
+
+
+def position_of(game):
+    size = game.rules.grid_size
+    boards = [
+        [player.board.cell_state(x, y) for y in range(size) for x in range(size)]
+        for player in game.players
+    ]
+    return boards, game.current_player_index, game.state, game.winner, game.last_shot, game.position_hash
+
+
+def reloaded(game):
+    """Sauvegarde et relecture, en passant par le JSON comme sur disque"""
+    return game_from_dict(json.loads(json.dumps(game_to_dict(*capture(game)))))
+
+
+@pytest.mark.parametrize("difficulty", ["difficile", "ultime"])
+def test_loaded_game_goes_on_like_the_original(difficulty):
+    rng = random.Random(1)
+    targets = [(x, y) for y in range(10) for x in range(10)]
+    rng.shuffle(targets)
+
+    game = solo_game(difficulty, seed=5)
+    play(game, targets, 40)
+    loaded = reloaded(game)
+    assert position_of(loaded) == position_of(game)
+    assert loaded.ai.remaining_ships == game.ai.remaining_ships
+
+    assert play(loaded, list(targets), 60) == play(game, list(targets), 60)
+    assert position_of(loaded) == position_of(game)
+
+
+def test_loaded_game_keeps_its_history():
+    targets = [(x, y) for y in range(10) for x in range(10)]
+    game = solo_game("moyenne", seed=2)
+    play(game, targets, 30)
+    game.undo()
+    game.undo()
+
+    loaded = reloaded(game)
+    assert (len(loaded.history), loaded.history.cursor) == (len(game.history), game.history.cursor)
+    loaded.redo()
+    game.redo()
+    assert position_of(loaded) == position_of(game)
+    loaded.goto(2)
+    game.goto(2)
+    assert position_of(loaded) == position_of(game)
+
+
+def test_saves_are_small(tmp_path):
+    targets = [(x, y) for y in range(10) for x in range(10)]
+    game = solo_game("expert", seed=3)
+    play(game, targets, 100)
+    path = tmp_path / "partie.json"
+    save_game(game, str(path))
+    assert path.stat().st_size < 3000
+    assert position_of(load_game(str(path))) == position_of(game)
+
+
+@pytest.mark.parametrize("damage", [
+    lambda data: data.pop("events"),
+    lambda data: data.update(seeds=None),
+    lambda data: data.update(seeds=[1]),
+    lambda data: data.update(events=[["shot", 0]]),
+    lambda data: data.update(events=[["boom", 0, None]]),
+    lambda data: data.update(cursor=10 ** 6),
+    lambda data: data.update(rules="10x10"),
+    lambda data: data.update(ai={"difficulty": 3}),
+])
+def test_corrupt_saves_raise_value_error(damage):
+    game = solo_game("moyenne", seed=4)
+    play(game, [(x, y) for y in range(10) for x in range(10)], 6)
+    data = json.loads(json.dumps(game_to_dict(*capture(game))))
+    damage(data)
+    with pytest.raises(ValueError):
+        game_from_dict(data)
+
+
+def test_not_a_save_raises_value_error():
+    for data in ([], None, {"version": 1}):
+        with pytest.raises(ValueError):
+            game_from_dict(data)
@@ -0,0 +1,18 @@
+"""
+Serveur sans réseau : ce que les clients reçoivent de la grille adverse
+"""
+from src.network.server import Server, SHIP, WATER, HIT_SHOT
+
+
+def test_resync_grid_hides_the_opponent_ships():
+    server = Server()
+    matrix = [[WATER] * 10 for _ in range(10)]
+    matrix[0][0] = matrix[0][1] = SHIP
+    matrix[0][2] = HIT_SHOT
+    opponent = {'username': 'b', 'grid': {'matrix': matrix, 'ships': [{'size': 3}]}}
+
+    grid = server._resync_grid({'username': 'a'}, opponent, client_hash=123)
+
+    assert all(cell != SHIP for row in grid['matrix'] for cell in row)
+    assert grid['matrix'][0][2] == HIT_SHOT
+    assert grid['ships'] == []